@@ -6,18 +6,42 @@
 from google.adk.agents import Agent
 
 from ..config.settings import MODEL_ID
-from ..tools.finnhub_tools import get_basic_financials, get_company_profile, get_stock_quote
-from ..tools.fred_tools import get_economic_indicators, get_economic_series
+from ..tools.aio.finnhub_tools import (
+    get_basic_financials,
+    get_basic_financials_batch,
+    get_company_profile,
+    get_company_profiles,
+    get_stock_quote,
+    get_stock_quotes,
+)
+from ..tools.aio.fred_tools import (
+    get_derived_economic_metrics,
+    get_economic_indicators,
+    get_economic_series,
+)
+from .output_repair import repair_callback
+from .schemas import FinancialOutput
 
 FINANCIAL_AGENT_INSTRUCTION = """\
 あなたは定量的な財務アナリストです。
-ユーザーが指定した銘柄について、以下のタスクを実行してください:
+ユーザーが指定した銘柄について、以下のタスクを実行してください。
+
+取得済みのデータ (対象銘柄の get_stock_quote, get_company_profile, get_basic_financials と
+get_economic_indicators, get_derived_economic_metrics の結果):
+{financial_raw?}
+
+取得済みのデータがある場合は手順 1〜5 のツールを呼び出さず、このデータから直接結果を出力すること。
+データがない、または error の項目のみツールで取得する。
 
 1. get_stock_quote で現在の株価を取得
 2. get_company_profile で企業概要を確認
 3. get_basic_financials で主要財務指標 (PER, PBR, ROE, EPS等) を取得
 4. get_economic_indicators で主要経済指標 (GDP, CPI, 金利, VIX等) の最新動向を確認
-5. ファンダメンタルズの強弱を総合的に評価
+5. get_derived_economic_metrics で CPI 前年比、イールドカーブ (10年-2年) 等の派生指標とトレンドを確認
+6. ファンダメンタルズの強弱を総合的に評価
+
+同業他社など複数銘柄と比較する場合は、get_stock_quotes / get_company_profiles /
+get_basic_financials_batch にカンマ区切りで銘柄をまとめて渡し、1 回の呼び出しで取得すること。
 
 以下の JSON 形式で結果を出力してください:
 
@@ -65,11 +89,17 @@ financial_agent = Agent(
     description="株価・決算・経済指標を分析し、ファンダメンタルズの強弱を評価するエージェント",
     instruction=FINANCIAL_AGENT_INSTRUCTION,
     output_key="financial_data",
+    output_schema=FinancialOutput,
+    after_model_callback=repair_callback(FinancialOutput),
     tools=[
         get_stock_quote,
         get_company_profile,
         get_basic_financials,
+        get_stock_quotes,
+        get_company_profiles,
+        get_basic_financials_batch,
         get_economic_indicators,
         get_economic_series,
+        get_derived_economic_metrics,
     ],
 )
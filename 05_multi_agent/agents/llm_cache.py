@@ -0,0 +1,184 @@
+"""LLM 応答のキャッシュ (コンテンツアドレス)。
+
+同じ銘柄を入力が変わらないまま再実行すると、Gemini の呼び出しがすべて
+やり直しになる。モデルへのリクエストの内容 (モデル ID, 指示, 会話, 設定) の
+ハッシュをキーに応答を保存し、before_model_callback で一致する応答を返して
+モデルの呼び出しを省略する。指示・ツール定義は変更しない。
+
+    - キー: モデル ID + 指示 (埋め込んだステートを含む) + 会話 (ツールの結果を含む)
+      + 生成設定 (ツール定義, 出力スキーマ等) の SHA-256
+    - 保存先はツール結果と同じ ResponseCache (メモリの LRU + SQLite のディスク層)
+      に LLM 用の別インスタンスで保存し、TTL と件数の上限で削除する
+    - ディスク層の読み書き (SQLite) はイベントループをブロックしないよう別スレッドで行う
+    - 途中の応答 (ストリーミング) とエラー応答は保存しない。モデルの呼び出しが
+      例外で終わった場合は on_model_error_callback で呼び出し中の記録を破棄する
+    - LLM_CACHE_DISABLED_AGENTS のエージェントはキャッシュしない
+    - エージェントごとのヒット率と、ヒットで省略できたモデル呼び出しの時間を集計する
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from pydantic import BaseModel
+
+from ..config.settings import (
+    LLM_CACHE_DB,
+    LLM_CACHE_DISABLED_AGENTS,
+    LLM_CACHE_DISK_ENABLED,
+    LLM_CACHE_DISK_MAX_ENTRIES,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL,
+)
+from ..tools.cache import ResponseCache
+
+_cache = ResponseCache(
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_DB if LLM_CACHE_DISK_ENABLED else None,
+    max_disk_entries=LLM_CACHE_DISK_MAX_ENTRIES,
+)
+
+# (invocation_id, エージェント名) ごとの、モデル呼び出し中のキーと開始時刻
+_pending: dict[tuple[str, str], tuple[str, float]] = {}
+_lock = threading.Lock()
+_saved_seconds: dict[str, float] = {}
+
+
+def _disabled_agents() -> set[str]:
+    return {name.strip() for name in LLM_CACHE_DISABLED_AGENTS.split(",") if name.strip()}
+
+
+async def _run(func: Callable, *args: Any) -> Any:
+    """キャッシュの操作を実行する。ディスク層が有効なら別スレッドで実行する。"""
+    if LLM_CACHE_DISK_ENABLED:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+def request_key(llm_request: LlmRequest) -> str:
+    """モデルへのリクエストの内容からキャッシュキーを作る。"""
+    config = llm_request.config
+    schema = config.response_schema if config else None
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        schema = schema.model_json_schema()
+    elif schema is not None and hasattr(schema, "model_dump"):
+        schema = schema.model_dump(mode="json", exclude_none=True)
+    payload = {
+        "model": llm_request.model,
+        "contents": [c.model_dump(mode="json", exclude_none=True) for c in llm_request.contents],
+        # labels (エージェント名) と HTTP の設定は応答に影響しないので除く
+        "config": config.model_dump(
+            mode="json", exclude_none=True,
+            exclude={"labels", "http_options", "response_schema"},
+        ) if config else None,
+        "response_schema": schema,
+    }
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+async def lookup(callback_context: CallbackContext, llm_request: LlmRequest) -> LlmResponse | None:
+    """before_model_callback: キャッシュにある応答を返し、モデルの呼び出しを省略する。"""
+    agent = callback_context.agent_name
+    key = request_key(llm_request)
+    hit, entry = await _run(_cache.get, agent, key)
+    if hit:
+        with _lock:
+            _saved_seconds[agent] = _saved_seconds.get(agent, 0.0) + entry["latency"]
+        return LlmResponse.model_validate(entry["response"])
+    with _lock:
+        _pending[(callback_context.invocation_id, agent)] = (key, time.perf_counter())
+    return None
+
+
+async def store(callback_context: CallbackContext, llm_response: LlmResponse) -> None:
+    """after_model_callback: モデルの応答を保存する。
+
+    出力の修復等、先に実行された after_model_callback による変更を反映した応答を保存する。
+    """
+    if llm_response.partial:
+        return None
+    with _lock:
+        pending = _pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+    if pending is None or llm_response.error_code or not llm_response.content:
+        return None
+    key, started = pending
+    entry = {
+        "response": llm_response.model_dump(mode="json", exclude_none=True),
+        "latency": time.perf_counter() - started,
+    }
+    await _run(_cache.set, key, entry, LLM_CACHE_TTL)
+    return None
+
+
+def discard(callback_context: CallbackContext, llm_request: LlmRequest, error: Exception) -> None:
+    """on_model_error_callback: 例外で終わったモデル呼び出しの記録を破棄する。"""
+    with _lock:
+        _pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+    return None
+
+
+def enable_llm_cache(agent: BaseAgent) -> None:
+    """agent 以下のすべての LlmAgent にキャッシュのコールバックを追加する。
+
+    LLM_CACHE_ENABLED=0 の場合と、LLM_CACHE_DISABLED_AGENTS のエージェントには追加しない。
+    応答の保存は既存の after_model_callback の後に、呼び出し中の記録の破棄は
+    既存の on_model_error_callback の前に実行する。
+    """
+    if not LLM_CACHE_ENABLED:
+        return
+    disabled = _disabled_agents()
+    stack = [agent]
+    while stack:
+        node = stack.pop()
+        stack.extend(node.sub_agents)
+        if not isinstance(node, LlmAgent) or node.name in disabled:
+            continue
+        node.before_model_callback = [lookup, *_as_list(node.before_model_callback)]
+        node.after_model_callback = [*_as_list(node.after_model_callback), store]
+        node.on_model_error_callback = [discard, *_as_list(node.on_model_error_callback)]
+
+
+def _as_list(callback: Any) -> list:
+    if callback is None:
+        return []
+    return list(callback) if isinstance(callback, list) else [callback]
+
+
+def get_llm_cache_stats() -> dict:
+    """エージェントごとのヒット率と、省略できたモデル呼び出しの時間 (秒) を返す。"""
+    stats = _cache.stats()
+    with _lock:
+        saved = dict(_saved_seconds)
+    agents = {
+        name: {**s, "saved_seconds": round(saved.get(name, 0.0), 2)}
+        for name, s in stats["endpoints"].items()
+    }
+    hits = sum(s["memory_hits"] + s["disk_hits"] for s in agents.values())
+    total = hits + sum(s["misses"] for s in agents.values())
+    return {
+        "hits": hits,
+        "misses": total - hits,
+        "hit_rate": round(hits / total, 3) if total else 0.0,
+        "saved_seconds": round(sum(saved.values()), 2),
+        "agents": agents,
+    }
+
+
+def reset_llm_cache_stats() -> None:
+    """ヒット率と省略できた時間の集計をリセットする。"""
+    _cache.reset_stats()
+    with _lock:
+        _saved_seconds.clear()
+
+
+def clear_llm_cache() -> None:
+    """キャッシュの内容をすべて削除する。"""
+    _cache.clear()
@@ -7,18 +7,36 @@
 from google.adk.agents import Agent
 
 from ..config.settings import MODEL_ID
-from ..tools.finnhub_tools import get_company_news, get_market_news
-from ..tools.marketaux_tools import get_financial_news_with_sentiment
+from ..tools.aio.finnhub_tools import get_company_news, get_market_news
+from ..tools.aio.marketaux_tools import (
+    get_financial_news_batch,
+    get_financial_news_with_sentiment,
+)
+from ..tools.aio.news_tools import get_news_digest
+from .output_repair import repair_callback
+from .schemas import NewsOutput
 
 NEWS_AGENT_INSTRUCTION = """\
 あなたは市場ニュースの専門アナリストです。
-ユーザーが指定した銘柄・セクターについて、以下のタスクを実行してください:
+ユーザーが指定した銘柄・セクターについて、以下のタスクを実行してください。
+
+取得済みのデータ (対象銘柄の get_news_digest の結果):
+{news_raw?}
+
+取得済みのデータがある場合は手順 1 のツールを呼び出さず、このデータから直接結果を出力すること。
+データがない、または error の場合のみツールで取得する。
 
-1. get_market_news で最新のマーケット全体ニュースを取得
-2. get_company_news で対象銘柄の企業固有ニュースを取得
-3. get_financial_news_with_sentiment でセンチメント付きニュースを取得
-4. 重要なイベント (決算発表, M&A, 規制変更, 新製品等) を特定
-5. 各ニュースの市場インパクトを HIGH / MEDIUM / LOW で評価
+1. get_news_digest で対象銘柄のニュースを取得
+   (企業ニュース・センチメント付きニュース・マーケット全体ニュースを統合し、
+   同じ記事の転載は 1 件にまとめ済み。source_count は報じたソースの数)
+2. 不足があれば get_market_news / get_company_news / get_financial_news_with_sentiment で補完
+   (get_market_news は symbol を指定すると対象銘柄に関連する記事だけを返す。
+   市場全体のムードを見る場合は symbol を省略する)
+   競合・同業他社など複数銘柄のセンチメント付きニュースが必要な場合は、
+   get_financial_news_with_sentiment を銘柄ごとに呼ばず get_financial_news_batch を 1 回呼ぶ
+3. 重要なイベント (決算発表, M&A, 規制変更, 新製品等) を特定
+4. 各ニュースの市場インパクトを HIGH / MEDIUM / LOW で評価
+   (多くのソースが報じている記事ほどインパクトが大きい可能性が高い)
 
 以下の JSON 形式で結果を出力してください:
 
@@ -47,9 +65,13 @@ news_agent = Agent(
     description="ニュース記事とSNSから業界トレンドとイベントを収集し、市場インパクトを評価するエージェント",
     instruction=NEWS_AGENT_INSTRUCTION,
     output_key="news_data",
+    output_schema=NewsOutput,
+    after_model_callback=repair_callback(NewsOutput),
     tools=[
+        get_news_digest,
         get_market_news,
         get_company_news,
         get_financial_news_with_sentiment,
+        get_financial_news_batch,
     ],
 )
@@ -0,0 +1,238 @@
+"""構造化出力のローカル修復。
+
+JSON レスポンスモードでも、出力がトークン上限で途中で切れる、コードフェンスで
+囲まれる、末尾にカンマが残る、といった「ほぼ正しい JSON」が返ることがある。
+ADK は output_schema の検証に失敗するとエージェントを失敗させるため、
+after_model_callback で検証の前にローカルで修復し、再度 LLM を呼び出さずに済ませる。
+ツールを併用するエージェントは最終出力を set_model_response の関数呼び出しの
+引数で返す (検証に失敗すると ADK はモデルに再度呼び出させる) ため、その引数も修復する。
+
+    - 構文の修復: コードフェンス・前後の文章の除去、末尾のカンマの除去、
+      閉じられていない文字列・括弧の補完、Python の辞書表記・リテラル (True / None 等) の変換
+    - スキーマの修復: 型や列挙値が合わない省略可能な項目は削除して既定値にし、
+      必須項目が欠けたリストの要素は取り除く
+    - 修復できない出力は変更しない (ADK の検証エラーになる)
+"""
+
+import ast
+import copy
+import json
+import logging
+import re
+from typing import Any, Callable
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmResponse
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_WORD = re.compile(r"[A-Za-z]+")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+# スキーマの修復で削除を試みる回数の上限
+_MAX_SCHEMA_FIXES = 20
+# output_schema とツールを併用するエージェントが最終出力に使う関数 (ADK の SetModelResponseTool)
+_SET_MODEL_RESPONSE = "set_model_response"
+
+_stats = {"valid": 0, "repaired": 0, "failed": 0}
+
+
+def get_repair_stats() -> dict:
+    """修復せずに検証を通った / 修復した / 修復できなかった出力の件数を返す。"""
+    return dict(_stats)
+
+
+def reset_repair_stats() -> None:
+    for key in _stats:
+        _stats[key] = 0
+
+
+def repair_json(text: str) -> Any:
+    """ほぼ正しい JSON テキストを修復してデコードする。
+
+    Raises:
+        ValueError: JSON オブジェクト・配列が見つからない、または修復できない場合
+    """
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        raise ValueError("no JSON object in output")
+    text = text[min(starts):]
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    try:
+        # シングルクォートの Python の辞書表記
+        return ast.literal_eval(text.strip())
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        pass
+    return json.loads(_TRAILING_COMMA.sub(r"\1", _close(text)))
+
+
+def _close(text: str) -> str:
+    """文字列の外の Python リテラルを変換し、閉じられていない文字列・括弧を補う。
+
+    最上位の値が閉じた後の余分な文字列は捨てる。
+    """
+    out: list[str] = []
+    stack: list[str] = []
+    in_string = escaped = False
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if in_string:
+            out.append(c)
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+            out.append(c)
+        elif c in "{[":
+            stack.append("}" if c == "{" else "]")
+            out.append(c)
+        elif c in "}]":
+            if stack and stack[-1] == c:
+                stack.pop()
+                out.append(c)
+            if not stack:
+                break
+        else:
+            word = _WORD.match(text, i)
+            if word:
+                out.append(_PY_LITERALS.get(word.group(), word.group()))
+                i += len(word.group())
+                continue
+            out.append(c)
+        i += 1
+    if in_string:
+        out.append('"')
+    body = "".join(out).rstrip()
+    # 途中で切れた「キー:」や末尾のカンマを落としてから括弧を閉じる
+    body = re.sub(r'(,\s*"[^"]*"\s*:?\s*|,\s*|:\s*)$', "", body) if stack else body
+    return body + "".join(reversed(stack))
+
+
+def repair_output(schema: type[BaseModel], text: str) -> BaseModel:
+    """モデルの出力テキストを修復し、スキーマで検証したオブジェクトを返す。
+
+    Raises:
+        ValueError: 修復できない場合 (ValidationError を含む)
+    """
+    return repair_data(schema, repair_json(text))
+
+
+def repair_data(schema: type[BaseModel], data: Any) -> BaseModel:
+    """デコード済みの出力をスキーマに合わせて修復し、検証したオブジェクトを返す。
+
+    data は変更しない。
+
+    Raises:
+        ValueError: 修復できない場合 (ValidationError を含む)
+    """
+    data = copy.deepcopy(data)
+    for _ in range(_MAX_SCHEMA_FIXES):
+        try:
+            return schema.model_validate(data)
+        except ValidationError as e:
+            if not any(_drop(data, error["loc"], error["type"]) for error in e.errors()):
+                raise
+    return schema.model_validate(data)
+
+
+def _drop(data: Any, loc: tuple, error_type: str) -> bool:
+    """検証エラーの位置の値を削除する。削除できたら True。
+
+    値の誤りはその項目を、必須項目の欠落は最も内側のリストの要素を削除する。
+    """
+    parents = []
+    node = data
+    for key in loc[:-1]:
+        try:
+            parents.append((node, key))
+            node = node[key]
+        except (KeyError, IndexError, TypeError):
+            return False
+    last = loc[-1] if loc else None
+    if error_type != "missing" and isinstance(node, dict) and last in node:
+        del node[last]
+        return True
+    if error_type != "missing" and isinstance(node, list) and isinstance(last, int) and last < len(node):
+        del node[last]
+        return True
+    # 必須項目の欠落: 最も内側のリストの要素ごと削除する
+    for container, key in reversed(parents):
+        if isinstance(container, list):
+            del container[key]
+            return True
+    return False
+
+
+def repair_callback(schema: type[BaseModel]) -> Callable[[CallbackContext, LlmResponse], None]:
+    """output_schema の検証の前にモデルの出力を修復する after_model_callback を作る。
+
+    テキストの出力と、set_model_response の関数呼び出しの引数を修復する。
+    """
+
+    def callback(callback_context: CallbackContext, llm_response: LlmResponse) -> None:
+        content = llm_response.content
+        if llm_response.partial or not content or not content.parts:
+            return None
+        calls = [p.function_call for p in content.parts if p.function_call]
+        if calls:
+            for call in calls:
+                if call.name == _SET_MODEL_RESPONSE:
+                    _repair_call(schema, callback_context.agent_name, call)
+            return None
+        parts = [p for p in content.parts if p.text and not p.thought]
+        if not parts:
+            return None
+        text = "".join(p.text for p in parts)
+        try:
+            schema.model_validate_json(text)
+            _stats["valid"] += 1
+            return None
+        except ValidationError:
+            pass
+        try:
+            repaired = repair_output(schema, text)
+        except ValueError as e:
+            _stats["failed"] += 1
+            logger.warning("%s: could not repair structured output: %s", callback_context.agent_name, e)
+            return None
+        _stats["repaired"] += 1
+        # 後続の after_model_callback (応答キャッシュ等) も実行されるよう、
+        # 応答をその場で書き換えて None を返す
+        parts[0].text = repaired.model_dump_json(exclude_none=True)
+        for part in parts[1:]:
+            part.text = ""
+        return None
+
+    return callback
+
+
+def _repair_call(schema: type[BaseModel], agent_name: str, call: Any) -> None:
+    """set_model_response の引数をその場で修復する。修復できなければ変更しない。"""
+    args = call.args or {}
+    try:
+        schema.model_validate(args)
+        _stats["valid"] += 1
+        return
+    except ValidationError:
+        pass
+    try:
+        repaired = repair_data(schema, args)
+    except ValueError as e:
+        _stats["failed"] += 1
+        logger.warning("%s: could not repair %s arguments: %s", agent_name, _SET_MODEL_RESPONSE, e)
+        return
+    _stats["repaired"] += 1
+    call.args = repaired.model_dump(mode="json", exclude_none=True)
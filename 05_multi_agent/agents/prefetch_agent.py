@@ -0,0 +1,142 @@
+"""Data Prefetch Agent (LLM を使わない Phase 1 のデータ取得)。
+
+Phase 1 の各アナリストの指示で固定の順に呼び出していたツールを、
+LLM のツール選択を介さずにコードから並行に呼び出し、生の結果を
+セッションステートに書き込む。各アナリストはこの結果を要約するだけになり、
+LLM 呼び出しはエージェントごとに 1 回で済む。
+
+    - ティッカーはユーザーのクエリから抽出する。キャッシュタグ ($NVDA)・括弧書き ((NVDA))
+      を優先し、2 文字以上の候補のうち企業プロフィールを取得できたものだけを採用する
+      ("Should I buy NVDA?" の I や "OK, analyze TSLA" の OK は採用しない)
+    - ティッカーが見つからない場合は取得済みのデータを空にする
+      (同じセッションの前のクエリのデータを使わず、各アナリストがツールで取得する)
+    - 失敗したツールの結果は {"error": ...} として書き込む (アナリストがツールで補完する)
+"""
+
+import asyncio
+import json
+import re
+from typing import AsyncGenerator, Awaitable, Callable
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from ..tools.aio.finnhub_tools import (
+    get_basic_financials,
+    get_company_profile,
+    get_social_sentiment,
+    get_stock_quote,
+)
+from ..tools.aio.fred_tools import get_derived_economic_metrics, get_economic_indicators
+from ..tools.aio.news_tools import get_news_digest
+from ..tools.aio.reddit_tools import get_reddit_sentiment_summary
+from ..tools.reddit_index import as_ticker
+
+# ステートのキーごとに、{結果のキー: ティッカーを受け取ってツールを呼び出す関数}
+# (各アナリストの指示のツール呼び出し手順と同じ内容)
+PREFETCH_TOOLS: dict[str, dict[str, Callable[[str], Awaitable[dict]]]] = {
+    "news_raw": {
+        "news_digest": lambda symbol: get_news_digest(symbol),
+    },
+    "financial_raw": {
+        "stock_quote": lambda symbol: get_stock_quote(symbol),
+        "company_profile": lambda symbol: get_company_profile(symbol),
+        "basic_financials": lambda symbol: get_basic_financials(symbol),
+        "economic_indicators": lambda symbol: get_economic_indicators(),
+        "derived_economic_metrics": lambda symbol: get_derived_economic_metrics(),
+    },
+    "sentiment_raw": {
+        "reddit_symbol_sentiment": lambda symbol: get_reddit_sentiment_summary(query=symbol),
+        "reddit_hot_sentiment": lambda symbol: get_reddit_sentiment_summary(query=""),
+        "social_sentiment": lambda symbol: get_social_sentiment(symbol),
+    },
+}
+
+
+_CASHTAG = re.compile(r"\$([A-Za-z]{2,5})\b")
+_PAREN_TICKER = re.compile(r"\(([A-Z]{2,5})\)")
+_BARE_TICKER = re.compile(r"\b[A-Z]{2,5}\b")
+# 企業プロフィールで確認する候補数の上限
+_MAX_CANDIDATES = 3
+
+
+def ticker_candidates(query: str) -> list[str]:
+    """クエリからティッカーの候補を優先順に返す。
+
+    キャッシュタグ ($NVDA) と括弧書き ((NVDA)) を出現順に優先し、続いて
+    2〜5 文字の大文字の語 (Reddit インデックスの略語リストを除く) を出現順に返す。
+    1 文字の語は候補にしない。
+    """
+    explicit = sorted([*_CASHTAG.finditer(query), *_PAREN_TICKER.finditer(query)], key=lambda m: m.start())
+    bare = [t for t in _BARE_TICKER.findall(query) if as_ticker(t)]
+    return list(dict.fromkeys([m.group(1).upper() for m in explicit] + bare))
+
+
+async def find_symbol(query: str) -> str | None:
+    """クエリのティッカーを返す (見つからなければ None)。
+
+    候補のうち、企業プロフィール (企業名) を取得できた最初のものを採用する。
+    """
+    candidates = ticker_candidates(query)[:_MAX_CANDIDATES]
+    profiles = await asyncio.gather(
+        *(get_company_profile(c) for c in candidates), return_exceptions=True
+    )
+    for candidate, profile in zip(candidates, profiles):
+        if isinstance(profile, dict) and profile.get("name"):
+            return candidate
+    return None
+
+
+async def prefetch(symbol: str) -> dict[str, str]:
+    """PREFETCH_TOOLS のツールをすべて並行に呼び出す。
+
+    Returns:
+        {ステートのキー: {結果のキー: ツールの戻り値} の JSON 文字列}
+    """
+    calls = [
+        (state_key, name, call)
+        for state_key, tools in PREFETCH_TOOLS.items()
+        for name, call in tools.items()
+    ]
+    results = await asyncio.gather(
+        *(call(symbol) for _, _, call in calls), return_exceptions=True
+    )
+
+    grouped: dict[str, dict] = {state_key: {"symbol": symbol} for state_key in PREFETCH_TOOLS}
+    for (state_key, name, _), result in zip(calls, results):
+        if isinstance(result, BaseException):
+            result = {"error": f"{type(result).__name__}: {result}"}
+        grouped[state_key][name] = result
+    # 指示に埋め込んだときにそのまま JSON として読めるよう、文字列で保存する
+    return {
+        state_key: json.dumps(value, ensure_ascii=False, default=str)
+        for state_key, value in grouped.items()
+    }
+
+
+class DataPrefetchAgent(BaseAgent):
+    """Phase 1 のツールをコードから並行に呼び出し、結果をステートに書き込むエージェント。"""
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        query = ""
+        if ctx.user_content and ctx.user_content.parts:
+            query = " ".join(part.text for part in ctx.user_content.parts if part.text)
+        symbol = await find_symbol(query)
+        if symbol is None:
+            # 前のクエリで取得したデータが指示に埋め込まれないよう空にする
+            state_delta = dict.fromkeys(PREFETCH_TOOLS)
+        else:
+            state_delta = await prefetch(symbol)
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+        )
+
+
+prefetch_agent = DataPrefetchAgent(
+    name="data_prefetch_agent",
+    description="Phase 1 のデータ (ニュース, 財務, センチメント) をツールから並行に取得し、セッションステートに保存するエージェント",
+)
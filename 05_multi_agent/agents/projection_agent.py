@@ -0,0 +1,148 @@
+"""State Projection Agent (フェーズ間のステート射影)。
+
+Phase 1 の出力 (news_data, financial_data, sentiment_data) をそのまま
+Phase 2 / Phase 3 の指示に埋め込むと、同じ JSON が 1 回の実行で 2 回モデルに送られ、
+Phase 1 が出力するフィールドが増えるほど後続のプロンプトが大きくなる。
+後続のエージェントの直前で、そのエージェントが使うフィールド
+(STATE_PROJECTIONS) だけを残した JSON を 1 つのキー ({target}_inputs) に書き込む。
+
+    - LLM は呼び出さない
+    - JSON として読めない出力 (テキストのみの応答等) は射影せずにそのまま渡す
+    - 射影前後のトークン数を projection_stats に記録する
+      (sentencepiece があれば Gemini のローカルトークナイザー、なければ文字数からの概算)
+"""
+
+import json
+from typing import Any, AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from ..config.settings import MODEL_ID, STATE_PROJECTION_ENABLED, STATE_PROJECTIONS
+from .output_repair import repair_json
+
+try:
+    from google.genai.local_tokenizer import LocalTokenizer
+except ImportError:  # sentencepiece は任意の依存
+    LocalTokenizer = None
+
+# None: 未初期化, False: 使用不可
+_tokenizer = None
+
+
+def parse_output(value: Any) -> Any:
+    """エージェントの出力をデコードする。
+
+    output_schema で検証済みの出力 (辞書) はそのまま、文字列は JSON として修復・デコードする。
+    デコードできなければ元の値を返す。
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        return repair_json(value)
+    except ValueError:
+        return value
+
+
+def project(value: Any, paths: list[str] | None) -> Any:
+    """value から paths のフィールドだけを残した値を返す。
+
+    パスはドット区切り。途中の値がリストなら要素ごとに射影し、
+    存在しないフィールドは出力しない。paths が None なら値全体を返す。
+    """
+    if paths is None or not isinstance(value, (dict, list)):
+        return value
+    tree: dict = {}
+    for path in paths:
+        node = tree
+        *parents, leaf = path.split(".")
+        for name in parents:
+            node = node.setdefault(name, {})
+            if node is None:
+                break
+        else:
+            node[leaf] = None
+    return _select(value, tree)
+
+
+def _select(value: Any, tree: dict | None) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_select(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {name: _select(value[name], sub) for name, sub in tree.items() if name in value}
+
+
+def count_tokens(text: str) -> int:
+    """テキストのトークン数を返す。
+
+    Gemini のローカルトークナイザーが使えない環境では、ASCII は 4 文字で 1 トークン、
+    それ以外 (日本語等) は 1 文字 1 トークンとして概算する。
+    """
+    global _tokenizer
+    if _tokenizer is None:
+        # トークナイザーのモデルを取得できない (オフライン等) 場合は以後も概算を使う
+        try:
+            _tokenizer = LocalTokenizer(model_name=MODEL_ID) if LocalTokenizer else False
+        except Exception:
+            _tokenizer = False
+    if _tokenizer:
+        return _tokenizer.count_tokens(text).total_tokens
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return (ascii_chars + 3) // 4 + len(text) - ascii_chars
+
+
+def _dumps(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def build_inputs(state: dict, target: str) -> tuple[dict, dict]:
+    """target のエージェントに渡す入力と、射影前後のトークン数を返す。"""
+    fields = STATE_PROJECTIONS[target]
+    inputs, before = {}, 0
+    for key, paths in fields.items():
+        if key not in state:
+            continue
+        # 射影前: 値をそれぞれ指示に埋め込んでいた場合のトークン数
+        before += count_tokens(_dumps(state[key]))
+        value = parse_output(state[key])
+        inputs[key] = project(value, paths) if STATE_PROJECTION_ENABLED else value
+    return inputs, {"tokens_before": before, "tokens_after": count_tokens(_dumps(inputs))}
+
+
+class StateProjectionAgent(BaseAgent):
+    """target のエージェントが使うフィールドだけを {target}_inputs に書き込むエージェント。"""
+
+    target: str
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        inputs, stats = build_inputs(state, self.target)
+        projection_stats = {**state.get("projection_stats", {}), self.target: stats}
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={
+                f"{self.target}_inputs": _dumps(inputs),
+                "projection_stats": projection_stats,
+            }),
+        )
+
+
+trend_projection_agent = StateProjectionAgent(
+    name="trend_projection_agent",
+    description="Phase 1 の出力からトレンド分析に使うフィールドだけを取り出すエージェント",
+    target="trend",
+)
+
+strategy_projection_agent = StateProjectionAgent(
+    name="strategy_projection_agent",
+    description="Phase 1 / Phase 2 の出力から戦略立案に使うフィールドだけを取り出すエージェント",
+    target="strategy",
+)
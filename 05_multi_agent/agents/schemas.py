@@ -0,0 +1,246 @@
+"""エージェントの出力スキーマ (Pydantic)。
+
+各エージェントの output_schema に指定し、モデルの JSON レスポンスモード
+(response_schema) で出力の形を強制する。ADK は検証済みの出力を辞書として
+output_key のステートに保存するため、後続のフェーズは JSON をパースし直さず、
+load_output で型付きのオブジェクトとして読み出せる。
+
+    - 列挙値 (HIGH / MEDIUM / LOW 等) は大文字・小文字や空白・ハイフンの揺れを正規化する
+    - 各フェーズの要となる項目は必須、それ以外は省略可 (欠けても検証に失敗しない)
+"""
+
+from typing import Annotated, Any, Literal
+
+from pydantic import BaseModel, BeforeValidator, Field
+
+
+def _enum(*values: str) -> Any:
+    """表記揺れを正規化する列挙型 (例: "high" → "HIGH", "risk-on" → "RISK_ON")。"""
+    canonical = {v.upper().replace("_", " "): v for v in values}
+
+    def normalize(value: Any) -> Any:
+        if isinstance(value, str):
+            key = " ".join(value.replace("_", " ").replace("-", " ").upper().split())
+            return canonical.get(key, value)
+        return value
+
+    return Annotated[Literal[values], BeforeValidator(normalize)]
+
+
+Level = _enum("HIGH", "MEDIUM", "LOW")
+Direction = _enum("UP", "DOWN", "SIDEWAYS")
+
+
+# --- News & Social Media Agent (news_data) ---
+
+class KeyEvent(BaseModel):
+    event: str
+    impact: Level
+    description: str = ""
+
+
+class NewsItem(BaseModel):
+    headline: str
+    source: str = ""
+    impact: Level | None = None
+    sentiment: _enum("positive", "neutral", "negative") | None = None
+    sentiment_score: float | None = None
+    relevance: str = ""
+
+
+class NewsOutput(BaseModel):
+    summary: str = Field(description="市場ニュースの全体サマリー (3文以内)")
+    key_events: list[KeyEvent] = []
+    news_items: list[NewsItem] = []
+    market_mood: _enum("RISK_ON", "NEUTRAL", "RISK_OFF")
+
+
+# --- Financial Analysis Agent (financial_data) ---
+
+class CompanyOverview(BaseModel):
+    name: str = ""
+    symbol: str = ""
+    industry: str = ""
+    market_cap: float | None = None
+
+
+class StockAnalysis(BaseModel):
+    current_price: float | None = None
+    change_percent: float | None = None
+    week_52_high: float | None = None
+    week_52_low: float | None = None
+    position_in_range: str = Field("", description="52週レンジ内の位置 (上位/中位/下位)")
+
+
+class Valuation(BaseModel):
+    pe_ratio: float | None = None
+    pb_ratio: float | None = None
+    dividend_yield: float | None = None
+    assessment: _enum("UNDERVALUED", "FAIR", "OVERVALUED") | None = None
+
+
+class Profitability(BaseModel):
+    roe: float | None = None
+    roa: float | None = None
+    eps_ttm: float | None = None
+    revenue_growth: float | None = None
+    assessment: _enum("STRONG", "MODERATE", "WEAK") | None = None
+
+
+class EconomicContext(BaseModel):
+    gdp_trend: str = Field("", description="成長/鈍化/縮小")
+    inflation: str = Field("", description="上昇/安定/低下")
+    interest_rate_environment: str = Field("", description="引き締め/中立/緩和")
+    market_volatility: str = Field("", description="VIX水準による評価")
+
+
+class FinancialOutput(BaseModel):
+    company_overview: CompanyOverview = CompanyOverview()
+    stock_analysis: StockAnalysis = StockAnalysis()
+    valuation: Valuation = Valuation()
+    profitability: Profitability = Profitability()
+    economic_context: EconomicContext = EconomicContext()
+    fundamental_assessment: _enum("STRONG", "NEUTRAL", "WEAK")
+    assessment_rationale: str = Field(description="評価の根拠 (3文以内)")
+
+
+# --- Sentiment Agent (sentiment_data) ---
+
+class RedditAnalysis(BaseModel):
+    total_posts_analyzed: int = 0
+    bullish_posts: int = 0
+    bearish_posts: int = 0
+    neutral_posts: int = 0
+    average_engagement: float = 0.0
+    top_subreddits: list[str] = []
+
+
+class SocialMediaMetrics(BaseModel):
+    reddit_mentions: int = 0
+    reddit_positive_score: float = 0.0
+    reddit_negative_score: float = 0.0
+    twitter_mentions: int = 0
+    twitter_positive_score: float = 0.0
+    twitter_negative_score: float = 0.0
+
+
+class NotablePost(BaseModel):
+    title: str
+    subreddit: str = ""
+    score: int = 0
+    sentiment: _enum("bullish", "neutral", "bearish") | None = None
+    key_insight: str = ""
+
+
+class SentimentOutput(BaseModel):
+    overall_sentiment: _enum("BULLISH", "NEUTRAL", "BEARISH")
+    sentiment_score: float
+    confidence: float
+    reddit_analysis: RedditAnalysis = RedditAnalysis()
+    social_media_metrics: SocialMediaMetrics = SocialMediaMetrics()
+    trending_topics: list[str] = []
+    notable_posts: list[NotablePost] = []
+    anomalies: list[str] = []
+
+
+# --- Trend Analysis Agent (trend_analysis) ---
+
+class MarketTrend(BaseModel):
+    trend: str
+    direction: Direction
+    confidence: float = 0.0
+    timeframe: _enum("SHORT", "MID") | None = None
+    supporting_evidence: list[str] = []
+
+
+class CrossSourceAnalysis(BaseModel):
+    news_sentiment_alignment: _enum("ALIGNED", "DIVERGENT") | None = None
+    fundamental_sentiment_alignment: _enum("ALIGNED", "DIVERGENT") | None = None
+    key_divergences: list[str] = []
+
+
+class SectorAnalysis(BaseModel):
+    sector: str = ""
+    sector_trend: Direction | None = None
+    company_relative_strength: _enum("OUTPERFORM", "INLINE", "UNDERPERFORM") | None = None
+
+
+class RiskFactor(BaseModel):
+    risk: str
+    severity: Level | None = None
+    probability: Level | None = None
+    mitigation: str = ""
+
+
+class TrendOutput(BaseModel):
+    market_trends: list[MarketTrend] = []
+    cross_source_analysis: CrossSourceAnalysis = CrossSourceAnalysis()
+    sector_analysis: SectorAnalysis = SectorAnalysis()
+    risk_factors: list[RiskFactor] = []
+    key_insight: str = Field(description="最も重要な発見の要約 (2文以内)")
+
+
+# --- Strategy Agent (strategy_report) ---
+
+DISCLAIMER = (
+    "本レポートは情報提供目的であり、投資助言ではありません。"
+    "投資判断はご自身の責任で行ってください。"
+)
+
+
+class Recommendation(BaseModel):
+    symbol: str
+    action: _enum("BUY", "HOLD", "SELL")
+    rationale: str = ""
+    confidence: float = 0.0
+    risk_level: Level | None = None
+    target_price_range: str = ""
+    stop_loss_suggestion: str = ""
+
+
+class KeyRisk(BaseModel):
+    risk: str
+    impact: Level | None = None
+    mitigation: str = ""
+
+
+class RiskAssessment(BaseModel):
+    overall_risk: Level | None = None
+    key_risks: list[KeyRisk] = []
+
+
+class Catalyst(BaseModel):
+    event: str
+    expected_date: str = ""
+    potential_impact: Level | None = None
+    scenario: str = ""
+
+
+class StrategyOutput(BaseModel):
+    executive_summary: str = Field(description="エグゼクティブサマリー (3文以内)")
+    market_environment: _enum("FAVORABLE", "NEUTRAL", "UNFAVORABLE")
+    recommendations: list[Recommendation] = []
+    risk_assessment: RiskAssessment = RiskAssessment()
+    upcoming_catalysts: list[Catalyst] = []
+    disclaimer: str = DISCLAIMER
+
+
+# output_key ごとの出力スキーマ
+OUTPUT_SCHEMAS: dict[str, type[BaseModel]] = {
+    "news_data": NewsOutput,
+    "financial_data": FinancialOutput,
+    "sentiment_data": SentimentOutput,
+    "trend_analysis": TrendOutput,
+    "strategy_report": StrategyOutput,
+}
+
+
+def load_output(state: dict, key: str) -> BaseModel | None:
+    """ステートに保存されたエージェントの出力を型付きのオブジェクトとして返す。
+
+    出力がない場合は None。
+    """
+    value = state.get(key)
+    if value is None:
+        return None
+    return OUTPUT_SCHEMAS[key].model_validate(value)
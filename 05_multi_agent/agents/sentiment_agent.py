@@ -6,24 +6,39 @@ Reddit・SNSのセンチメントを分析し、個人投資家の感情を定
 from google.adk.agents import Agent
 
 from ..config.settings import MODEL_ID
-from ..tools.finnhub_tools import get_social_sentiment
-from ..tools.reddit_tools import get_reddit_hot_posts, search_reddit_posts
+from ..tools.aio.finnhub_tools import get_social_sentiment
+from ..tools.aio.reddit_tools import get_reddit_sentiment_summary, search_reddit_posts
+from .output_repair import repair_callback
+from .schemas import SentimentOutput
 
 SENTIMENT_AGENT_INSTRUCTION = """\
 あなたは市場センチメント分析の専門家です。
-ユーザーが指定した銘柄・トピックについて、以下のタスクを実行してください:
+ユーザーが指定した銘柄・トピックについて、以下のタスクを実行してください。
 
-1. search_reddit_posts で対象銘柄に関する Reddit の投稿を検索
-2. get_reddit_hot_posts で投資系サブレディットの人気投稿を取得
+取得済みのデータ (手順 1〜3 の get_reddit_sentiment_summary, get_social_sentiment の結果):
+{sentiment_raw?}
+
+取得済みのデータがある場合は手順 1〜3 のツールを呼び出さず、このデータから直接結果を出力すること。
+データがない、または error の項目のみツールで取得する。
+
+1. get_reddit_sentiment_summary(query=対象銘柄) で対象銘柄に関する Reddit 投稿の
+   センチメント集計を取得
+2. get_reddit_sentiment_summary(query="") で投資系サブレディットの人気投稿の集計を取得
 3. get_social_sentiment で Finnhub のソーシャルセンチメントデータを取得
-4. 投稿内容から個人投資家の感情 (強気/弱気) を分析
-5. バズワード、トレンドトピック、異常なセンチメント変化を特定
+   (時間バケットごとのメンション速度・z スコアと、検出済みの異常 anomalies を含む)
+4. 集計結果 (強気/弱気/中立の件数、加重スコア、サブレディット別の傾向) を解釈
+5. 頻出語句 (top_terms) と注目投稿 (top_posts) から、バズワード、トレンドトピック、
+   異常なセンチメント変化を特定
+   (個別投稿の本文を確認する必要がある場合のみ search_reddit_posts を小さい limit で使う)
 
 分析のポイント:
 - r/wallstreetbets: ミーム株、短期トレード志向、攻撃的な言語も多い
 - r/stocks: 中期的な株式投資議論
 - r/investing: 長期投資、バリュー投資寄り
 - 注意: WSB では攻撃的な表現が必ずしもネガティブではない
+  (集計では罵倒語・スラングは極性に数えず、強調としてのみ扱っている)
+- 投稿件数は集計の bullish_posts / bearish_posts / neutral_posts をそのまま使い、
+  投稿を数え直さない
 
 以下の JSON 形式で結果を出力してください:
 
@@ -57,7 +72,7 @@ SENTIMENT_AGENT_INSTRUCTION = """\
       "key_insight": "この投稿から読み取れる示唆"
     }
   ],
-  "anomalies": ["異常なセンチメント変化があれば記載"]
+  "anomalies": ["get_social_sentiment の anomalies をもとに、異常なセンチメント変化があれば記載"]
 }
 """
 
@@ -67,9 +82,11 @@ sentiment_agent = Agent(
     description="Reddit・SNSのセンチメントを分析し、個人投資家の感情を定量化するエージェント",
     instruction=SENTIMENT_AGENT_INSTRUCTION,
     output_key="sentiment_data",
+    output_schema=SentimentOutput,
+    after_model_callback=repair_callback(SentimentOutput),
     tools=[
-        search_reddit_posts,
-        get_reddit_hot_posts,
+        get_reddit_sentiment_summary,
         get_social_sentiment,
+        search_reddit_posts,
     ],
 )
@@ -7,15 +7,16 @@
 from google.adk.agents import Agent
 
 from ..config.settings import MODEL_ID
+from .output_repair import repair_callback
+from .schemas import StrategyOutput
 
 STRATEGY_AGENT_INSTRUCTION = """\
 あなたは投資戦略のシニアストラテジストです。
-すべての分析結果を踏まえ、投資推奨レポートを生成してください:
+すべての分析結果を踏まえ、投資推奨レポートを生成してください
+(trend_analysis: トレンド分析, news_data: ニュースデータ, financial_data: 財務データ,
+sentiment_data: センチメントデータ。推奨に使う項目のみ):
 
-- トレンド分析: {trend_analysis}
-- ニュースデータ: {news_data}
-- 財務データ: {financial_data}
-- センチメントデータ: {sentiment_data}
+{strategy_inputs}
 
 以下の内容を含むレポートを生成してください:
 
@@ -75,4 +76,6 @@ strategy_agent = Agent(
     description="すべての分析結果に基づき、実行可能な投資推奨レポートを生成するエージェント",
     instruction=STRATEGY_AGENT_INSTRUCTION,
     output_key="strategy_report",
+    output_schema=StrategyOutput,
+    after_model_callback=repair_callback(StrategyOutput),
 )
@@ -7,14 +7,16 @@
 from google.adk.agents import Agent
 
 from ..config.settings import MODEL_ID
+from .output_repair import repair_callback
+from .schemas import TrendOutput
 
 TREND_AGENT_INSTRUCTION = """\
 あなたは市場トレンドの専門アナリストです。
-Phase 1 で収集された以下のデータを統合分析してください:
+Phase 1 で収集された以下のデータを統合分析してください
+(news_data: ニュースデータ, financial_data: 財務データ, sentiment_data: センチメントデータ。
+分析に使う項目のみ):
 
-- ニュースデータ: {news_data}
-- 財務データ: {financial_data}
-- センチメントデータ: {sentiment_data}
+{trend_inputs}
 
 以下の分析を実行してください:
 
@@ -76,4 +78,6 @@ trend_analysis_agent = Agent(
     description="収集データを統合分析し、市場パターン、トレンド、リスク要因を特定するエージェント",
     instruction=TREND_AGENT_INSTRUCTION,
     output_key="trend_analysis",
+    output_schema=TrendOutput,
+    after_model_callback=repair_callback(TrendOutput),
 )
@@ -0,0 +1,234 @@
+"""ウォッチリストの一括分析 (バッチモード)。
+
+銘柄ごとに 1 セッションを作成し、root_agent を同時実行数の上限付きで並行実行する。
+全銘柄が同じプロセス・同じイベントループ (run_pipeline_async) で動くため、
+ツールのキャッシュ・single-flight・レート制限
+(SQLite のトークンバケット) は銘柄間で共有される。
+
+    - 開始前に Marketaux のニュースをウォッチリスト全体で一括取得し、
+      銘柄ごとのキャッシュに登録しておく (日次枠を銘柄数ぶん消費しない)
+    - 銘柄ごとの結果は完了した順に JSON Lines へ追記する (途中で止まっても残る)
+    - 進捗と銘柄ごとの所要時間 (エージェント別の内訳) を表示する
+
+実行方法:
+    python -m 05_multi_agent.batch AAPL MSFT NVDA
+    python -m 05_multi_agent.batch --file watchlist.txt --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime
+
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+
+from .agents.llm_cache import get_llm_cache_stats
+from .config.settings import BATCH_MAX_CONCURRENCY, BATCH_OUTPUT_DIR
+from .main import STATE_KEYS, check_api_keys, create_runner, run_pipeline_async
+from .tools.aio.marketaux_tools import get_financial_news_batch
+from .tools.cache import get_cache_stats
+from .tools.quote_stream import start_quote_stream
+from .tools.singleflight import get_coalescing_stats
+
+USER_ID = "batch_user"
+
+QUERY_TEMPLATE = (
+    "{symbol} の投資判断を分析してください。"
+    "最新のニュース、財務状況、個人投資家のセンチメントを踏まえて、"
+    "市場トレンドを分析し、投資戦略を推奨してください。"
+)
+
+
+def load_tickers(symbols: list[str], path: str | None = None) -> list[str]:
+    """コマンドライン引数とファイルからティッカーのリストを作る (重複は除く)。
+
+    ファイルは 1 行 1 銘柄 (カンマ・空白区切りも可)。# 以降はコメント。
+    """
+    tokens = list(symbols)
+    if path:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                tokens.extend(line.split("#", 1)[0].replace(",", " ").split())
+    return list(dict.fromkeys(t.strip().upper() for t in tokens if t.strip()))
+
+
+async def prefetch_news(tickers: list[str]) -> dict:
+    """Marketaux のニュースを一括取得し、銘柄ごとのキャッシュに登録する。"""
+    try:
+        return await get_financial_news_batch(",".join(tickers))
+    except Exception as e:
+        return {"error": str(e)}
+
+
+async def analyze_ticker(runner: InMemoryRunner, symbol: str) -> dict:
+    """1 銘柄分のパイプラインを専用のセッションで実行する。
+
+    Returns:
+        セッションステートの各フェーズの出力 (state) と、エージェントごとの
+        最初のイベントから最後のイベントまでの秒数 (agents)
+    """
+    spans: dict[str, list[float]] = {}
+    start = time.perf_counter()
+
+    def track(event: Event) -> None:
+        now = time.perf_counter() - start
+        span = spans.setdefault(event.author, [now, now])
+        span[1] = now
+
+    # 数百銘柄分のセッションをメモリに残さないよう、実行後に削除する
+    state = await run_pipeline_async(
+        QUERY_TEMPLATE.format(symbol=symbol),
+        runner=runner,
+        user_id=USER_ID,
+        session_id=f"{symbol.lower()}-{uuid.uuid4().hex[:8]}",
+        on_event=track,
+        keep_session=False,
+    )
+    return {
+        "state": {key: state.get(key) for key in STATE_KEYS},
+        "projection": state.get("projection_stats", {}),
+        "agents": {name: round(end - begin, 2) for name, (begin, end) in spans.items()},
+    }
+
+
+async def run_batch(
+    tickers: list[str],
+    output_path: str,
+    concurrency: int = BATCH_MAX_CONCURRENCY,
+) -> dict:
+    """銘柄ごとのパイプラインを concurrency 件ずつ並行実行し、結果を追記する。
+
+    Returns:
+        成功・失敗の件数、全体と銘柄ごとの所要時間の統計、フェーズ間の射影前後のトークン数の合計
+
+    Raises:
+        ValueError: concurrency が 1 未満の場合 (どの銘柄も実行されず待ち続けるため)
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1 (got {concurrency})")
+    runner = create_runner()
+    semaphore = asyncio.Semaphore(concurrency)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+    prefetch = await prefetch_news(tickers)
+    if "error" in prefetch:
+        print(f"ニュースの一括取得をスキップ: {prefetch['error']}")
+    else:
+        print(
+            f"ニュースの一括取得: {len(prefetch['fetched'])} 銘柄を {prefetch['requests']} リクエストで取得 "
+            f"(キャッシュ {len(prefetch['cached'])} / 次回に回した銘柄 {len(prefetch['deferred'])})"
+        )
+
+    elapsed: list[float] = []
+    failed: list[str] = []
+    tokens = {"before": 0, "after": 0}
+    start = time.perf_counter()
+
+    with open(output_path, "a", encoding="utf-8") as out:
+
+        async def run_one(symbol: str) -> None:
+            async with semaphore:
+                ticker_start = time.perf_counter()
+                record = {"symbol": symbol, "started_at": datetime.now().isoformat(timespec="seconds")}
+                try:
+                    record.update(status="ok", **await analyze_ticker(runner, symbol))
+                    for stats in record["projection"].values():
+                        tokens["before"] += stats["tokens_before"]
+                        tokens["after"] += stats["tokens_after"]
+                except Exception as e:
+                    record.update(status="error", error=f"{type(e).__name__}: {e}")
+                    failed.append(symbol)
+                seconds = time.perf_counter() - ticker_start
+            record["elapsed"] = round(seconds, 2)
+            elapsed.append(seconds)
+            # 同じイベントループ上の書き込みなのでロックは不要
+            out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            out.flush()
+            status = "完了" if record["status"] == "ok" else f"失敗 ({record['error']})"
+            print(f"[{len(elapsed):>{len(str(len(tickers)))}}/{len(tickers)}] {symbol:<6} {status} {seconds:.1f}s")
+
+        await asyncio.gather(*(run_one(symbol) for symbol in tickers))
+
+    wall = time.perf_counter() - start
+    return {
+        "tickers": len(tickers),
+        "succeeded": len(tickers) - len(failed),
+        "failed": failed,
+        "wall_seconds": round(wall, 1),
+        "ticker_seconds": {
+            "mean": round(statistics.mean(elapsed), 1) if elapsed else None,
+            "median": round(statistics.median(elapsed), 1) if elapsed else None,
+            "max": round(max(elapsed), 1) if elapsed else None,
+        },
+        "projection_tokens": tokens,
+    }
+
+
+def _print_summary(summary: dict, output_path: str) -> None:
+    """バッチ全体の結果とツール層の共有状況を表示する。"""
+    print(f"\n{'='*60}")
+    print(f"バッチ完了: {summary['succeeded']}/{summary['tickers']} 銘柄 ({summary['wall_seconds']}s)")
+    stats = summary["ticker_seconds"]
+    print(f"銘柄あたり: 平均 {stats['mean']}s / 中央値 {stats['median']}s / 最大 {stats['max']}s")
+    if summary["failed"]:
+        print(f"失敗: {', '.join(summary['failed'])}")
+    print(f"結果: {output_path}")
+    tokens = summary["projection_tokens"]
+    if tokens["before"]:
+        print(f"フェーズ間の射影: {tokens['before']} → {tokens['after']} トークン")
+
+    flight = get_coalescing_stats()
+    print(f"\nツール API 呼び出し: {flight['upstream']} 回 (同時呼び出しの合流: {flight['coalesced']} 回)")
+    for endpoint, s in get_cache_stats()["endpoints"].items():
+        print(f"  {endpoint}: キャッシュヒット率 {s['hit_rate']:.0%}")
+
+    llm = get_llm_cache_stats()
+    print(f"\nLLM 応答キャッシュ: ヒット率 {llm['hit_rate']:.0%} (省略できた時間 {llm['saved_seconds']}s)")
+    for agent, s in llm["agents"].items():
+        print(f"  {agent}: キャッシュヒット率 {s['hit_rate']:.0%} ({s['saved_seconds']}s)")
+
+
+def positive_int(value: str) -> int:
+    """1 以上の整数を受け付ける argparse の type。"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"整数を指定してください: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"1 以上を指定してください: {number}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ウォッチリストの銘柄を一括で分析する")
+    parser.add_argument("symbols", nargs="*", help="ティッカー (例: AAPL MSFT)")
+    parser.add_argument("--file", help="ティッカーのリストファイル (1 行 1 銘柄)")
+    parser.add_argument(
+        "--concurrency", type=positive_int, default=BATCH_MAX_CONCURRENCY,
+        help=f"同時に実行する銘柄数 (デフォルト: {BATCH_MAX_CONCURRENCY})",
+    )
+    parser.add_argument("--output", help="結果の JSON Lines ファイル (デフォルト: BATCH_OUTPUT_DIR)")
+    args = parser.parse_args()
+
+    tickers = load_tickers(args.symbols, args.file)
+    if not tickers:
+        parser.error("ティッカーを引数または --file で指定してください")
+    output_path = args.output or os.path.join(
+        BATCH_OUTPUT_DIR, f"results-{datetime.now():%Y%m%d-%H%M%S}.jsonl"
+    )
+
+    check_api_keys()
+    start_quote_stream()
+
+    print(f"{len(tickers)} 銘柄を同時実行数 {args.concurrency} で分析します\n")
+    summary = asyncio.run(run_batch(tickers, output_path, args.concurrency))
+    _print_summary(summary, output_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Phase 1 (並列データ収集) のウォールタイム計測。
+
+ローカルに遅延付きのスタブ API サーバーを立て、News / Financial / Sentiment
+の3エージェントが指示通りにツールを呼び出す流れを再現する。
+LLM は呼び出さず、ツール層のみを計測する。
+
+    sync : 同期ツールをイベントループ上で呼ぶ (ParallelAgent が事実上直列化)
+    async: tools/aio の非同期ツールを使用 (最も遅いエージェント程度に短縮)
+
+実行方法:
+    python -m 05_multi_agent.benchmarks.phase1_bench --delay 0.2
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SYMBOL = "AAPL"
+
+_STUB_POST = {
+    "kind": "t3",
+    "data": {
+        "id": "stub1",
+        "name": "t3_stub1",
+        "subreddit": "stocks",
+        "title": "AAPL to the moon",
+        "score": 42,
+        "upvote_ratio": 0.9,
+        "num_comments": 7,
+        "created_utc": 1700000000.0,
+        "selftext": "Buying calls.",
+        "permalink": "/r/stocks/comments/stub1/",
+        "stickied": False,
+    },
+}
+
+# パス末尾ごとのスタブレスポンス
+_STUB_RESPONSES = {
+    "/quote": {"c": 190.0, "d": 1.2, "dp": 0.63, "h": 191.0, "l": 188.5, "o": 189.0, "pc": 188.8, "t": 0},
+    "/stock/profile2": {"name": "Apple Inc", "finnhubIndustry": "Technology", "marketCapitalization": 3e6},
+    "/stock/metric": {"metric": {"peBasicExclExtraTTM": 30.1, "beta": 1.2}},
+    "/news": [{"headline": "Markets rally", "summary": "Stocks rose.", "source": "stub"}],
+    "/company-news": [{"headline": "Apple earnings", "summary": "Apple beat.", "source": "stub"}],
+    "/stock/social-sentiment": {"reddit": [], "twitter": []},
+    "/series/observations": {"observations": [{"date": "2024-01-01", "value": "1.0"}]},
+    "/news/all": {"data": []},
+    "/hot": {"kind": "Listing", "data": {"children": [_STUB_POST], "after": None}},
+    "/new": {"kind": "Listing", "data": {"children": [_STUB_POST], "after": None}},
+    "/search": {"kind": "Listing", "data": {"children": [_STUB_POST], "after": None}},
+    "/api/v1/access_token": {"access_token": "stub", "token_type": "bearer", "expires_in": 3600, "scope": "*"},
+}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """全リクエストに一定の遅延を入れて固定レスポンスを返すハンドラ。"""
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.2
+
+    def _respond(self) -> None:
+        time.sleep(self.delay)
+        path = self.path.split("?", 1)[0].rstrip("/")
+        body = next(
+            (v for k, v in _STUB_RESPONSES.items() if path.endswith(k)),
+            {},
+        )
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        self._respond()
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._respond()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _start_stub_server(delay: float) -> ThreadingHTTPServer:
+    """スタブサーバーを起動し、各 API のベース URL を向け替える。"""
+    _StubHandler.delay = delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    base = f"http://127.0.0.1:{server.server_port}"
+    os.environ.update({
+        "FINNHUB_API_KEY": "stub",
+        "FINNHUB_BASE_URL": f"{base}/finnhub",
+        "FRED_API_KEY": "stub",
+        "FRED_BASE_URL": f"{base}/fred",
+        "MARKETAUX_API_KEY": "stub",
+        "MARKETAUX_BASE_URL": f"{base}/marketaux",
+        "REDDIT_CLIENT_ID": "stub",
+        "REDDIT_CLIENT_SECRET": "stub",
+        "REDDIT_URL": f"{base}/reddit",
+        # PRAW は oauth_url のパス部分を無視するためホストのみ指定する
+        "REDDIT_OAUTH_URL": base,
+        # 実運用のレート制限状態 (Marketaux の日次枠等) やローカルストアを使わない
+        "MARKET_INTEL_DATA_DIR": tempfile.mkdtemp(),
+    })
+    return server
+
+
+def _agent_calls(finnhub, fred, marketaux, reddit) -> dict[str, list]:
+    """各エージェントの指示に沿ったツール呼び出し列を返す。"""
+    return {
+        "news_social_media_agent": [
+            (finnhub.get_market_news, ()),
+            (finnhub.get_company_news, (SYMBOL,)),
+            (marketaux.get_financial_news_with_sentiment, (SYMBOL,)),
+        ],
+        "financial_analysis_agent": [
+            (finnhub.get_stock_quote, (SYMBOL,)),
+            (finnhub.get_company_profile, (SYMBOL,)),
+            (finnhub.get_basic_financials, (SYMBOL,)),
+            (fred.get_economic_indicators, ()),
+        ],
+        "sentiment_agent": [
+            (reddit.get_reddit_sentiment_summary, (SYMBOL,)),
+            (reddit.get_reddit_sentiment_summary, ()),
+            (finnhub.get_social_sentiment, (SYMBOL,)),
+        ],
+    }
+
+
+async def _run_agent(calls: list, timings: dict, name: str) -> None:
+    """1 エージェント分のツール呼び出しを順に実行する。"""
+    start = time.perf_counter()
+    for func, args in calls:
+        result = func(*args)
+        if inspect.isawaitable(result):
+            await result
+    timings[name] = time.perf_counter() - start
+
+
+async def _run_phase1(agent_calls: dict[str, list]) -> tuple[float, dict]:
+    """3エージェントを ParallelAgent と同様に同一ループ上で並行実行する。"""
+    timings: dict[str, float] = {}
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(_run_agent(calls, timings, name) for name, calls in agent_calls.items())
+    )
+    return time.perf_counter() - start, timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Phase 1 ツール層のウォールタイム計測")
+    parser.add_argument("--delay", type=float, default=0.2, help="スタブ API の応答遅延 (秒)")
+    args = parser.parse_args()
+
+    # sync モードで PRAW が出す「非同期環境での利用」警告を抑制する
+    logging.getLogger("praw").setLevel(logging.ERROR)
+    server = _start_stub_server(args.delay)
+
+    # ベース URL の環境変数を設定した後で読み込む
+    from ..tools import finnhub_tools, fred_tools, marketaux_tools, reddit_tools
+    from ..tools import fred_store
+    from ..tools.cache import clear_cache
+    from ..tools.singleflight import get_coalescing_stats, reset_coalescing_stats
+    from ..tools.aio import finnhub_tools as aio_finnhub
+    from ..tools.aio import fred_tools as aio_fred
+    from ..tools.aio import marketaux_tools as aio_marketaux
+    from ..tools.aio import reddit_tools as aio_reddit
+
+    modes = {
+        "sync": _agent_calls(finnhub_tools, fred_tools, marketaux_tools, reddit_tools),
+        "async": _agent_calls(aio_finnhub, aio_fred, aio_marketaux, aio_reddit),
+    }
+
+    print(f"スタブ遅延: {args.delay:.3f}s / リクエスト")
+    results = {}
+    for mode, agent_calls in modes.items():
+        # 前のモードのキャッシュ・FRED ストアを使わない
+        clear_cache()
+        fred_store.clear()
+        reset_coalescing_stats()
+        wall, timings = asyncio.run(_run_phase1(agent_calls))
+        results[mode] = wall
+        print(f"\n[{mode}] Phase 1 wall time: {wall:.3f}s")
+        for name, elapsed in timings.items():
+            print(f"  {name:<28} {elapsed:.3f}s")
+        print(f"  {'(エージェント合計)':<24} {sum(timings.values()):.3f}s")
+        flight = get_coalescing_stats()
+        print(f"  API 呼び出し: {flight['upstream']} / 合流: {flight['coalesced']}")
+
+    print(f"\nspeedup: {results['sync'] / results['async']:.2f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,24 +11,172 @@ PROJECT_ID = os.environ.get("PROJECT_ID")
 REGION = os.environ.get("REGION", "us-central1")
 STAGING_BUCKET = os.environ.get("STAGING_BUCKET")
 
+# HTTP トランスポート (tools/http_client.py)
+HTTP_POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "20"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "10"))
+
+# ローカルデータ (レート制限状態, キャッシュ等) の保存先
+DATA_DIR = os.environ.get(
+    "MARKET_INTEL_DATA_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "market_intelligence"),
+)
+
+# レート制限 (tools/rate_limiter.py)
+# capacity 回 / period 秒。daily=True は UTC 0 時にリセットされる日次枠
+RATE_LIMITS = {
+    "finnhub": {"capacity": 60, "period": 60.0},
+    "fred": {"capacity": 120, "period": 60.0},
+    "reddit": {"capacity": 100, "period": 60.0},
+    "marketaux": {"capacity": 100, "period": 86400.0, "daily": True},
+}
+RATE_LIMIT_DB = os.environ.get("RATE_LIMIT_DB", os.path.join(DATA_DIR, "rate_limits.sqlite3"))
+RATE_LIMIT_MAX_WAIT = float(os.environ.get("RATE_LIMIT_MAX_WAIT", "60"))
+
+# レスポンスキャッシュ (tools/cache.py)
+# エンドポイントごとの TTL (秒)
+CACHE_TTLS = {
+    "quote": 15,
+    "profile": 7 * 86400,
+    "metric": 6 * 3600,
+    "market_news": 300,
+    "company_news": 300,
+    "social_sentiment": 1800,
+    "marketaux_news": 900,
+}
+# FRED はシリーズの更新頻度に応じた TTL (秒)
+FRED_TTL_BY_FREQUENCY = {
+    "daily": 3600,
+    "weekly": 6 * 3600,
+    "monthly": 12 * 3600,
+    "quarterly": 24 * 3600,
+}
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "2048"))
+CACHE_DISK_ENABLED = os.environ.get("CACHE_DISK_ENABLED", "0") == "1"
+CACHE_DB = os.environ.get("CACHE_DB", os.path.join(DATA_DIR, "response_cache.sqlite3"))
+
+# FRED 観測値のローカルストア (tools/fred_store.py)
+FRED_STORE_DB = os.environ.get("FRED_STORE_DB", os.path.join(DATA_DIR, "fred_observations.sqlite3"))
+# 初回取得時に遡って保存する観測値の件数
+FRED_STORE_BACKFILL = int(os.environ.get("FRED_STORE_BACKFILL", "120"))
+
+# ニュースの近似重複判定 (tools/news_dedup.py)
+# 見出し + 要約の SimHash (64 bit) のハミング距離がこの値以下なら同一記事とみなす
+NEWS_DEDUP_MAX_DISTANCE = int(os.environ.get("NEWS_DEDUP_MAX_DISTANCE", "10"))
+# ニュース API の記事配列を先頭 (新しい順) から読む件数の上限 (tools/json_stream.py)
+# 重複排除・関連度ランキングの候補になる。達した時点でパースを打ち切る
+NEWS_MAX_CANDIDATES = int(os.environ.get("NEWS_MAX_CANDIDATES", "100"))
+
+# ソーシャルセンチメントの異常検知 (tools/social_signals.py)
+# z スコアの基準にする直前のバケット数と、異常とみなす z スコアの絶対値
+SOCIAL_ZSCORE_WINDOW = int(os.environ.get("SOCIAL_ZSCORE_WINDOW", "24"))
+SOCIAL_ANOMALY_ZSCORE = float(os.environ.get("SOCIAL_ANOMALY_ZSCORE", "3.0"))
+
+# ウォッチリストの一括分析 (batch.py)
+# 同時に実行するパイプライン (銘柄) 数の上限と、結果 (JSON Lines) の保存先
+BATCH_MAX_CONCURRENCY = int(os.environ.get("BATCH_MAX_CONCURRENCY", "4"))
+BATCH_OUTPUT_DIR = os.environ.get("BATCH_OUTPUT_DIR", os.path.join(DATA_DIR, "batch"))
+
+# フェーズ間のステート射影 (agents/projection_agent.py)
+# 後続のエージェントごとに {ステートのキー: 渡すフィールドのパス}。None は値全体を渡す
+# パスはドット区切りで、途中がリストなら要素ごとに射影する (例: "key_events.event")
+STATE_PROJECTIONS = {
+    "trend": {
+        "news_data": [
+            "summary", "key_events", "market_mood",
+            "news_items.headline", "news_items.impact",
+            "news_items.sentiment", "news_items.sentiment_score",
+        ],
+        "financial_data": [
+            "company_overview", "stock_analysis", "valuation", "profitability",
+            "economic_context", "fundamental_assessment", "assessment_rationale",
+        ],
+        "sentiment_data": [
+            "overall_sentiment", "sentiment_score", "confidence",
+            "reddit_analysis.bullish_posts", "reddit_analysis.bearish_posts",
+            "reddit_analysis.neutral_posts", "reddit_analysis.top_subreddits",
+            "social_media_metrics", "trending_topics",
+            "notable_posts.title", "notable_posts.sentiment", "notable_posts.key_insight",
+            "anomalies",
+        ],
+    },
+    "strategy": {
+        "trend_analysis": None,
+        "news_data": ["summary", "key_events.event", "key_events.impact", "market_mood"],
+        "financial_data": [
+            "company_overview.name", "company_overview.symbol",
+            "stock_analysis.current_price", "stock_analysis.change_percent",
+            "stock_analysis.week_52_high", "stock_analysis.week_52_low",
+            "valuation.assessment", "profitability.assessment",
+            "fundamental_assessment", "assessment_rationale",
+        ],
+        "sentiment_data": [
+            "overall_sentiment", "sentiment_score", "confidence", "trending_topics", "anomalies",
+        ],
+    },
+}
+# 0 にすると射影せず、値全体をそのまま渡す (射影前後のトークン数は記録する)
+STATE_PROJECTION_ENABLED = os.environ.get("STATE_PROJECTION_ENABLED", "1") == "1"
+
 # LLM
 MODEL_ID = "gemini-2.0-flash"
 
+# LLM 応答キャッシュ (agents/llm_cache.py)
+# モデル ID・指示 (埋め込んだステートを含む)・会話 (ツール結果を含む)・設定のハッシュをキーにする
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_TTL = float(os.environ.get("LLM_CACHE_TTL", str(6 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "256"))
+LLM_CACHE_DISK_ENABLED = os.environ.get("LLM_CACHE_DISK_ENABLED", "1") == "1"
+LLM_CACHE_DISK_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_DISK_MAX_ENTRIES", "5000"))
+LLM_CACHE_DB = os.environ.get("LLM_CACHE_DB", os.path.join(DATA_DIR, "llm_cache.sqlite3"))
+# キャッシュを使わないエージェント名 (カンマ区切り。例: "strategy_agent")
+LLM_CACHE_DISABLED_AGENTS = os.environ.get("LLM_CACHE_DISABLED_AGENTS", "")
+
 # Finnhub
 FINNHUB_API_KEY = os.environ.get("FINNHUB_API_KEY", "")
-FINNHUB_BASE_URL = "https://finnhub.io/api/v1"
+FINNHUB_BASE_URL = os.environ.get("FINNHUB_BASE_URL", "https://finnhub.io/api/v1")
+# バッチ版ツール (get_stock_quotes 等) で同時に取得する銘柄数の上限
+FINNHUB_MAX_CONCURRENCY = int(os.environ.get("FINNHUB_MAX_CONCURRENCY", "8"))
+# トレード WebSocket (tools/quote_stream.py)。購読銘柄が空ならストリーミングは無効
+FINNHUB_WS_URL = os.environ.get("FINNHUB_WS_URL", "wss://ws.finnhub.io")
+FINNHUB_STREAM_SYMBOLS = os.environ.get("FINNHUB_STREAM_SYMBOLS", "")
 
 # Marketaux
 MARKETAUX_API_KEY = os.environ.get("MARKETAUX_API_KEY", "")
-MARKETAUX_BASE_URL = "https://api.marketaux.com/v1"
+MARKETAUX_BASE_URL = os.environ.get("MARKETAUX_BASE_URL", "https://api.marketaux.com/v1")
+# 1 リクエストで取得できる記事数の上限 (プランにより異なる)
+MARKETAUX_MAX_ARTICLES = int(os.environ.get("MARKETAUX_MAX_ARTICLES", "50"))
+# 日次枠の配分 (tools/marketaux_quota.py)
+# ウォッチリスト: 優先度の高い順のカンマ区切り。"AAPL:3" のように重み (既定 1) を指定できる
+MARKETAUX_WATCHLIST = os.environ.get("MARKETAUX_WATCHLIST", "")
+# バッチ取得に使わず、単体の get_financial_news_with_sentiment 用に残すリクエスト数
+MARKETAUX_RESERVE = int(os.environ.get("MARKETAUX_RESERVE", "10"))
 
 # FRED
 FRED_API_KEY = os.environ.get("FRED_API_KEY", "")
+FRED_BASE_URL = os.environ.get("FRED_BASE_URL", "https://api.stlouisfed.org/fred")
+# get_economic_indicators で同時に取得するシリーズ数の上限
+FRED_MAX_CONCURRENCY = int(os.environ.get("FRED_MAX_CONCURRENCY", "4"))
 
 # Reddit
 REDDIT_CLIENT_ID = os.environ.get("REDDIT_CLIENT_ID", "")
 REDDIT_CLIENT_SECRET = os.environ.get("REDDIT_CLIENT_SECRET", "")
 REDDIT_USER_AGENT = "market-intelligence-agent/1.0"
+REDDIT_URL = os.environ.get("REDDIT_URL", "https://www.reddit.com")
+REDDIT_OAUTH_URL = os.environ.get("REDDIT_OAUTH_URL", "https://oauth.reddit.com")
+
+# Reddit 投稿のローカルインデックス (tools/reddit_index.py, tools/reddit_ingest.py)
+REDDIT_INDEX_DB = os.environ.get("REDDIT_INDEX_DB", os.path.join(DATA_DIR, "reddit_index.sqlite3"))
+# 常駐取り込みの対象サブレディットとポーリング間隔 (秒)
+REDDIT_INGEST_SUBREDDITS = os.environ.get("REDDIT_INGEST_SUBREDDITS", "wallstreetbets,stocks,investing")
+REDDIT_INGEST_INTERVAL = float(os.environ.get("REDDIT_INGEST_INTERVAL", "120"))
+# 最終取り込みからこの秒数以内ならツールはインデックスから応答する
+REDDIT_INDEX_MAX_AGE = float(os.environ.get("REDDIT_INDEX_MAX_AGE", "600"))
+# インデックスの HOT 投稿として扱う投稿の経過時間上限 (秒)
+REDDIT_INDEX_HOT_WINDOW = float(os.environ.get("REDDIT_INDEX_HOT_WINDOW", str(2 * 86400)))
+# この秒数より古い投稿は取り込み時に削除する
+REDDIT_INDEX_RETENTION = float(os.environ.get("REDDIT_INDEX_RETENTION", str(30 * 86400)))
 
 # Financial Datasets (MCP)
 FINANCIAL_DATASETS_API_KEY = os.environ.get("FINANCIAL_DATASETS_API_KEY", "")
@@ -16,6 +16,9 @@
     # 実行
     python -m 05_multi_agent.main
 
+非同期サービスへの組み込み:
+    state = await run_pipeline_async(query, runner=create_runner())
+
 ADK Web UI:
     adk web 05_multi_agent
 """
@@ -23,11 +26,17 @@ ADK Web UI:
 import asyncio
 import os
 import sys
+from typing import Callable
 
+from google.adk.events import Event
 from google.adk.runners import InMemoryRunner
 from google.genai import types
 
+from .agents.llm_cache import get_llm_cache_stats, reset_llm_cache_stats
+from .agents.output_repair import get_repair_stats, reset_repair_stats
 from .pipeline import root_agent
+from .tools.quote_stream import start_quote_stream
+from .tools.singleflight import get_coalescing_stats, reset_coalescing_stats
 
 PROJECT_ID = os.environ.get("PROJECT_ID")
 REGION = os.environ.get("REGION", "us-central1")
@@ -77,71 +86,141 @@ def check_api_keys():
         print()
 
 
-def run_pipeline(query: str):
-    """パイプラインを実行し、マーケットインテリジェンスを生成する。"""
-    runner = InMemoryRunner(
-        agent=root_agent,
-        app_name="market_intelligence",
-    )
-    user_id = "demo_user"
-    session_id = "demo_session"
+APP_NAME = "market_intelligence"
 
-    # create_session is async in ADK 1.x
-    asyncio.run(
-        runner.session_service.create_session(
-            app_name="market_intelligence",
-            user_id=user_id,
-            session_id=session_id,
-        )
-    )
+# セッションステートに保存される各フェーズの出力
+STATE_KEYS = ["news_data", "financial_data", "sentiment_data", "trend_analysis", "strategy_report"]
 
-    print(f"\n{'='*60}")
-    print("マーケットインテリジェンス パイプライン実行中...")
-    print(f"{'='*60}")
-    print(f"\nクエリ: {query}\n")
 
+def create_runner() -> InMemoryRunner:
+    """パイプラインの Runner を作成する (複数のパイプライン実行で共有できる)。"""
+    return InMemoryRunner(agent=root_agent, app_name=APP_NAME)
+
+
+async def run_pipeline_async(
+    query: str,
+    runner: InMemoryRunner | None = None,
+    user_id: str = "demo_user",
+    session_id: str | None = None,
+    on_event: Callable[[Event], None] | None = None,
+    keep_session: bool = True,
+) -> dict:
+    """パイプラインを実行し、セッションステートを返す (非同期版のエントリーポイント)。
+
+    セッションの作成・イベントの受信・ステートの読み出しを呼び出し元の
+    イベントループ上で行う。同じ runner で複数のパイプラインを並行実行できる。
+
+    Args:
+        query: ユーザーのクエリ
+        runner: 使用する Runner (省略時は新規作成)
+        user_id: セッションのユーザー ID
+        session_id: セッション ID (省略時は自動生成)
+        on_event: イベントごとに呼び出す関数 (進捗表示等)
+        keep_session: False なら実行後にセッションを削除する
+
+    Returns:
+        セッションステート
+    """
+    runner = runner or create_runner()
+    session = await runner.session_service.create_session(
+        app_name=APP_NAME, user_id=user_id, session_id=session_id
+    )
     content = types.Content(
         role="user",
         parts=[types.Part.from_text(text=query)],
     )
+    try:
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session.id,
+            new_message=content,
+        ):
+            if on_event is not None:
+                on_event(event)
+
+        session = await runner.session_service.get_session(
+            app_name=APP_NAME, user_id=user_id, session_id=session.id
+        )
+        return dict(session.state) if session else {}
+    finally:
+        if not keep_session:
+            await runner.session_service.delete_session(
+                app_name=APP_NAME, user_id=user_id, session_id=session.id
+            )
+
 
-    current_agent = None
-    response_text = ""
+class _EventPrinter:
+    """イベントを逐次表示する (エージェントの切り替わり・テキスト・ツール呼び出し)。"""
 
-    for event in runner.run(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=content,
-    ):
+    def __init__(self):
+        self.current_agent = None
+
+    def __call__(self, event: Event) -> None:
         # エージェントの切り替わりを表示
-        if hasattr(event, "agent_name") and event.agent_name != current_agent:
-            current_agent = event.agent_name
-            print(f"\n--- [{current_agent}] ---")
+        if event.author != self.current_agent:
+            self.current_agent = event.author
+            print(f"\n--- [{self.current_agent}] ---")
 
         if event.content and event.content.parts:
             for part in event.content.parts:
                 if part.text:
-                    response_text += part.text
                     print(part.text, end="", flush=True)
-                elif hasattr(part, "function_call") and part.function_call:
+                elif part.function_call:
                     fc = part.function_call
-                    print(f"  [ツール呼出] {fc.name}({dict(fc.args)})")
+                    print(f"  [ツール呼出] {fc.name}({dict(fc.args or {})})")
+
+
+def run_pipeline(query: str):
+    """パイプラインを実行し、マーケットインテリジェンスを生成する。
+
+    run_pipeline_async を 1 つのイベントループで実行する同期ラッパー。
+    """
+    print(f"\n{'='*60}")
+    print("マーケットインテリジェンス パイプライン実行中...")
+    print(f"{'='*60}")
+    print(f"\nクエリ: {query}\n")
+
+    reset_coalescing_stats()
+    reset_repair_stats()
+    reset_llm_cache_stats()
+    state = asyncio.run(
+        run_pipeline_async(query, session_id="demo_session", on_event=_EventPrinter())
+    )
 
     print(f"\n\n{'='*60}")
     print("パイプライン完了")
     print(f"{'='*60}")
 
-    # セッションステートから各フェーズの出力を表示
-    session = asyncio.run(
-        runner.session_service.get_session(
-            app_name="market_intelligence",
-            user_id=user_id,
-            session_id=session_id,
+    # 同一ツール呼び出しの合流 (API 呼び出しを節約できた回数)
+    flight = get_coalescing_stats()
+    print(f"\nツール API 呼び出し: {flight['upstream']} 回 (同時呼び出しの合流: {flight['coalesced']} 回)")
+    for endpoint, s in flight["endpoints"].items():
+        if s["coalesced"]:
+            print(f"  {endpoint}: {s['coalesced']} 回合流")
+
+    # フェーズ間の射影で後続のエージェントに渡したトークン数
+    projection = state.get("projection_stats", {})
+    if projection:
+        print("\nフェーズ間の射影 (指示に埋め込むトークン数):")
+        for target, s in projection.items():
+            print(f"  {target}: {s['tokens_before']} → {s['tokens_after']}")
+
+    # LLM 応答キャッシュ (モデル呼び出しを省略できた回数と時間)
+    llm = get_llm_cache_stats()
+    if llm["hits"] or llm["misses"]:
+        print(
+            f"\nLLM 応答キャッシュ: ヒット率 {llm['hit_rate']:.0%} "
+            f"({llm['hits']}/{llm['hits'] + llm['misses']} 回, 省略できた時間 {llm['saved_seconds']}s)"
         )
-    )
-    state = session.state if session else {}
+
+    # 構造化出力のローカル修復 (再度 LLM を呼び出さずに済んだ回数)
+    repair = get_repair_stats()
+    if repair["repaired"] or repair["failed"]:
+        print(f"\n構造化出力の修復: {repair['repaired']} 件 (修復できず: {repair['failed']} 件)")
+
+    # セッションステートから各フェーズの出力を表示
     print("\n--- Session State Keys ---")
-    for key in ["news_data", "financial_data", "sentiment_data", "trend_analysis", "strategy_report"]:
+    for key in STATE_KEYS:
         if key in state:
             preview = str(state[key])[:200]
             print(f"  {key}: {preview}...")
@@ -162,6 +241,9 @@ def main():
 
     check_api_keys()
 
+    # FINNHUB_STREAM_SYMBOLS が設定されていればトレード WebSocket の購読を開始する
+    start_quote_stream()
+
     # デモクエリ
     queries = [
         "Apple (AAPL) の投資判断を分析してください。"
@@ -1,38 +1,58 @@
 """マーケットインテリジェンス パイプライン。
 
 Sequential + Parallel パターンで複数エージェントを連携させる:
-  Phase 1 (並列): News, Financial, Sentiment の3エージェントが同時にデータ収集
+  Phase 1 (取得): Prefetch エージェント (LLM なし) がツールを並行に呼び出してデータを取得
+  Phase 1 (並列): News, Financial, Sentiment の3エージェントが取得済みデータを分析
   Phase 2 (逐次): Trend Analysis エージェントが統合分析
   Phase 3 (逐次): Strategy エージェントが投資推奨を生成
+Phase 2 / Phase 3 の前には Projection エージェント (LLM なし) が、
+後続のエージェントが使うフィールドだけを前のフェーズの出力から取り出す。
 """
 
 from google.adk.agents import ParallelAgent, SequentialAgent
 
 from .agents.financial_agent import financial_agent
+from .agents.llm_cache import enable_llm_cache
 from .agents.news_agent import news_agent
+from .agents.prefetch_agent import prefetch_agent
+from .agents.projection_agent import strategy_projection_agent, trend_projection_agent
 from .agents.sentiment_agent import sentiment_agent
 from .agents.strategy_agent import strategy_agent
 from .agents.trend_agent import trend_analysis_agent
 
 # Phase 1: 並列データ収集
-# 3つのエージェントが同時に外部APIからデータを収集する
+# prefetch_agent が取得したデータを、3つのエージェントが同時に分析する
+# (取得済みのデータがない・不足している場合のみ各エージェントがツールを呼び出す)
 data_collection = ParallelAgent(
     name="data_collection",
     description="市場データを並列に収集する (ニュース, 財務, センチメント)",
     sub_agents=[news_agent, financial_agent, sentiment_agent],
 )
 
-# パイプライン全体: Phase 1 → Phase 2 → Phase 3
+# パイプライン全体: Phase 1 (取得 → 並列分析) → Phase 2 → Phase 3
 # session.state の output_key を介してエージェント間でデータを共有する
 #
 # データフロー:
+#   Prefetch → news_raw, financial_raw, sentiment_raw (ティッカーがなければ空)
 #   Phase 1 → news_data, financial_data, sentiment_data
-#   Phase 2 → trend_analysis (Phase 1 のデータを参照)
-#   Phase 3 → strategy_report (Phase 1 + Phase 2 のデータを参照)
+#   Projection → trend_inputs (Phase 1 のデータから Phase 2 が使うフィールド)
+#   Phase 2 → trend_analysis (trend_inputs を参照)
+#   Projection → strategy_inputs (Phase 1 + Phase 2 のデータから Phase 3 が使うフィールド)
+#   Phase 3 → strategy_report (strategy_inputs を参照)
 root_agent = SequentialAgent(
     name="market_intelligence_pipeline",
     description="マーケットインテリジェンスの分析パイプライン。"
     "ニュース・財務データ・センチメントを並列収集し、"
     "トレンド分析を経て投資戦略を生成する。",
-    sub_agents=[data_collection, trend_analysis_agent, strategy_agent],
+    sub_agents=[
+        prefetch_agent,
+        data_collection,
+        trend_projection_agent,
+        trend_analysis_agent,
+        strategy_projection_agent,
+        strategy_agent,
+    ],
 )
+
+# 各 LlmAgent のモデル呼び出しの前に応答キャッシュを置く (指示は変更しない)
+enable_llm_cache(root_agent)
@@ -0,0 +1,12 @@
+"""テストの共通設定。
+
+パッケージ名 (05_multi_agent) が数字で始まり通常の import 文では読み込めないため、
+リポジトリのルートを sys.path に追加し、テストは importlib で読み込む。
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
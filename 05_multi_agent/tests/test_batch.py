@@ -0,0 +1,26 @@
+"""batch.py のテスト (同時実行数の検証)。"""
+
+import argparse
+import asyncio
+import importlib
+
+import pytest
+
+batch = importlib.import_module("05_multi_agent.batch")
+
+
+@pytest.mark.parametrize("value", ["0", "-2", "two"])
+def test_concurrency_option_rejects_values_below_one(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        batch.positive_int(value)
+
+
+def test_concurrency_option_accepts_positive_values():
+    assert batch.positive_int("8") == 8
+
+
+@pytest.mark.parametrize("concurrency", [0, -1])
+def test_run_batch_rejects_concurrency_below_one(concurrency, tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "create_runner", lambda: pytest.fail("runner should not be created"))
+    with pytest.raises(ValueError):
+        asyncio.run(batch.run_batch(["AAPL"], str(tmp_path / "out.jsonl"), concurrency))
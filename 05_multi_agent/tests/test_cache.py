@@ -0,0 +1,66 @@
+"""tools/cache.py のテスト。"""
+
+import asyncio
+import importlib
+import threading
+
+import pytest
+
+cache = importlib.import_module("05_multi_agent.tools.cache")
+
+
+@pytest.fixture
+def threads(monkeypatch):
+    """キャッシュを差し替え、get / set を実行したスレッドを記録する関数を返す。"""
+
+    def use(disk_path):
+        store = cache.ResponseCache(8, disk_path)
+        seen = []
+        for name in ("get", "set"):
+            method = getattr(store, name)
+
+            def record(*args, _method=method, _name=name):
+                seen.append((_name, threading.get_ident()))
+                return _method(*args)
+
+            monkeypatch.setattr(store, name, record)
+        monkeypatch.setattr(cache, "_cache", store)
+        return seen
+
+    return use
+
+
+def _fetch():
+    calls = []
+
+    @cache.cached("test_endpoint", ttl=60)
+    async def fetch(symbol: str) -> dict:
+        calls.append(symbol)
+        return {"symbol": symbol}
+
+    return fetch, calls
+
+
+async def _twice(fetch) -> int:
+    assert await fetch("AAPL") == {"symbol": "AAPL"}
+    assert await fetch("AAPL") == {"symbol": "AAPL"}
+    return threading.get_ident()
+
+
+def test_async_calls_use_disk_tier_off_the_event_loop(threads, tmp_path):
+    seen = threads(str(tmp_path / "cache.sqlite3"))
+    fetch, calls = _fetch()
+
+    loop_thread = asyncio.run(_twice(fetch))
+    assert calls == ["AAPL"]
+    assert [name for name, _ in seen] == ["get", "set", "get"]
+    assert all(thread != loop_thread for _, thread in seen)
+
+
+def test_async_calls_use_memory_only_cache_on_the_event_loop(threads):
+    seen = threads(None)
+    fetch, calls = _fetch()
+
+    loop_thread = asyncio.run(_twice(fetch))
+    assert calls == ["AAPL"]
+    assert all(thread == loop_thread for _, thread in seen)
@@ -0,0 +1,40 @@
+"""tools/json_stream.py のテスト。"""
+
+import asyncio
+import importlib
+
+import pytest
+
+json_stream = importlib.import_module("05_multi_agent.tools.json_stream")
+
+
+def _chunks(data: bytes, size: int = 3) -> list[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+async def _achunks(chunks: list[bytes]):
+    for chunk in chunks:
+        yield chunk
+
+
+def test_parses_elements_across_chunks():
+    data = b'[{"headline": "a, ]", "id": 1}, {"headline": "b", "id": [2, 3]}, 4 ]'
+    assert json_stream.parse_list(_chunks(data)) == [
+        {"headline": "a, ]", "id": 1}, {"headline": "b", "id": [2, 3]}, 4,
+    ]
+
+
+def test_stops_at_max_items_before_the_array_closes():
+    assert json_stream.parse_list(_chunks(b"[1, 2, 3"), max_items=2) == [1, 2]
+
+
+@pytest.mark.parametrize("data", [b"[1, 2 ,3", b'[{"a": 1}, {"a":', b"[", b""])
+def test_truncated_array_raises(data):
+    with pytest.raises(ValueError):
+        json_stream.parse_list(_chunks(data))
+    with pytest.raises(ValueError):
+        asyncio.run(json_stream.aparse_list(_achunks(_chunks(data))))
+
+
+def test_non_array_response_is_decoded_whole():
+    assert json_stream.parse_list(_chunks(b'{"error": "limit"}')) == {"error": "limit"}
@@ -0,0 +1,67 @@
+"""agents/llm_cache.py のテスト。"""
+
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+import pytest
+from google.adk.agents import LlmAgent, SequentialAgent
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+llm_cache = importlib.import_module("05_multi_agent.agents.llm_cache")
+cache = importlib.import_module("05_multi_agent.tools.cache")
+
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    """ディスク層を一時ディレクトリに置いたキャッシュに差し替える。"""
+    path = str(tmp_path / "llm_cache.sqlite3")
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_DISK_ENABLED", True)
+    monkeypatch.setattr(llm_cache, "_cache", cache.ResponseCache(8, path))
+    monkeypatch.setattr(llm_cache, "_pending", {})
+    return path
+
+
+def _context(invocation_id: str = "inv-1") -> SimpleNamespace:
+    return SimpleNamespace(agent_name="news_agent", invocation_id=invocation_id)
+
+
+def _request(text: str = "AAPL") -> LlmRequest:
+    return LlmRequest(model="gemini-2.0-flash", contents=[types.Content(role="user", parts=[types.Part(text=text)])])
+
+
+def _response(text: str) -> LlmResponse:
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def test_stored_response_is_served_from_disk_tier(disk_cache, monkeypatch):
+    assert asyncio.run(llm_cache.lookup(_context(), _request())) is None
+    asyncio.run(llm_cache.store(_context(), _response('{"summary": "ok"}')))
+    assert llm_cache._pending == {}
+
+    # 別プロセス相当 (メモリ層が空) でもディスク層から応答する
+    monkeypatch.setattr(llm_cache, "_cache", cache.ResponseCache(8, disk_cache))
+    hit = asyncio.run(llm_cache.lookup(_context("inv-2"), _request()))
+    assert hit.content.parts[0].text == '{"summary": "ok"}'
+    assert asyncio.run(llm_cache.lookup(_context("inv-2"), _request("MSFT"))) is None
+
+
+def test_model_error_discards_pending_call(disk_cache):
+    asyncio.run(llm_cache.lookup(_context(), _request()))
+    assert list(llm_cache._pending) == [("inv-1", "news_agent")]
+
+    llm_cache.discard(_context(), _request(), RuntimeError("quota exceeded"))
+    assert llm_cache._pending == {}
+    # 後続の応答は (呼び出し中の記録がないので) 保存しない
+    asyncio.run(llm_cache.store(_context(), _response("late")))
+    assert asyncio.run(llm_cache.lookup(_context(), _request())) is None
+
+
+def test_enable_llm_cache_registers_error_callback(monkeypatch):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", True)
+    agent = LlmAgent(name="news_agent", model="gemini-2.0-flash")
+    llm_cache.enable_llm_cache(SequentialAgent(name="root", sub_agents=[agent]))
+    assert agent.before_model_callback == [llm_cache.lookup]
+    assert agent.after_model_callback == [llm_cache.store]
+    assert agent.on_model_error_callback == [llm_cache.discard]
@@ -0,0 +1,104 @@
+"""tools/marketaux_tools.py のテスト (一括取得の銘柄ごとの切り分けとキャッシュ)。"""
+
+import importlib
+from types import SimpleNamespace
+
+import pytest
+
+cache = importlib.import_module("05_multi_agent.tools.cache")
+marketaux_quota = importlib.import_module("05_multi_agent.tools.marketaux_quota")
+marketaux_tools = importlib.import_module("05_multi_agent.tools.marketaux_tools")
+
+
+def _article(i: int, *symbols: str) -> dict:
+    return {
+        "title": f"Headline {i} " + " ".join(f"word{i}x{j}" for j in range(8)),
+        "description": f"Story number {i}",
+        "source": "example.com",
+        "url": f"https://example.com/{i}",
+        "published_at": "2026-10-15T12:00:00Z",
+        "entities": [{"symbol": s, "name": s, "sentiment_score": 0.5} for s in symbols],
+    }
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Marketaux の /news/all を差し替え、返すページと登録した TTL を記録する。"""
+    state = SimpleNamespace(page={"data": []}, requests=[], ttls={})
+    monkeypatch.setattr(cache, "_cache", cache.ResponseCache(64))
+    monkeypatch.setattr(marketaux_tools, "MARKETAUX_API_KEY", "test")
+    monkeypatch.setattr(marketaux_tools, "acquire", lambda provider: 0.0)
+    monkeypatch.setattr(marketaux_tools, "tokens_remaining", lambda provider: 100.0)
+    # 日次枠が小さく、優先度に応じた TTL が最短の TTL より長くなる状態にする
+    monkeypatch.setattr(marketaux_quota, "daily_budget", lambda: 1)
+
+    def http_get(url, params):
+        state.requests.append(params["symbols"])
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: state.page)
+
+    prime = marketaux_tools._fetch_news.prime
+
+    def record_prime(value, symbol, limit, ttl=None):
+        state.ttls[symbol] = ttl
+        prime(value, symbol, limit, ttl=ttl)
+
+    monkeypatch.setattr(marketaux_tools, "http_get", http_get)
+    monkeypatch.setattr(marketaux_tools._fetch_news, "prime", record_prime)
+    return state
+
+
+def test_batch_slices_articles_by_entity(api):
+    api.page = {
+        "data": [_article(1, "AAPL", "MSFT"), _article(2, "MSFT")],
+        "meta": {"found": 2, "returned": 2},
+    }
+    batch = marketaux_tools.get_financial_news_batch("aapl,msft", limit=10)
+
+    assert api.requests == ["AAPL,MSFT"]
+    assert batch["fetched"] == ["AAPL", "MSFT"]
+    assert batch["results"]["AAPL"]["count"] == 1
+    assert batch["results"]["MSFT"]["count"] == 2
+    # 各記事のエンティティは切り分けた銘柄のものだけを残す
+    assert [e["symbol"] for e in batch["results"]["AAPL"]["articles"][0]["entities"]] == ["AAPL"]
+
+    # 単体呼び出しは同じキャッシュから返す
+    assert marketaux_tools.get_financial_news_with_sentiment("MSFT", 10)["count"] == 2
+    assert api.requests == ["AAPL,MSFT"]
+
+
+def test_quiet_symbol_crowded_out_of_a_full_page_is_not_cached(api):
+    # 人気銘柄の記事でページが埋まり、閑散銘柄の記事は 1 件も入らなかった
+    api.page = {
+        "data": [_article(i, "AAPL") for i in range(50)],
+        "meta": {"found": 400, "returned": 50},
+    }
+    batch = marketaux_tools.get_financial_news_batch("AAPL,QUIET", limit=10)
+
+    assert batch["results"]["QUIET"]["count"] == 0
+    assert api.ttls["AAPL"] > cache.CACHE_TTLS["marketaux_news"]
+    assert "QUIET" not in api.ttls
+    assert marketaux_tools._fetch_news.peek("QUIET", 10) == (False, None)
+
+    # 次の単体呼び出しでは取得し直す
+    api.page = {"data": [_article(99, "QUIET")], "meta": {"found": 1, "returned": 1}}
+    assert marketaux_tools.get_financial_news_with_sentiment("QUIET", 10)["count"] == 1
+    assert api.requests == ["AAPL,QUIET", "QUIET"]
+
+
+def test_partial_slice_of_a_full_page_uses_the_shortest_ttl(api):
+    api.page = {
+        "data": [_article(i, "AAPL") for i in range(49)] + [_article(49, "QUIET")],
+        "meta": {"found": 400, "returned": 50},
+    }
+    marketaux_tools.get_financial_news_batch("AAPL,QUIET", limit=10)
+
+    assert api.ttls["QUIET"] == cache.CACHE_TTLS["marketaux_news"]
+    assert api.ttls["AAPL"] > cache.CACHE_TTLS["marketaux_news"]
+
+
+def test_empty_slice_of_a_complete_page_is_cached(api):
+    api.page = {"data": [_article(1, "AAPL")], "meta": {"found": 1, "returned": 1}}
+    marketaux_tools.get_financial_news_batch("AAPL,QUIET", limit=10)
+
+    assert api.ttls["QUIET"] > cache.CACHE_TTLS["marketaux_news"]
+    assert marketaux_tools._fetch_news.peek("QUIET", 10) == (True, [])
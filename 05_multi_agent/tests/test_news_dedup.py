@@ -0,0 +1,57 @@
+"""tools/news_dedup.py のテスト (SimHash による近似重複のまとめ)。"""
+
+import importlib
+
+import numpy as np
+
+news_dedup = importlib.import_module("05_multi_agent.tools.news_dedup")
+Article = importlib.import_module("05_multi_agent.tools.records").Article
+
+_APPLE = "Apple shares jump after record iPhone sales beat Wall Street expectations in the fourth quarter"
+_APPLE_REWORDED = "Apple shares jump after record iPhone sales beat Wall Street expectations in fourth quarter"
+_FED = "Federal Reserve holds interest rates steady and signals two cuts later this year"
+
+
+def test_simhash_is_close_for_near_duplicates_and_far_for_unrelated_text():
+    distances = news_dedup.hamming_matrix(news_dedup.simhashes([_APPLE, _APPLE_REWORDED, _FED]))
+    assert distances[0, 0] == 0
+    assert distances[0, 1] <= news_dedup.NEWS_DEDUP_MAX_DISTANCE
+    assert distances[0, 2] > news_dedup.NEWS_DEDUP_MAX_DISTANCE
+    assert (distances == distances.T).all()
+
+
+def test_simhash_ignores_case_and_punctuation():
+    hashes = news_dedup.simhashes([_APPLE, _APPLE.upper() + "!!", ""])
+    assert hashes[0] == hashes[1]
+    assert hashes[2] == np.uint64(0)
+
+
+def test_cluster_joins_transitively_in_input_order():
+    assert news_dedup.cluster([_FED, _APPLE, _APPLE_REWORDED, _APPLE.lower()]) == [[0], [1, 2, 3]]
+    assert news_dedup.cluster([_APPLE, _APPLE_REWORDED], max_distance=0) == [[0], [1]]
+    assert news_dedup.cluster([]) == []
+
+
+def test_dedupe_keeps_first_article_and_lists_sources():
+    articles = [
+        Article(_APPLE, "", "Reuters", "https://a"),
+        Article(_FED, "", "Bloomberg", "https://b"),
+        Article(_APPLE_REWORDED, "", "Yahoo", "https://c"),
+        Article(_APPLE, "", "Reuters", "https://d"),
+    ]
+    deduped = news_dedup.dedupe_articles(articles)
+
+    assert [a.url for a in deduped] == ["https://a", "https://b"]
+    assert deduped[0].sources == ["Reuters", "Yahoo"]
+    # 単一ソースの記事には sources を付けない
+    assert deduped[1].sources is None
+
+
+def test_dedupe_is_idempotent():
+    articles = [
+        Article(_APPLE, "", "Reuters", "https://a"),
+        Article(_APPLE_REWORDED, "", "Yahoo", "https://c"),
+    ]
+    once = news_dedup.dedupe_articles(articles)
+    twice = news_dedup.dedupe_articles(once + [Article(_APPLE, "", "CNBC", "https://e")])
+    assert twice[0].sources == ["Reuters", "Yahoo", "CNBC"]
@@ -0,0 +1,66 @@
+"""tools/news_rank.py のテスト (BM25 による関連度ランキング)。"""
+
+import importlib
+
+import numpy as np
+
+news_rank = importlib.import_module("05_multi_agent.tools.news_rank")
+Article = importlib.import_module("05_multi_agent.tools.records").Article
+
+
+def _rank(articles, **kwargs):
+    return news_rank.rank_articles(
+        articles, lambda a: a.headline, lambda a: a.summary, "AAPL", **kwargs
+    )
+
+
+def test_name_terms_drop_corporate_suffixes():
+    assert news_rank.name_terms("Apple Inc") == ["apple"]
+    assert news_rank.name_terms("The Coca-Cola Company") == ["coca", "cola"]
+    assert news_rank.name_terms(None) == []
+
+
+def test_ticker_matches_only_upper_case_symbol():
+    tf, _ = news_rank.term_frequencies(
+        ["ON Semiconductor beats", "Turn it on", "$ON rallies"], ["", "", ""], "on", []
+    )
+    assert tf[:, 0].tolist() == [2.0, 0.0, 2.0]
+
+
+def test_headline_counts_more_than_body():
+    tf, lengths = news_rank.term_frequencies(["Apple earnings"], ["apple apple"], "AAPL", ["apple"])
+    assert tf.tolist() == [[0.0, 4.0]]
+    assert lengths.tolist() == [6.0]
+
+
+def test_bm25_favors_rare_terms_and_shorter_documents():
+    tf = np.array([[1.0, 0.0], [0.0, 1.0], [0.0, 1.0], [0.0, 1.0]])
+    scores = news_rank.bm25(tf, np.full(4, 10.0))
+    # 1 件にしか出ない語は、多くの記事に出る語より重い
+    assert scores[0] > scores[1] == scores[2] == scores[3] > 0
+
+    scores = news_rank.bm25(np.array([[1.0], [1.0], [0.0]]), np.array([5.0, 50.0, 10.0]))
+    assert scores[0] > scores[1] > scores[2] == 0
+    assert news_rank.bm25(np.zeros((0, 2)), np.zeros(0)).shape == (0,)
+
+
+def test_rank_articles_orders_by_relevance_and_keeps_input_order_for_ties():
+    articles = [
+        Article("Markets drift ahead of Fed", "Stocks are flat", "x", "1"),
+        Article("Apple unveils new iPhone", "AAPL rises as Apple shows off devices", "x", "2"),
+        Article("Oil prices climb", "Crude rises on supply", "x", "3"),
+        Article("Tech stocks mixed", "Apple little changed", "x", "4"),
+    ]
+    ranked = _rank(articles, company_name="Apple Inc", top_k=3)
+
+    assert [a.url for a in ranked] == ["2", "4", "1"]
+    assert ranked[0].relevance > ranked[1].relevance > ranked[2].relevance == 0
+
+
+def test_rank_articles_can_drop_unrelated_articles():
+    articles = [
+        Article("Oil prices climb", "", "x", "1"),
+        Article("AAPL slips", "", "x", "2"),
+    ]
+    assert [a.url for a in _rank(articles, require_match=True)] == ["2"]
+    assert _rank([]) == []
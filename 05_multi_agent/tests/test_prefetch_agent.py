@@ -0,0 +1,74 @@
+"""agents/prefetch_agent.py のテスト (クエリのティッカー抽出と、見つからない場合のステート)。"""
+
+import asyncio
+import importlib
+
+import pytest
+from google.adk.agents import SequentialAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+prefetch_agent = importlib.import_module("05_multi_agent.agents.prefetch_agent")
+
+# Finnhub の /stock/profile2 は存在しない銘柄に空のプロフィールを返す
+_PROFILES = {"NVDA": "NVIDIA Corp", "MSFT": "Microsoft Corp", "TSLA": "Tesla Inc", "F": "Ford Motor Co"}
+
+
+@pytest.fixture(autouse=True)
+def profiles(monkeypatch):
+    requested = []
+
+    async def get_company_profile(symbol):
+        requested.append(symbol)
+        return {"symbol": symbol, "name": _PROFILES.get(symbol)}
+
+    monkeypatch.setattr(prefetch_agent, "get_company_profile", get_company_profile)
+    return requested
+
+
+@pytest.mark.parametrize("query, symbol", [
+    ("Should I buy NVDA?", "NVDA"),
+    ("Is A good? Look at MSFT", "MSFT"),
+    ("OK, analyze TSLA", "TSLA"),
+    ("AI 銘柄として $nvda と (MSFT) はどう?", "NVDA"),
+    ("Ford Motor (F) の見通し", None),
+    ("日本の半導体セクターの見通しは?", None),
+])
+def test_find_symbol(query, symbol):
+    assert asyncio.run(prefetch_agent.find_symbol(query)) == symbol
+
+
+def test_explicit_tickers_come_first():
+    assert prefetch_agent.ticker_candidates("Compare OK and IBM with $nvda and (MSFT)") == [
+        "NVDA", "MSFT", "OK", "IBM",
+    ]
+
+
+def test_candidates_are_confirmed_with_a_profile(profiles):
+    assert asyncio.run(prefetch_agent.find_symbol("OK, analyze TSLA")) == "TSLA"
+    assert profiles == ["OK", "TSLA"]
+
+
+def test_missing_ticker_clears_previous_prefetch(monkeypatch):
+    async def prefetch(symbol):
+        return {key: f'{{"symbol": "{symbol}"}}' for key in prefetch_agent.PREFETCH_TOOLS}
+
+    monkeypatch.setattr(prefetch_agent, "prefetch", prefetch)
+    agent = prefetch_agent.DataPrefetchAgent(name="data_prefetch_agent")
+    runner = InMemoryRunner(agent=SequentialAgent(name="root", sub_agents=[agent]), app_name="test")
+
+    async def run():
+        session = await runner.session_service.create_session(app_name="test", user_id="u")
+        for query in ("Should I buy NVDA?", "セクター全体の見通しは?"):
+            message = types.Content(role="user", parts=[types.Part(text=query)])
+            async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+                pass
+            session = await runner.session_service.get_session(app_name="test", user_id="u", session_id=session.id)
+            yield {key: session.state.get(key) for key in prefetch_agent.PREFETCH_TOOLS}
+
+    async def collect():
+        return [state async for state in run()]
+
+    first, second = asyncio.run(collect())
+    assert first["news_raw"] == '{"symbol": "NVDA"}'
+    assert second == dict.fromkeys(prefetch_agent.PREFETCH_TOOLS)
@@ -0,0 +1,83 @@
+"""agents/projection_agent.py のテスト (フィールドの射影と射影前後のトークン数)。"""
+
+import importlib
+import json
+from types import SimpleNamespace
+
+import pytest
+
+projection_agent = importlib.import_module("05_multi_agent.agents.projection_agent")
+
+_PROJECTIONS = {
+    "trend": {
+        "news_data": ["summary", "news_items.headline"],
+        "trend_analysis": None,
+    },
+}
+
+_NEWS = {
+    "summary": "Apple rallies",
+    "news_items": [
+        {"headline": "iPhone sales beat", "impact": "high", "body": "x" * 400},
+        {"headline": "Services grow", "impact": "medium", "body": "y" * 400},
+    ],
+    "raw_sources": ["a", "b", "c"],
+}
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    """トークナイザーを使わず、文字数からの概算でトークン数を数える。"""
+    monkeypatch.setattr(projection_agent, "_tokenizer", False)
+    monkeypatch.setattr(projection_agent, "STATE_PROJECTIONS", _PROJECTIONS)
+    monkeypatch.setattr(projection_agent, "STATE_PROJECTION_ENABLED", True)
+
+
+def test_count_tokens_estimates_ascii_and_other_characters():
+    assert projection_agent.count_tokens("") == 0
+    assert projection_agent.count_tokens("abcd") == 1
+    assert projection_agent.count_tokens("abcde") == 2
+    assert projection_agent.count_tokens("日本語") == 3
+    assert projection_agent.count_tokens("AAPL の分析") == 1 + 4
+
+
+def test_count_tokens_uses_local_tokenizer_when_available(monkeypatch):
+    tokenizer = SimpleNamespace(count_tokens=lambda text: SimpleNamespace(total_tokens=42))
+    monkeypatch.setattr(projection_agent, "_tokenizer", tokenizer)
+    assert projection_agent.count_tokens("abcd") == 42
+
+
+def test_project_keeps_only_listed_paths():
+    assert projection_agent.project(_NEWS, ["summary", "news_items.headline", "missing"]) == {
+        "summary": "Apple rallies",
+        "news_items": [{"headline": "iPhone sales beat"}, {"headline": "Services grow"}],
+    }
+    assert projection_agent.project(_NEWS, None) is _NEWS
+    assert projection_agent.project("plain text", ["summary"]) == "plain text"
+
+
+def test_build_inputs_records_tokens_before_and_after_projection():
+    state = {
+        "news_data": json.dumps(_NEWS),
+        "trend_analysis": "テキストのみの応答",
+        "sentiment_data": "{}",
+    }
+    inputs, stats = projection_agent.build_inputs(state, "trend")
+
+    assert inputs == {
+        "news_data": projection_agent.project(_NEWS, _PROJECTIONS["trend"]["news_data"]),
+        "trend_analysis": "テキストのみの応答",
+    }
+    assert stats["tokens_before"] == (
+        projection_agent.count_tokens(state["news_data"]) + projection_agent.count_tokens(state["trend_analysis"])
+    )
+    assert stats["tokens_after"] == projection_agent.count_tokens(projection_agent._dumps(inputs))
+    assert stats["tokens_after"] < stats["tokens_before"] / 3
+
+
+def test_build_inputs_passes_full_values_when_projection_is_disabled(monkeypatch):
+    monkeypatch.setattr(projection_agent, "STATE_PROJECTION_ENABLED", False)
+    inputs, stats = projection_agent.build_inputs({"news_data": json.dumps(_NEWS)}, "trend")
+
+    assert inputs == {"news_data": _NEWS}
+    assert stats["tokens_after"] == projection_agent.count_tokens(projection_agent._dumps(inputs))
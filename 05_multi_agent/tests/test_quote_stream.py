@@ -0,0 +1,182 @@
+"""tools/quote_stream.py のテスト。
+
+ローカルに websockets のサーバーを立て、再接続 (指数バックオフ)・購読のやり直し・
+約定のブックへの反映を確認する。
+"""
+
+import asyncio
+import importlib
+import json
+import threading
+import time
+from datetime import datetime
+from http import HTTPStatus
+
+import pytest
+
+ws_server = pytest.importorskip("websockets.asyncio.server")
+
+quote_stream = importlib.import_module("05_multi_agent.tools.quote_stream")
+records = importlib.import_module("05_multi_agent.tools.records")
+
+QuoteBook = quote_stream.QuoteBook
+QuoteStream = quote_stream.QuoteStream
+Quote = records.Quote
+
+
+class _TradeServer:
+    """Finnhub のトレード WebSocket を模したサーバー (専用スレッドのイベントループで動かす)。
+
+    最初の reject 回のハンドシェイクは 503 で拒否し、接続ごとに受信した購読銘柄を記録する。
+    """
+
+    def __init__(self, reject: int = 0):
+        self.reject = reject
+        self.attempts: list[float] = []
+        self.subscriptions: list[list[str]] = []
+        self.connections: list = []
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._stop: asyncio.Future | None = None
+        self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self._serve(),), daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._stop.set_result, None)
+        self._thread.join(5)
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}"
+
+    async def _serve(self):
+        self._stop = self._loop.create_future()
+        async with ws_server.serve(self._handler, "127.0.0.1", 0, process_request=self._process_request) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop
+
+    def _process_request(self, connection, request):
+        self.attempts.append(time.monotonic())
+        if len(self.attempts) <= self.reject:
+            return connection.respond(HTTPStatus.SERVICE_UNAVAILABLE, "unavailable\n")
+        return None
+
+    async def _handler(self, ws):
+        symbols: list[str] = []
+        self.subscriptions.append(symbols)
+        self.connections.append(ws)
+        async for message in ws:
+            payload = json.loads(message)
+            if payload.get("type") == "subscribe":
+                symbols.append(payload["symbol"])
+
+    def send_trade(self, symbol: str, price: float, timestamp_ms: int) -> None:
+        message = json.dumps({"type": "trade", "data": [{"s": symbol, "p": price, "t": timestamp_ms, "v": 1}]})
+        asyncio.run_coroutine_threadsafe(self.connections[-1].send(message), self._loop).result(5)
+
+    def drop_connection(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.connections[-1].close(), self._loop).result(5)
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met before timeout")
+        time.sleep(0.01)
+
+
+def _ts(*args) -> int:
+    """米国東部時間の日時を UNIX 時刻 (秒) にする。"""
+    return int(datetime(*args, tzinfo=quote_stream._NEW_YORK).timestamp())
+
+
+def test_reconnects_with_backoff_and_replays_subscriptions():
+    with _TradeServer(reject=3) as server:
+        stream = QuoteStream(QuoteBook(), server.url, ["aapl"], initial_backoff=0.05, max_backoff=0.2)
+        stream.start()
+        try:
+            _wait_for(lambda: stream.connected and server.subscriptions == [["AAPL"]])
+            # 拒否されるたびに待ち時間が倍になり、上限で止まる (0.05 → 0.1 → 0.2)
+            gaps = [b - a for a, b in zip(server.attempts, server.attempts[1:])]
+            assert len(gaps) == 3
+            assert 0.04 <= gaps[0] < gaps[1] < gaps[2] < 0.5
+
+            # 接続中に追加した銘柄はすぐに購読し、再接続後はすべての銘柄を購読し直す
+            stream.subscribe(["MSFT"])
+            _wait_for(lambda: server.subscriptions[0] == ["AAPL", "MSFT"])
+            server.drop_connection()
+            _wait_for(lambda: len(server.subscriptions) == 2 and server.subscriptions[1] == ["AAPL", "MSFT"])
+            # 接続できたらバックオフは初期値に戻る
+            assert server.attempts[-1] - server.attempts[-2] < 1.0
+        finally:
+            stream.stop()
+
+
+def test_trades_update_quote_book():
+    book = QuoteBook()
+    now = _ts(2026, 10, 15, 11, 0)
+    book.seed(Quote("AAPL", current_price=100.0, high=101.0, low=99.0, open=99.5, previous_close=98.0, timestamp=now))
+    with _TradeServer() as server:
+        stream = QuoteStream(book, server.url, ["AAPL"], initial_backoff=0.05)
+        stream.start()
+        try:
+            _wait_for(lambda: server.subscriptions == [["AAPL"]])
+            server.send_trade("AAPL", 102.5, (now + 1) * 1000)
+            _wait_for(lambda: book.get("AAPL").current_price == 102.5)
+        finally:
+            stream.stop()
+
+    quote = book.get("AAPL")
+    assert (quote.high, quote.low, quote.open) == (102.5, 99.0, 99.5)
+    assert quote.change == 4.5
+    assert quote.percent_change == round(4.5 / 98.0 * 100, 4)
+
+
+def test_rollover_uses_regular_session_close():
+    book = QuoteBook()
+    book.seed(Quote("AAPL", current_price=100.0, previous_close=99.0, timestamp=_ts(2026, 10, 14, 15, 0)))
+    book.update_trade("AAPL", 100.5, _ts(2026, 10, 14, 15, 59, 59) * 1000)
+    book.update_trade("AAPL", 101.0, _ts(2026, 10, 14, 16, 0, 0) * 1000)  # 大引け
+    book.update_trade("AAPL", 105.0, _ts(2026, 10, 14, 18, 30) * 1000)  # 時間外取引
+    book.update_trade("AAPL", 103.0, _ts(2026, 10, 15, 9, 31) * 1000)
+
+    quote = book.get("AAPL")
+    assert quote.previous_close == 101.0
+    assert (quote.open, quote.high, quote.low) == (103.0, 103.0, 103.0)
+    assert quote.change == 2.0
+
+
+def test_rollover_without_regular_session_trades_leaves_previous_close_unknown():
+    book = QuoteBook()
+    book.seed(Quote("AAPL", current_price=100.0, previous_close=99.0, timestamp=_ts(2026, 10, 13, 16, 0)))
+    # 10/14 は時間外取引しか受信していない
+    book.update_trade("AAPL", 104.0, _ts(2026, 10, 14, 17, 0) * 1000)
+    book.update_trade("AAPL", 103.0, _ts(2026, 10, 15, 9, 31) * 1000)
+
+    quote = book.get("AAPL")
+    assert quote.previous_close is None
+    assert quote.change is None
+
+
+def test_pre_market_trades_do_not_set_the_session_range():
+    book = QuoteBook()
+    book.seed(Quote("AAPL", current_price=100.0, previous_close=99.0, timestamp=_ts(2026, 10, 14, 16, 0)))
+    book.update_trade("AAPL", 95.0, _ts(2026, 10, 15, 7, 0) * 1000)  # 寄り付き前
+
+    quote = book.get("AAPL")
+    assert quote.current_price == 95.0
+    assert (quote.open, quote.high, quote.low) == (None, None, None)
+
+    book.update_trade("AAPL", 101.0, _ts(2026, 10, 15, 9, 30) * 1000)  # 寄り付き
+    book.update_trade("AAPL", 102.0, _ts(2026, 10, 15, 10, 0) * 1000)
+    book.update_trade("AAPL", 108.0, _ts(2026, 10, 15, 17, 0) * 1000)  # 時間外取引
+
+    quote = book.get("AAPL")
+    assert quote.current_price == 108.0
+    assert (quote.open, quote.high, quote.low) == (101.0, 102.0, 101.0)
@@ -0,0 +1,81 @@
+"""tools/rate_limiter.py のテスト (SQLite のトークンバケット)。"""
+
+import importlib
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+rate_limiter = importlib.import_module("05_multi_agent.tools.rate_limiter")
+
+_LIMITS = {
+    "minute": {"capacity": 2, "period": 1.0},
+    "daily": {"capacity": 2, "period": 86400, "daily": True},
+}
+
+
+@pytest.fixture
+def clock(tmp_path, monkeypatch):
+    """バケットを一時ディレクトリの DB に置き、時計を手で進められるようにする。"""
+    now = SimpleNamespace(value=1_800_000_000.0)
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_DB", str(tmp_path / "rate_limits.sqlite3"))
+    monkeypatch.setattr(rate_limiter, "RATE_LIMITS", _LIMITS)
+    monkeypatch.setattr(rate_limiter, "_local", threading.local())
+    monkeypatch.setattr(rate_limiter, "_stats", {})
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(time=lambda: now.value, sleep=lambda s: None))
+    return now
+
+
+def test_requests_beyond_capacity_are_spaced_at_the_refill_rate(clock):
+    waits = [rate_limiter._reserve("minute", 60) for _ in range(4)]
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+    assert rate_limiter.tokens_remaining("minute") == -2.0
+
+    stats = rate_limiter.get_rate_limit_stats()["minute"]
+    assert (stats["requests"], stats["waited"], stats["max_wait"]) == (4, 2, 1.0)
+
+
+def test_bucket_refills_with_elapsed_time(clock):
+    rate_limiter._reserve("minute", 60)
+    rate_limiter._reserve("minute", 60)
+    clock.value += 0.5
+    assert rate_limiter.tokens_remaining("minute") == 1.0
+    assert rate_limiter._reserve("minute", 60) == 0.0
+    clock.value += 10
+    assert rate_limiter.tokens_remaining("minute") == 2.0
+
+
+def test_wait_beyond_max_wait_raises_without_taking_a_token(clock):
+    rate_limiter._reserve("minute", 60)
+    rate_limiter._reserve("minute", 60)
+    with pytest.raises(rate_limiter.RateLimitExceeded) as excinfo:
+        rate_limiter._reserve("minute", 0.1)
+    assert excinfo.value.wait == 0.5
+    assert rate_limiter.tokens_remaining("minute") == 0.0
+
+
+def test_daily_quota_resets_at_utc_midnight(clock):
+    rate_limiter._reserve("daily", 60)
+    rate_limiter._reserve("daily", 60)
+    with pytest.raises(rate_limiter.RateLimitExceeded) as excinfo:
+        rate_limiter._reserve("daily", 60)
+    midnight = clock.value - clock.value % 86400 + 86400
+    assert excinfo.value.wait == midnight - clock.value
+
+    clock.value = midnight + 1
+    assert rate_limiter.tokens_remaining("daily") == 2.0
+    assert rate_limiter._reserve("daily", 60) == 0.0
+
+
+def test_bucket_is_shared_between_threads(clock):
+    waits = []
+    threads = [
+        threading.Thread(target=lambda: waits.append(rate_limiter._reserve("minute", 60)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # スレッドごとに別の接続でも、同じバケットからスロットを順に割り当てる
+    assert sorted(waits) == [0.0, 0.0, 0.5, 1.0]
@@ -0,0 +1,44 @@
+"""tools/reddit_index.py のテスト。"""
+
+import importlib
+import threading
+import time
+
+import pytest
+
+reddit_index = importlib.import_module("05_multi_agent.tools.reddit_index")
+records = importlib.import_module("05_multi_agent.tools.records")
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    """一時ディレクトリのインデックスに差し替える。"""
+    monkeypatch.setattr(reddit_index, "REDDIT_INDEX_DB", str(tmp_path / "reddit_index.sqlite3"))
+    monkeypatch.setattr(reddit_index, "_local", threading.local())
+    now = time.time()
+    reddit_index.upsert([
+        records.RedditPost("p1", "stocks", "F earnings beat", "Ford had a strong quarter", 50, 0.9, 10, now, "/p1", False),
+        records.RedditPost("p2", "stocks", "$F calls printing", "", 20, 0.8, 3, now, "/p2", False),
+        records.RedditPost("p3", "wallstreetbets", "TSLA to the moon", "Not financial advice, DD inside", 80, 0.9, 40, now, "/p3", False),
+    ])
+    return reddit_index
+
+
+def test_extract_tickers_uses_cashtags_and_bare_uppercase():
+    assert reddit_index.extract_tickers("$f and TSLA, not DD or I or A") == {"F", "TSLA"}
+
+
+@pytest.mark.parametrize("query, tickers, terms", [
+    ("F earnings", [], ["F", "earnings"]),
+    ("$F", ["F"], []),
+    ("TSLA DD", ["TSLA"], ["DD"]),
+    ("$TOOLONG", [], ["TOOLONG"]),
+])
+def test_query_uses_the_same_ticker_rule_as_the_index(query, tickers, terms):
+    assert reddit_index._split_query(query) == (tickers, terms)
+
+
+def test_single_letter_query_falls_back_to_full_text(index):
+    assert [r.id for r in index.search("F earnings", ["stocks"], "top", 10)] == ["p1"]
+    assert [r.id for r in index.search("$F", ["stocks"], "top", 10)] == ["p2"]
+    assert [r.id for r in index.search("TSLA", ["wallstreetbets"], "top", 10)] == ["p3"]
@@ -0,0 +1,66 @@
+"""tools/reddit_sentiment.py のテスト (辞書ベースの採点規則)。"""
+
+import importlib
+
+import pytest
+
+reddit_sentiment = importlib.import_module("05_multi_agent.tools.reddit_sentiment")
+
+
+def _score(title: str, body: str = "") -> tuple[float, list[str]]:
+    scores, hits = reddit_sentiment.score_texts([title], [body])
+    return float(scores[0]), hits[0]
+
+
+def test_negation_flips_polarity():
+    assert _score("AAPL is bullish")[0] > 0
+    score, hits = _score("AAPL is not bullish at all")
+    assert score < 0
+    # 否定された語句は頻出語句に含めない
+    assert hits == []
+
+
+def test_negation_window_is_three_words():
+    assert _score("not a big fan of this rally")[0] > 0
+    assert _score("not really a rally")[0] < 0
+
+
+@pytest.mark.parametrize("text, sign", [
+    ("bought puts on TSLA", -1),
+    ("sold puts on TSLA", 1),
+    ("buying calls", 1),
+    ("sold my calls", -1),
+    ("puts", -1),
+])
+def test_option_sign_follows_trade_direction(text, sign):
+    score, _ = _score(text)
+    assert score * sign > 0
+
+
+def test_trade_verb_before_option_has_no_polarity_of_its_own():
+    # "sold" 単独は弱気だが、"sold puts" では売買の向きとしてだけ使う
+    assert _score("sold")[0] < 0
+    _, hits = _score("sold puts")
+    assert hits == ["puts"]
+
+
+def test_phrases_match_as_one_term():
+    _, hits = _score("AAPL to the moon")
+    assert hits == ["to the moon"]
+    score, hits = _score("this is a rug pull")
+    assert score < 0 and hits == ["-rug pull"]
+    # 語の一部だけでは表現にならない
+    assert _score("the moon")[1] == ["moon"]
+
+
+def test_slang_has_no_polarity():
+    assert _score("fucking retard ape")[0] == 0.0
+    assert _score("fucking moon")[0] > _score("moon")[0]
+
+
+def test_empty_summary_has_the_same_keys():
+    post = {"title": "AAPL to the moon", "selftext": "", "subreddit": "stocks", "score": 10, "num_comments": 2}
+    empty = reddit_sentiment.summarize_posts([])
+    assert set(empty) == set(reddit_sentiment.summarize_posts([post]))
+    assert empty["bullish_ratio"] is None
+    assert empty["mean_score"] == empty["weighted_score"] == empty["average_engagement"] == 0.0
@@ -0,0 +1,75 @@
+"""tools/aio/reddit_tools.py のテスト (OAuth API の Listing のページ送り)。"""
+
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+import pytest
+
+reddit_tools = importlib.import_module("05_multi_agent.tools.aio.reddit_tools")
+
+
+def _listing(start: int, count: int, after: str | None) -> dict:
+    children = [
+        {"data": {"id": f"p{i}", "subreddit": "stocks", "title": f"post {i}", "score": i}}
+        for i in range(start, start + count)
+    ]
+    return {"data": {"children": children, "after": after}}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Reddit の OAuth API を差し替え、リクエストとレート枠の確保を順に記録する。"""
+    calls = []
+
+    async def acquire_async(provider):
+        calls.append(("acquire", provider))
+        return 0.0
+
+    async def post(url, **kwargs):
+        calls.append(("token", url))
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: {"access_token": "t", "expires_in": 3600})
+
+    monkeypatch.setattr(reddit_tools, "_token", None)
+    monkeypatch.setattr(reddit_tools, "acquire_async", acquire_async)
+    monkeypatch.setattr(reddit_tools, "get_async_client", lambda: SimpleNamespace(post=post))
+    return calls
+
+
+def test_token_request_takes_a_rate_limit_slot(api):
+    assert asyncio.run(reddit_tools._get_access_token()) == "t"
+    assert [name for name, _ in api] == ["acquire", "token"]
+    assert api[0] == ("acquire", "reddit")
+    # 期限内は再利用する
+    asyncio.run(reddit_tools._get_access_token())
+    assert len(api) == 2
+
+
+def test_listing_follows_after_cursor_until_limit(monkeypatch):
+    pages = {None: _listing(0, 100, "t3_a"), "t3_a": _listing(100, 100, "t3_b"), "t3_b": _listing(200, 100, "t3_c")}
+    requests = []
+
+    async def reddit_get(path, params):
+        requests.append(params)
+        return pages[params.get("after")]
+
+    monkeypatch.setattr(reddit_tools, "_reddit_get", reddit_get)
+    records = asyncio.run(reddit_tools._fetch_listing("/r/stocks/hot", {}, 250))
+
+    assert len(records) == 250
+    assert [p["limit"] for p in requests] == [100, 100, 50]
+    assert [p.get("after") for p in requests] == [None, "t3_a", "t3_b"]
+
+
+def test_listing_stops_at_the_last_page(monkeypatch):
+    requests = []
+
+    async def reddit_get(path, params):
+        requests.append(params)
+        return _listing(0, 30, None)
+
+    monkeypatch.setattr(reddit_tools, "_reddit_get", reddit_get)
+    records = asyncio.run(reddit_tools._fetch_listing("/r/stocks/search", {"q": "AAPL"}, 60))
+
+    assert len(records) == 30
+    assert requests == [{"q": "AAPL", "limit": 60}]
@@ -0,0 +1,121 @@
+"""tools/singleflight.py のテスト (同一呼び出しの合流)。"""
+
+import asyncio
+import importlib
+import threading
+import time
+
+import pytest
+
+singleflight = importlib.import_module("05_multi_agent.tools.singleflight")
+
+
+@pytest.fixture
+def flight(monkeypatch):
+    flight = singleflight.SingleFlight()
+    monkeypatch.setattr(singleflight, "_flight", flight)
+    return flight
+
+
+def test_concurrent_async_calls_share_one_upstream_call(flight):
+    calls = []
+
+    @singleflight.coalesced("quote")
+    async def get_quote(symbol: str, fresh: bool = False) -> dict:
+        calls.append(symbol)
+        await asyncio.sleep(0.05)
+        return {"symbol": symbol, "tags": []}
+
+    async def run():
+        return await asyncio.gather(
+            *(get_quote("AAPL") for _ in range(3)),
+            get_quote(symbol="AAPL", fresh=False),
+            get_quote("MSFT"),
+        )
+
+    results = asyncio.run(run())
+    # デフォルト値を補完したキーで合流し、引数の異なる呼び出しは別に実行する
+    assert calls == ["AAPL", "MSFT"]
+    assert results[:4] == [{"symbol": "AAPL", "tags": []}] * 4
+    # 後続には先行呼び出しの結果のコピーを返す
+    results[1]["tags"].append("changed")
+    assert results[0]["tags"] == []
+    assert flight.stats()["endpoints"]["quote"] == {"upstream": 2, "coalesced": 3}
+
+
+def test_sequential_calls_are_not_coalesced(flight):
+    calls = []
+
+    @singleflight.coalesced("quote")
+    async def get_quote(symbol: str) -> str:
+        calls.append(symbol)
+        return symbol
+
+    asyncio.run(get_quote("AAPL"))
+    asyncio.run(get_quote("AAPL"))
+    assert calls == ["AAPL", "AAPL"]
+
+
+def test_leader_error_is_raised_to_followers(flight):
+    calls = []
+
+    @singleflight.coalesced("quote")
+    async def get_quote(symbol: str) -> str:
+        calls.append(symbol)
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        return await asyncio.gather(get_quote("AAPL"), get_quote("AAPL"), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert calls == ["AAPL"]
+    assert [str(e) for e in errors] == ["upstream down"] * 2
+
+
+def test_follower_retries_when_the_leader_is_cancelled(flight):
+    calls = []
+
+    @singleflight.coalesced("quote")
+    async def get_quote(symbol: str) -> str:
+        calls.append(symbol)
+        await asyncio.sleep(0.05)
+        return symbol
+
+    async def run():
+        leader = asyncio.create_task(get_quote("AAPL"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(get_quote("AAPL"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(run()) == "AAPL"
+    assert calls == ["AAPL", "AAPL"]
+
+
+def test_concurrent_threads_share_one_upstream_call(flight):
+    release = threading.Event()
+    calls = []
+
+    @singleflight.coalesced("profile")
+    def get_profile(symbol: str) -> dict:
+        calls.append(symbol)
+        release.wait(5)
+        return {"symbol": symbol}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get_profile("AAPL"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    # 先行呼び出しの実行中に残りの 3 スレッドが合流するまで待つ
+    deadline = time.monotonic() + 5
+    while flight.stats()["coalesced"] < 3:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["AAPL"]
+    assert results == [{"symbol": "AAPL"}] * 4
@@ -0,0 +1,53 @@
+"""tools/social_signals.py のテスト。"""
+
+import importlib
+from datetime import datetime, timedelta
+
+social_signals = importlib.import_module("05_multi_agent.tools.social_signals")
+
+_START = datetime(2026, 10, 1)
+
+
+def _bucket(at: datetime, mention: int) -> dict:
+    return {
+        "atTime": at.strftime("%Y-%m-%d %H:%M:%S"),
+        "mention": mention,
+        "positiveMention": mention // 2,
+        "negativeMention": mention - mention // 2,
+        "positiveScore": 0.5,
+        "negativeScore": 0.5,
+        "score": 0.0,
+    }
+
+
+def _hourly(hours: int, spike_at: int | None = None) -> list[dict]:
+    return [
+        _bucket(_START + timedelta(hours=h), 200 if h == spike_at else 10 + h % 3)
+        for h in range(hours)
+    ]
+
+
+def test_off_grid_timestamp_snaps_to_hourly_bucket():
+    entries = _hourly(48, spike_at=40)
+    entries.append(_bucket(_START + timedelta(hours=20, minutes=7), 4))
+
+    series = social_signals.to_series(entries)
+    assert series["time"].size == 48
+    assert series["observed"].all()
+    # 20:07 のバケットは 20:00 のバケットに合算する
+    assert series["mentions"][20] == 10 + 20 % 3 + 4
+
+    summary = social_signals.summarize(entries)
+    assert summary["buckets"] == 48
+    assert summary["bucket_hours"] == 1.0
+    spikes = [a for a in summary["anomalies"] if a["type"] == "mention_spike"]
+    assert [a["time"] for a in spikes] == ["2026-10-02T16:00:00"]
+
+
+def test_missing_buckets_are_not_observed():
+    entries = [e for h, e in enumerate(_hourly(30)) if not 10 <= h < 16]
+
+    series = social_signals.to_series(entries)
+    assert series["time"].size == 30
+    assert not series["observed"][10:16].any()
+    assert series["mentions"][10:16].sum() == 0
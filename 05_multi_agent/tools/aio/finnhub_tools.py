@@ -0,0 +1,273 @@
+"""Finnhub API ツール (非同期版)。
+
+tools/finnhub_tools.py と同名・同シグネチャの async 関数を提供する。
+ParallelAgent 内でイベントループをブロックせずに並行実行できる。
+"""
+
+import asyncio
+from typing import Awaitable, Callable
+
+from ...config.settings import (
+    FINNHUB_API_KEY,
+    FINNHUB_BASE_URL,
+    FINNHUB_MAX_CONCURRENCY,
+    NEWS_MAX_CANDIDATES,
+)
+from .. import finnhub_tools as _sync
+from .. import json_stream, quote_stream
+from ..cache import cached, quote_ttl
+from ..http_client import async_http_get, async_http_stream
+from ..news_dedup import dedupe_articles
+from ..rate_limiter import acquire_async
+from ..records import Article, Quote, Record
+
+
+async def _finnhub_get(endpoint: str, params: dict | None = None) -> dict:
+    """Finnhub API への GET リクエストを非同期に実行する。"""
+    params = dict(params or {})
+    params["token"] = FINNHUB_API_KEY
+    await acquire_async("finnhub")
+    resp = await async_http_get(f"{FINNHUB_BASE_URL}{endpoint}", params=params)
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def _finnhub_get_list(
+    endpoint: str, params: dict, project: Callable[[dict], Article]
+) -> list[Article]:
+    """配列を返す Finnhub API を逐次パースし、先頭 NEWS_MAX_CANDIDATES 件を射影して返す。"""
+    params = {**params, "token": FINNHUB_API_KEY}
+    await acquire_async("finnhub")
+    async with async_http_stream(f"{FINNHUB_BASE_URL}{endpoint}", params=params) as resp:
+        resp.raise_for_status()
+        items = await json_stream.aparse_list(
+            resp.aiter_bytes(),
+            max_items=NEWS_MAX_CANDIDATES,
+            project=project,
+            accept=_sync._has_headline,
+        )
+    return items if isinstance(items, list) else []
+
+
+async def get_stock_quote(symbol: str) -> dict:
+    """リアルタイム株価を取得する。
+
+    Args:
+        symbol: ティッカーシンボル (例: "AAPL", "GOOGL", "MSFT")
+
+    Returns:
+        現在の株価情報 (価格, 変動率, 高値, 安値, 出来高等)
+    """
+    return (await _quote(symbol)).to_dict()
+
+
+async def _quote(symbol: str) -> Quote:
+    """購読中の銘柄はブックから、それ以外は REST から株価を返す。"""
+    streamed = quote_stream.get_streamed_quote(symbol)
+    if streamed is not None:
+        return streamed
+    quote = await _fetch_quote(symbol)
+    quote_stream.seed_quote(quote)
+    # 購読銘柄は受信済みの約定を反映したブックの値を返す
+    return quote_stream.get_streamed_quote(symbol) or quote
+
+
+@cached("quote", ttl=quote_ttl)
+async def _fetch_quote(symbol: str) -> Quote:
+    """/quote を REST で取得する (ストリーム未購読・切断時の経路)。"""
+    data = await _finnhub_get("/quote", {"symbol": symbol.upper()})
+    return _sync._parse_quote(symbol, data)
+
+
+@cached("profile")
+async def get_company_profile(symbol: str) -> dict:
+    """企業のプロフィール情報を取得する。
+
+    Args:
+        symbol: ティッカーシンボル (例: "AAPL")
+
+    Returns:
+        企業名, 業種, 時価総額, IPO日等の企業情報
+    """
+    data = await _finnhub_get("/stock/profile2", {"symbol": symbol.upper()})
+    return _sync._parse_profile(symbol, data)
+
+
+@cached("metric")
+async def get_basic_financials(symbol: str) -> dict:
+    """企業の主要財務指標を取得する。
+
+    Args:
+        symbol: ティッカーシンボル (例: "AAPL")
+
+    Returns:
+        PER, PBR, 配当利回り, ROE, 52週高値/安値 等の財務指標
+    """
+    data = await _finnhub_get("/stock/metric", {"symbol": symbol.upper(), "metric": "all"})
+    return _sync._parse_financials(symbol, data)
+
+
+async def get_market_news(category: str = "general", limit: int = 10, symbol: str = "") -> dict:
+    """マーケットニュースを取得する。
+
+    symbol を指定すると、その銘柄のティッカー・企業名に関連する記事だけを
+    関連度順に返す (関連する記事がなければ空)。
+
+    Args:
+        category: ニュースカテゴリ ("general", "forex", "crypto", "merger")
+        limit: 取得件数 (最大50)
+        symbol: 関連度で絞り込む銘柄のティッカー (省略時は新しい順)
+
+    Returns:
+        最新のマーケットニュース記事のリスト
+    """
+    return _sync._market_news_result(
+        category, await _market_news_articles(category, limit, symbol)
+    )
+
+
+async def _market_news_articles(category: str, limit: int, symbol: str = "") -> list[Article]:
+    """get_market_news の記事 (symbol 指定時は関連する記事を関連度順) を返す。"""
+    articles = await _fetch_market_news(category)
+    if symbol:
+        articles = _sync._rank_news(
+            articles, symbol, await _company_name(symbol), limit, require_match=True
+        )
+    return articles[:limit]
+
+
+@cached("market_news")
+async def _fetch_market_news(category: str) -> list[Article]:
+    """/news を取得し、近似重複をまとめた記事リストを返す (新しい順)。"""
+    return dedupe_articles(
+        await _finnhub_get_list("/news", {"category": category}, _sync._article)
+    )
+
+
+async def _company_name(symbol: str) -> str | None:
+    """関連度の計算に使う企業名を返す (プロフィールのキャッシュを利用)。"""
+    try:
+        return (await get_company_profile(symbol)).get("name")
+    except Exception:
+        return None
+
+
+async def get_company_news(symbol: str, days: int = 7, limit: int = 10) -> dict:
+    """特定企業に関するニュースを取得する。
+
+    記事はティッカー・企業名との関連度順に並べ、上位 limit 件を返す。
+
+    Args:
+        symbol: ティッカーシンボル (例: "AAPL")
+        days: 過去何日分のニュースを取得するか (デフォルト: 7)
+        limit: 取得件数 (最大50)
+
+    Returns:
+        対象企業に関するニュース記事のリスト
+    """
+    return _sync._company_news_result(
+        symbol, days, await _company_news_articles(symbol, days, limit)
+    )
+
+
+async def _company_news_articles(symbol: str, days: int, limit: int) -> list[Article]:
+    """get_company_news の記事 (関連度順) を返す。"""
+    articles, company_name = await asyncio.gather(
+        _fetch_company_news(symbol, days), _company_name(symbol)
+    )
+    return _sync._rank_news(articles, symbol, company_name, limit)
+
+
+@cached("company_news")
+async def _fetch_company_news(symbol: str, days: int) -> list[Article]:
+    """/company-news を取得し、近似重複をまとめた記事リストを返す (新しい順)。"""
+    from_date, to_date = _sync._news_date_range(days)
+    return dedupe_articles(await _finnhub_get_list(
+        "/company-news",
+        {"symbol": symbol.upper(), "from": from_date, "to": to_date},
+        _sync._article,
+    ))
+
+
+@cached("social_sentiment")
+async def get_social_sentiment(symbol: str, days: int = 7) -> dict:
+    """ソーシャルメディア上のセンチメントデータを取得する。
+
+    時間バケットごとのメンション数を時系列のまま分析し、メンション速度・
+    z スコア・ポジティブ/ネガティブの乖離から異常 (急増・急減・センチメント変化) を検出する。
+
+    Args:
+        symbol: ティッカーシンボル (例: "AAPL")
+        days: 過去何日分のバケットを分析するか (デフォルト: 7)
+
+    Returns:
+        Reddit/Twitter でのメンション数、ポジティブ/ネガティブスコア、
+        最新バケットの指標、直近バケットの表、検出した異常
+    """
+    from_date, to_date = _sync._news_date_range(days)
+    data = await _finnhub_get(
+        "/stock/social-sentiment",
+        {"symbol": symbol.upper(), "from": from_date, "to": to_date},
+    )
+    return _sync._parse_social_sentiment(symbol, data)
+
+
+async def get_stock_quotes(symbols: str) -> dict:
+    """複数銘柄の株価を一括で取得する。
+
+    同業他社との比較など複数銘柄を見る場合は、get_stock_quote を
+    銘柄ごとに呼ぶ代わりにこのツールを 1 回呼ぶ。
+
+    Args:
+        symbols: カンマ区切りのティッカーシンボル (例: "AAPL,MSFT,GOOGL")
+
+    Returns:
+        columns と rows からなる株価の表 (取得できなかった銘柄は errors)
+    """
+    symbol_list = _sync._split_symbols(symbols)
+    fetched = await _fetch_symbols(_quote, symbol_list)
+    return _sync._build_table(symbol_list, fetched, _sync.QUOTE_COLUMNS)
+
+
+async def get_company_profiles(symbols: str) -> dict:
+    """複数銘柄の企業プロフィールを一括で取得する。
+
+    Args:
+        symbols: カンマ区切りのティッカーシンボル (例: "AAPL,MSFT,GOOGL")
+
+    Returns:
+        columns と rows からなる企業名・業種・時価総額等の表
+    """
+    symbol_list = _sync._split_symbols(symbols)
+    fetched = await _fetch_symbols(get_company_profile, symbol_list)
+    return _sync._build_table(symbol_list, fetched, _sync.PROFILE_COLUMNS)
+
+
+async def get_basic_financials_batch(symbols: str) -> dict:
+    """複数銘柄の主要財務指標を一括で取得する。
+
+    Args:
+        symbols: カンマ区切りのティッカーシンボル (例: "AAPL,MSFT,GOOGL")
+
+    Returns:
+        columns と rows からなる PER, PBR, ROE 等の表
+    """
+    symbol_list = _sync._split_symbols(symbols)
+    fetched = await _fetch_symbols(get_basic_financials, symbol_list)
+    return _sync._build_table(symbol_list, fetched, _sync.FINANCIALS_COLUMNS)
+
+
+async def _fetch_symbols(
+    fetch: Callable[[str], Awaitable[dict | Record]], symbols: list[str]
+) -> dict[str, dict | Record | Exception]:
+    """銘柄ごとの取得を FINNHUB_MAX_CONCURRENCY 件ずつ並行実行する。"""
+    semaphore = asyncio.Semaphore(FINNHUB_MAX_CONCURRENCY)
+
+    async def fetch_one(symbol: str) -> tuple[str, dict | Record | Exception]:
+        async with semaphore:
+            try:
+                return symbol, await fetch(symbol)
+            except Exception as e:
+                return symbol, e
+
+    return dict(await asyncio.gather(*(fetch_one(s) for s in symbols)))
@@ -0,0 +1,123 @@
+"""FRED API ツール (非同期版)。
+
+tools/fred_tools.py と同名・同シグネチャの async 関数を提供する。
+"""
+
+import asyncio
+
+from ...config.settings import FRED_API_KEY, FRED_BASE_URL, FRED_MAX_CONCURRENCY
+from .. import fred_store
+from .. import fred_tools as _sync
+from ..cache import cached
+from ..http_client import async_http_get
+from ..rate_limiter import acquire_async
+from ..records import Observation
+
+
+@cached("fred_observations", ttl=_sync._series_ttl)
+async def _fred_get_latest(series_id: str, limit: int = 1) -> list[Observation]:
+    """指定シリーズの最新データを非同期に取得する (ローカルストア経由)。
+
+    ローカルストア (SQLite) の読み書きはイベントループをブロックしないよう別スレッドで行う。
+    """
+    params = await asyncio.to_thread(
+        fred_store.refresh_params, series_id, limit, _sync._series_frequency(series_id)
+    )
+    if params is not None:
+        await acquire_async("fred")
+        resp = await async_http_get(
+            f"{FRED_BASE_URL}/series/observations",
+            params={**_sync._observation_params(series_id, limit), **params},
+        )
+        resp.raise_for_status()
+        await asyncio.to_thread(
+            fred_store.save, series_id, resp.json().get("observations", []), params
+        )
+    return await asyncio.to_thread(fred_store.load, series_id, limit)
+
+
+async def get_economic_indicators(indicators: str = "") -> dict:
+    """米国の主要経済指標の最新値を一括取得する。
+
+    GDP成長率、失業率、CPI、FF金利、10年国債利回り、VIX 等を返す。
+    各シリーズは並行して取得し、一部が失敗してもその指標だけを error とする。
+
+    Args:
+        indicators: カンマ区切りの指標キー (例: "gdp,treasury_2y,sp500")。
+            省略時は主要 7 指標。指定可能なキー: gdp, gdp_growth,
+            unemployment_rate, cpi, cpi_yoy, fed_funds_rate, treasury_10y,
+            treasury_2y, sp500, vix, initial_claims, consumer_sentiment
+
+    Returns:
+        主要経済指標の最新値と日付を含む辞書
+    """
+    if not FRED_API_KEY:
+        return _sync._indicators_not_configured()
+
+    keys = _sync._resolve_indicators(indicators)
+    fetched = await _fetch_series(_sync._series_requests(keys))
+    return {"indicators": _sync._build_indicators(keys, fetched)}
+
+
+async def _fetch_series(requests: dict[str, int]) -> dict[str, list[Observation] | Exception]:
+    """複数シリーズを FRED_MAX_CONCURRENCY 件ずつ並行取得する。"""
+    semaphore = asyncio.Semaphore(FRED_MAX_CONCURRENCY)
+
+    async def fetch(series_id: str, limit: int) -> tuple[str, list[Observation] | Exception]:
+        async with semaphore:
+            try:
+                return series_id, await _fred_get_latest(series_id, limit)
+            except Exception as e:
+                return series_id, e
+
+    return dict(await asyncio.gather(
+        *(fetch(sid, limit) for sid, limit in requests.items())
+    ))
+
+
+async def get_economic_series(
+    series_id: str, observation_count: int = 12
+) -> dict:
+    """FRED の任意のデータ系列を取得する。
+
+    800,000+ のデータ系列から指定した系列の直近データを返す。
+
+    Args:
+        series_id: FRED シリーズ ID (例: "GDP", "UNRATE", "CPIAUCSL", "FEDFUNDS")
+        observation_count: 取得するデータポイント数 (デフォルト: 12)
+
+    Returns:
+        指定シリーズの直近データポイントのリスト
+    """
+    if not FRED_API_KEY:
+        return _sync._series_not_configured(series_id)
+
+    observations = await _fred_get_latest(series_id, limit=observation_count)
+    return _sync._parse_series(series_id, observations)
+
+
+async def get_derived_economic_metrics(indicators: str = "", window: int = 12) -> dict:
+    """経済指標の派生メトリクスをローカルで計算して返す。
+
+    前年比・前期比・移動平均・z スコアと、10年債-2年債スプレッド
+    (イールドカーブの逆転判定) を 1 回のツール呼び出しでまとめて返す。
+
+    Args:
+        indicators: カンマ区切りの指標キー (例: "cpi,unemployment_rate")。
+            省略時は CPI, 失業率, FF金利, 10年債, 2年債, VIX
+        window: 移動平均・z スコアの窓 (観測数、デフォルト: 12)
+
+    Returns:
+        指標ごとの latest, change_pct, yoy_pct, rolling_mean, zscore, trend と
+        yield_curve (spread_10y_2y) を含む辞書
+    """
+    if not FRED_API_KEY:
+        return _sync._derived_not_configured()
+
+    keys = (
+        _sync._resolve_indicators(indicators)
+        if indicators
+        else list(_sync.DERIVED_INDICATORS)
+    )
+    fetched = await _fetch_series(_sync._series_requests(keys, window))
+    return _sync._build_derived(keys, fetched, window)
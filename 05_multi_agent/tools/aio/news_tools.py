@@ -0,0 +1,40 @@
+"""ニュース統合ツール (非同期版)。
+
+tools/news_tools.py と同名・同シグネチャの async 関数を提供する。
+"""
+
+import asyncio
+
+from .. import news_tools as _sync
+from .finnhub_tools import _company_name, _company_news_articles, _market_news_articles
+from .marketaux_tools import _news_articles
+
+_SOURCES = {
+    "marketaux": _news_articles,
+    "company_news": _company_news_articles,
+    "market_news": _market_news_articles,
+}
+
+
+async def get_news_digest(symbol: str, days: int = 7, limit: int = 15) -> dict:
+    """対象銘柄のニュースを複数ソースから集約し、重複を除いて取得する。
+
+    企業ニュース・センチメント付きニュース・マーケット全体ニュースを 1 回で取得し、
+    同じ記事の転載は 1 件にまとめて sources / source_count を付与する。
+    記事は対象銘柄との関連度 (relevance) の高い順に並ぶ。
+
+    Args:
+        symbol: ティッカーシンボル (例: "AAPL")
+        days: 企業ニュースを過去何日分取得するか (デフォルト: 7)
+        limit: 返す記事数の上限 (デフォルト: 15)
+
+    Returns:
+        重複排除済みの記事リスト (見出し, 要約, ソース, センチメント等)
+    """
+    calls = _sync._digest_args(symbol, days)
+    company_name, *results = await asyncio.gather(
+        _company_name(symbol),
+        *(_SOURCES[name](*args) for name, args in calls.items()),
+        return_exceptions=True,
+    )
+    return _sync._build_digest(symbol, dict(zip(calls, results)), limit, company_name)
@@ -0,0 +1,218 @@
+"""Reddit API ツール (非同期版)。
+
+tools/reddit_tools.py と同名・同シグネチャの async 関数を提供する。
+PRAW は同期ライブラリのため、Reddit の OAuth API (application-only) を
+httpx で直接呼び出す。ローカルインデックス (SQLite) の読み書きは
+イベントループをブロックしないよう別スレッドで行う。
+"""
+
+import asyncio
+import time
+
+from ...config.settings import (
+    REDDIT_CLIENT_ID,
+    REDDIT_CLIENT_SECRET,
+    REDDIT_OAUTH_URL,
+    REDDIT_URL,
+    REDDIT_USER_AGENT,
+)
+from .. import reddit_index
+from .. import reddit_tools as _sync
+from ..http_client import async_http_get, get_async_client
+from ..rate_limiter import acquire_async
+from ..records import RedditPost
+from ..singleflight import coalesced
+
+# Reddit の Listing 1 ページあたりの最大件数
+_PAGE_SIZE = 100
+
+# (アクセストークン, 有効期限の UNIX 時刻)
+_token: tuple[str, float] | None = None
+
+
+async def _get_access_token() -> str:
+    """application-only OAuth のアクセストークンを取得する (期限内は再利用)。"""
+    global _token
+    if _token is not None and _token[1] > time.time():
+        return _token[0]
+
+    await acquire_async("reddit")
+    resp = await get_async_client().post(
+        f"{REDDIT_URL}/api/v1/access_token",
+        data={"grant_type": "client_credentials"},
+        auth=(REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET),
+        headers={"User-Agent": REDDIT_USER_AGENT},
+    )
+    resp.raise_for_status()
+    data = resp.json()
+    # 期限切れ直前のトークンを使わないよう 60 秒の余裕を持たせる
+    _token = (data["access_token"], time.time() + data.get("expires_in", 3600) - 60)
+    return _token[0]
+
+
+async def _reddit_get(path: str, params: dict) -> dict:
+    """Reddit OAuth API への GET リクエストを非同期に実行する。"""
+    token = await _get_access_token()
+    await acquire_async("reddit")
+    resp = await async_http_get(
+        f"{REDDIT_OAUTH_URL}{path}",
+        params={**params, "raw_json": 1},
+        headers={
+            "Authorization": f"bearer {token}",
+            "User-Agent": REDDIT_USER_AGENT,
+        },
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def _fetch_listing(path: str, params: dict, limit: int) -> list[RedditPost]:
+    """Listing を after カーソルでたどり、limit 件まで取得する。
+
+    1 ページは最大 100 件のため、それを超える件数は複数ページに分けて取得する
+    (同期版の PRAW と同じ)。
+    """
+    records: list[RedditPost] = []
+    after = None
+    while len(records) < limit:
+        page_params = {**params, "limit": min(_PAGE_SIZE, limit - len(records))}
+        if after:
+            page_params["after"] = after
+        listing = await _reddit_get(path, page_params)
+        page = _listing_records(listing)
+        records.extend(page)
+        after = listing.get("data", {}).get("after")
+        if not page or not after:
+            break
+    return records[:limit]
+
+
+def _listing_records(listing: dict) -> list[RedditPost]:
+    """Listing レスポンスを RedditPost のリストに変換する。"""
+    records = []
+    for child in listing.get("data", {}).get("children", []):
+        post = child.get("data", {})
+        records.append(RedditPost(
+            post.get("id"),
+            post.get("subreddit"),
+            post.get("title"),
+            post.get("selftext"),
+            post.get("score", 0),
+            post.get("upvote_ratio"),
+            post.get("num_comments"),
+            post.get("created_utc"),
+            post.get("permalink", ""),
+            bool(post.get("stickied")),
+        ))
+    return records
+
+
+@coalesced("reddit_hot")
+async def get_reddit_hot_posts(
+    subreddits: str = "wallstreetbets,stocks,investing",
+    limit: int = 20,
+) -> dict:
+    """Reddit の人気投稿を取得する。
+
+    指定したサブレディットの HOT 投稿を取得し、
+    個人投資家の注目トピックを把握する。
+    複数のサブレディットは "a+b+c" の統合リスティング 1 回で取得する。
+    常駐取り込みでインデックスが新しい間はローカルインデックスから応答する。
+
+    Args:
+        subreddits: カンマ区切りのサブレディット名
+            (例: "wallstreetbets,stocks,investing")
+        limit: サブレディットごとの取得件数 (デフォルト: 20)
+
+    Returns:
+        各サブレディットの人気投稿リスト (タイトル, スコア, コメント数等)
+    """
+    if not _sync._is_reddit_configured():
+        return _sync._not_configured()
+
+    subreddit_list = _sync._split_subreddits(subreddits)
+    combined_limit = _sync._combined_limit(limit, subreddit_list)
+    if await asyncio.to_thread(_sync._index_is_fresh, subreddit_list):
+        records = await asyncio.to_thread(reddit_index.hot, subreddit_list, combined_limit)
+        return _sync._hot_result(subreddit_list, records)
+
+    records = await _fetch_listing(
+        f"/r/{_sync._multireddit(subreddit_list)}/hot", {}, combined_limit
+    )
+    await asyncio.to_thread(reddit_index.upsert, records)
+    return _sync._hot_result(subreddit_list, records)
+
+
+@coalesced("reddit_search")
+async def search_reddit_posts(
+    query: str,
+    subreddits: str = "wallstreetbets,stocks,investing",
+    sort: str = "relevance",
+    limit: int = 20,
+) -> dict:
+    """Reddit でキーワード検索を行う。
+
+    特定の銘柄やトピックに関する投稿を検索し、
+    個人投資家の議論内容と感情を把握する。
+    複数のサブレディットは "a+b+c" の統合検索 1 回で取得する。
+    常駐取り込みでインデックスが新しい間はローカルインデックス
+    (ティッカー索引・全文索引) から応答する。
+
+    Args:
+        query: 検索キーワード (例: "AAPL earnings", "Tesla")
+        subreddits: カンマ区切りのサブレディット名
+            (例: "wallstreetbets,stocks")
+        sort: ソート順 ("relevance", "hot", "top", "new", "comments")
+        limit: サブレディットごとの取得件数
+
+    Returns:
+        検索結果の投稿リスト
+    """
+    if not _sync._is_reddit_configured():
+        return {"query": query, **_sync._not_configured()}
+
+    subreddit_list = _sync._split_subreddits(subreddits)
+    combined_limit = _sync._combined_limit(limit, subreddit_list)
+    if await asyncio.to_thread(_sync._index_is_fresh, subreddit_list):
+        records = await asyncio.to_thread(
+            reddit_index.search, query, subreddit_list, sort, combined_limit
+        )
+        return _sync._search_result(query, subreddit_list, records)
+
+    records = await _fetch_listing(
+        f"/r/{_sync._multireddit(subreddit_list)}/search",
+        {"q": query, "sort": sort, "restrict_sr": 1},
+        combined_limit,
+    )
+    await asyncio.to_thread(reddit_index.upsert, records)
+    return _sync._search_result(query, subreddit_list, records)
+
+
+async def get_reddit_sentiment_summary(
+    query: str = "",
+    subreddits: str = "wallstreetbets,stocks,investing",
+    limit: int = 20,
+    top_n: int = 5,
+) -> dict:
+    """Reddit 投稿のセンチメントを集計して取得する。
+
+    投稿をローカルの金融・WSB 向け辞書で採点し、投稿本文の代わりに
+    強気/弱気/中立の件数、エンゲージメント加重スコア、サブレディット別の集計、
+    頻出語句、エンゲージメント上位の投稿だけを返す。
+    WSB の攻撃的な表現 (罵倒語・スラング) は極性として数えない。
+
+    Args:
+        query: 検索キーワード (例: "AAPL")。空文字なら HOT 投稿を集計する
+        subreddits: カンマ区切りのサブレディット名
+            (例: "wallstreetbets,stocks,investing")
+        limit: サブレディットごとの取得件数 (デフォルト: 20)
+        top_n: 注目投稿・頻出語句の件数 (デフォルト: 5)
+
+    Returns:
+        センチメント集計 (件数, 平均・加重スコア, サブレディット別, 頻出語句, 注目投稿)
+    """
+    if query:
+        result = await search_reddit_posts(query, subreddits, limit=limit)
+    else:
+        result = await get_reddit_hot_posts(subreddits, limit)
+    return _sync._sentiment_result(query, result, top_n)
@@ -0,0 +1,308 @@
+"""ツール結果の TTL キャッシュ。
+
+エンドポイントごとに TTL を設定し、ツール関数 (同期・非同期とも) を
+デコレータで包んでレスポンスを再利用する。
+
+    - メモリ層: 件数上限付きの LRU (CACHE_MAX_ENTRIES)
+    - ディスク層: SQLite (CACHE_DISK_ENABLED=1 のときのみ。レコード型は型名付きの JSON)
+      async 関数の読み書きはイベントループを止めないよう別スレッドで実行する
+    - 株価の TTL は米国市場の取引時間外は次の寄り付きまで延長する
+    - キャッシュミス時の同時呼び出しは single-flight で 1 回の API 呼び出しに合流する
+    - バッチ取得の結果は peek / prime で単体呼び出しのエントリとして参照・登録できる
+"""
+
+import asyncio
+import copy
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+from ..config.settings import (
+    CACHE_DB,
+    CACHE_DISK_ENABLED,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTLS,
+)
+from .records import decode, encode
+from .singleflight import _flight, make_call_key
+
+_NEW_YORK = ZoneInfo("America/New_York")
+_MARKET_OPEN = (9, 30)
+_MARKET_CLOSE = (16, 0)
+
+
+def is_us_market_open(now: datetime | None = None) -> bool:
+    """米国株式市場の通常取引時間内か判定する (祝日は考慮しない)。"""
+    now = (now or datetime.now(_NEW_YORK)).astimezone(_NEW_YORK)
+    if now.weekday() >= 5:
+        return False
+    return _MARKET_OPEN <= (now.hour, now.minute) < _MARKET_CLOSE
+
+
+def _seconds_until_open(now: datetime) -> float:
+    """次の通常取引の寄り付きまでの秒数を返す。"""
+    now = now.astimezone(_NEW_YORK)
+    candidate = now.replace(
+        hour=_MARKET_OPEN[0], minute=_MARKET_OPEN[1], second=0, microsecond=0
+    )
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return (candidate - now).total_seconds()
+
+
+def quote_ttl(*args, **kwargs) -> float:
+    """株価の TTL。取引時間外は次の寄り付きまで延長する。"""
+    now = datetime.now(_NEW_YORK)
+    if is_us_market_open(now):
+        return CACHE_TTLS["quote"]
+    return max(CACHE_TTLS["quote"], _seconds_until_open(now))
+
+
+class ResponseCache:
+    """LRU のメモリ層と任意の SQLite ディスク層を持つ TTL キャッシュ。
+
+    max_disk_entries を指定すると、書き込みのたびに期限切れのエントリを削除し、
+    件数が上限を超えた分を期限の近い順に削除する。
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        disk_path: str | None = None,
+        max_disk_entries: int | None = None,
+    ):
+        self._max_entries = max_entries
+        self._max_disk_entries = max_disk_entries
+        self._memory: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_path = disk_path
+        self._local = threading.local()
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def _disk(self) -> sqlite3.Connection | None:
+        """スレッドごとのディスク層接続を返す (無効なら None)。"""
+        if not self._disk_path:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self._disk_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self._disk_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _count(self, endpoint: str, key: str) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(
+                endpoint, {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+            )
+            entry[key] += 1
+
+    def _set_memory(self, key: str, expires: float, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = (expires, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, endpoint: str, key: str) -> tuple[bool, Any]:
+        """(ヒットしたか, 値) を返す。"""
+        now = time.time()
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                if item[0] > now:
+                    self._memory.move_to_end(key)
+                else:
+                    del self._memory[key]
+                    item = None
+        if item is not None:
+            self._count(endpoint, "memory_hits")
+            return True, copy.deepcopy(item[1])
+
+        conn = self._disk()
+        if conn is not None:
+            row = conn.execute(
+                "SELECT value, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] > now:
+                value = json.loads(row[0], object_hook=decode)
+                self._set_memory(key, row[1], value)
+                self._count(endpoint, "disk_hits")
+                return True, copy.deepcopy(value)
+
+        self._count(endpoint, "misses")
+        return False, None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """値を TTL 秒間保存する。"""
+        expires = time.time() + ttl
+        self._set_memory(key, expires, copy.deepcopy(value))
+        conn = self._disk()
+        if conn is not None:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(value, default=encode), expires),
+            )
+            if self._max_disk_entries is not None:
+                self._evict_disk(conn)
+
+    def _evict_disk(self, conn: sqlite3.Connection) -> None:
+        """ディスク層の期限切れのエントリと、上限を超えた分のエントリを削除する。"""
+        conn.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if count > self._max_disk_entries:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY expires LIMIT ?)",
+                (count - self._max_disk_entries,),
+            )
+
+    def clear(self) -> None:
+        """メモリ層とディスク層の内容を削除する。"""
+        with self._lock:
+            self._memory.clear()
+        conn = self._disk()
+        if conn is not None:
+            conn.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        """エンドポイントごとのヒット/ミス統計を返す。"""
+        with self._lock:
+            endpoints = {}
+            for endpoint, s in self._stats.items():
+                hits = s["memory_hits"] + s["disk_hits"]
+                total = hits + s["misses"]
+                endpoints[endpoint] = {
+                    **s,
+                    "hit_rate": round(hits / total, 3) if total else 0.0,
+                }
+            return {"entries": len(self._memory), "endpoints": endpoints}
+
+    def reset_stats(self) -> None:
+        """ヒット/ミス統計をリセットする。"""
+        with self._lock:
+            self._stats.clear()
+
+
+_cache = ResponseCache(CACHE_MAX_ENTRIES, CACHE_DB if CACHE_DISK_ENABLED else None)
+
+
+async def _run(func: Callable, *args: Any) -> Any:
+    """キャッシュの操作を実行する。ディスク層があれば別スレッドで実行する。"""
+    if _cache._disk_path:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+def _is_cacheable(result: Any) -> bool:
+    """エラーを含む結果はキャッシュしない。"""
+    return not (isinstance(result, dict) and "error" in result)
+
+
+def cached(endpoint: str, ttl: float | Callable[..., float] | None = None):
+    """ツール関数の結果をキャッシュするデコレータ。
+
+    同期関数・async 関数の両方に対応する。キャッシュキーはエンドポイント名と
+    引数 (デフォルト値を補完したもの) から生成するため、同名の同期版と
+    非同期版は同じエントリを共有する。ミス時に同じキーの呼び出しが実行中なら
+    その結果を待って共有する。
+
+    包んだ関数には次の属性を追加する (バッチ取得の結果を単体呼び出しと共有するため)。
+
+        - peek(*args, **kwargs): 呼び出さずに (ヒットしたか, 値) を返す
+        - prime(value, *args, ttl=None, **kwargs): その引数の呼び出し結果として値を登録する
+
+    Args:
+        endpoint: 統計とキーに使うエンドポイント名
+        ttl: TTL 秒数、または引数から TTL を返す関数。
+            省略時は CACHE_TTLS[endpoint]
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def resolve_ttl(args, kwargs) -> float:
+            if ttl is None:
+                return CACHE_TTLS[endpoint]
+            if callable(ttl):
+                return ttl(*args, **kwargs)
+            return ttl
+
+        def peek(*args, **kwargs) -> tuple[bool, Any]:
+            return _cache.get(endpoint, make_call_key(endpoint, signature, args, kwargs))
+
+        def prime(value: Any, *args, ttl: float | None = None, **kwargs) -> None:
+            key = make_call_key(endpoint, signature, args, kwargs)
+            _cache.set(key, value, resolve_ttl(args, kwargs) if ttl is None else ttl)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = make_call_key(endpoint, signature, args, kwargs)
+                hit, value = await _run(_cache.get, endpoint, key)
+                if hit:
+                    return value
+
+                async def load():
+                    result = await func(*args, **kwargs)
+                    if _is_cacheable(result):
+                        await _run(_cache.set, key, result, resolve_ttl(args, kwargs))
+                    return result
+
+                return await _flight.do_async(endpoint, key, load)
+
+            async_wrapper.peek = peek
+            async_wrapper.prime = prime
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_call_key(endpoint, signature, args, kwargs)
+            hit, value = _cache.get(endpoint, key)
+            if hit:
+                return value
+
+            def load():
+                result = func(*args, **kwargs)
+                if _is_cacheable(result):
+                    _cache.set(key, result, resolve_ttl(args, kwargs))
+                return result
+
+            return _flight.do(endpoint, key, load)
+
+        wrapper.peek = peek
+        wrapper.prime = prime
+        return wrapper
+
+    return decorator
+
+
+def get_cache_stats() -> dict:
+    """エンドポイントごとのキャッシュ統計を返す。"""
+    return _cache.stats()
+
+
+def reset_cache_stats() -> None:
+    """キャッシュ統計をリセットする。"""
+    _cache.reset_stats()
+
+
+def clear_cache() -> None:
+    """キャッシュの内容をすべて削除する。"""
+    _cache.clear()
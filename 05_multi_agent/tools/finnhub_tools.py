@@ -1,25 +1,59 @@
 """Finnhub API ツール。
 
 株価、企業情報、マーケットニュース、ソーシャルセンチメントを取得する。
+複数銘柄の株価・企業情報・財務指標は表形式で一括取得できる。
 無料枠: 60 req/min
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-
-import requests
-
-from ..config.settings import FINNHUB_API_KEY, FINNHUB_BASE_URL
+from typing import Callable
+
+from ..config.settings import (
+    FINNHUB_API_KEY,
+    FINNHUB_BASE_URL,
+    FINNHUB_MAX_CONCURRENCY,
+    NEWS_MAX_CANDIDATES,
+)
+from . import json_stream, quote_stream, social_signals
+from .cache import cached, quote_ttl
+from .http_client import http_get, http_stream
+from .news_dedup import dedupe_articles
+from .news_rank import rank_articles
+from .rate_limiter import acquire
+from .records import Article, Quote, Record
 
 
 def _finnhub_get(endpoint: str, params: dict | None = None) -> dict:
     """Finnhub API への GET リクエストを実行する。"""
     params = params or {}
     params["token"] = FINNHUB_API_KEY
-    resp = requests.get(f"{FINNHUB_BASE_URL}{endpoint}", params=params, timeout=10)
+    acquire("finnhub")
+    resp = http_get(f"{FINNHUB_BASE_URL}{endpoint}", params=params)
     resp.raise_for_status()
     return resp.json()
 
 
+def _finnhub_get_list(
+    endpoint: str, params: dict, project: Callable[[dict], Article]
+) -> list[Article]:
+    """配列を返す Finnhub API を逐次パースし、先頭 NEWS_MAX_CANDIDATES 件を射影して返す。
+
+    見出しのない要素は件数に数えない。配列以外のレスポンスは空リストとして扱う。
+    """
+    params = {**params, "token": FINNHUB_API_KEY}
+    acquire("finnhub")
+    with http_stream(f"{FINNHUB_BASE_URL}{endpoint}", params=params) as resp:
+        resp.raise_for_status()
+        items = json_stream.parse_list(
+            resp.iter_content(chunk_size=None),
+            max_items=NEWS_MAX_CANDIDATES,
+            project=project,
+            accept=_has_headline,
+        )
+    return items if isinstance(items, list) else []
+
+
 def get_stock_quote(symbol: str) -> dict:
     """リアルタイム株価を取得する。
 
@@ -29,20 +63,43 @@ def get_stock_quote(symbol: str) -> dict:
     Returns:
         現在の株価情報 (価格, 変動率, 高値, 安値, 出来高等)
     """
+    return _quote(symbol).to_dict()
+
+
+def _quote(symbol: str) -> Quote:
+    """購読中の銘柄はブックから、それ以外は REST から株価を返す。"""
+    streamed = quote_stream.get_streamed_quote(symbol)
+    if streamed is not None:
+        return streamed
+    quote = _fetch_quote(symbol)
+    quote_stream.seed_quote(quote)
+    # 購読銘柄は受信済みの約定を反映したブックの値を返す
+    return quote_stream.get_streamed_quote(symbol) or quote
+
+
+@cached("quote", ttl=quote_ttl)
+def _fetch_quote(symbol: str) -> Quote:
+    """/quote を REST で取得する (ストリーム未購読・切断時の経路)。"""
     data = _finnhub_get("/quote", {"symbol": symbol.upper()})
-    return {
-        "symbol": symbol.upper(),
-        "current_price": data.get("c"),
-        "change": data.get("d"),
-        "percent_change": data.get("dp"),
-        "high": data.get("h"),
-        "low": data.get("l"),
-        "open": data.get("o"),
-        "previous_close": data.get("pc"),
-        "timestamp": data.get("t"),
-    }
+    return _parse_quote(symbol, data)
+
+
+def _parse_quote(symbol: str, data: dict) -> Quote:
+    """/quote のレスポンスを Quote に変換する。"""
+    return Quote(
+        symbol.upper(),
+        current_price=data.get("c"),
+        change=data.get("d"),
+        percent_change=data.get("dp"),
+        high=data.get("h"),
+        low=data.get("l"),
+        open=data.get("o"),
+        previous_close=data.get("pc"),
+        timestamp=data.get("t"),
+    )
 
 
+@cached("profile")
 def get_company_profile(symbol: str) -> dict:
     """企業のプロフィール情報を取得する。
 
@@ -53,6 +110,11 @@ def get_company_profile(symbol: str) -> dict:
         企業名, 業種, 時価総額, IPO日等の企業情報
     """
     data = _finnhub_get("/stock/profile2", {"symbol": symbol.upper()})
+    return _parse_profile(symbol, data)
+
+
+def _parse_profile(symbol: str, data: dict) -> dict:
+    """/stock/profile2 のレスポンスをツール出力の形式に変換する。"""
     return {
         "symbol": symbol.upper(),
         "name": data.get("name"),
@@ -66,6 +128,7 @@ def get_company_profile(symbol: str) -> dict:
     }
 
 
+@cached("metric")
 def get_basic_financials(symbol: str) -> dict:
     """企業の主要財務指標を取得する。
 
@@ -76,6 +139,11 @@ def get_basic_financials(symbol: str) -> dict:
         PER, PBR, 配当利回り, ROE, 52週高値/安値 等の財務指標
     """
     data = _finnhub_get("/stock/metric", {"symbol": symbol.upper(), "metric": "all"})
+    return _parse_financials(symbol, data)
+
+
+def _parse_financials(symbol: str, data: dict) -> dict:
+    """/stock/metric のレスポンスをツール出力の形式に変換する。"""
     metric = data.get("metric", {})
     return {
         "symbol": symbol.upper(),
@@ -92,38 +160,107 @@ def get_basic_financials(symbol: str) -> dict:
     }
 
 
-def get_market_news(category: str = "general", limit: int = 10) -> dict:
+def get_market_news(category: str = "general", limit: int = 10, symbol: str = "") -> dict:
     """マーケットニュースを取得する。
 
+    symbol を指定すると、その銘柄のティッカー・企業名に関連する記事だけを
+    関連度順に返す (関連する記事がなければ空)。
+
     Args:
         category: ニュースカテゴリ ("general", "forex", "crypto", "merger")
         limit: 取得件数 (最大50)
+        symbol: 関連度で絞り込む銘柄のティッカー (省略時は新しい順)
 
     Returns:
         最新のマーケットニュース記事のリスト
     """
-    data = _finnhub_get("/news", {"category": category})
-    articles = data[:limit] if isinstance(data, list) else []
+    return _market_news_result(category, _market_news_articles(category, limit, symbol))
+
+
+def _market_news_articles(category: str, limit: int, symbol: str = "") -> list[Article]:
+    """get_market_news の記事 (symbol 指定時は関連する記事を関連度順) を返す。"""
+    articles = _fetch_market_news(category)
+    if symbol:
+        articles = _rank_news(articles, symbol, _company_name(symbol), limit, require_match=True)
+    return articles[:limit]
+
+
+@cached("market_news")
+def _fetch_market_news(category: str) -> list[Article]:
+    """/news を取得し、近似重複をまとめた記事リストを返す (新しい順)。"""
+    return dedupe_articles(_finnhub_get_list("/news", {"category": category}, _article))
+
+
+def _has_headline(article: dict) -> bool:
+    """見出しのある記事か判定する。"""
+    return isinstance(article, dict) and bool(article.get("headline"))
+
+
+def _article(a: dict) -> Article:
+    """/news, /company-news の記事を Article に射影する。"""
+    return Article(
+        a.get("headline"),
+        (a.get("summary") or "")[:300],
+        a.get("source"),
+        a.get("url"),
+        timestamp=a.get("datetime"),
+        related=a.get("related"),
+    )
+
+
+# ツール出力のキー → Article の属性
+_MARKET_NEWS_FIELDS = {
+    "headline": "headline",
+    "summary": "summary",
+    "source": "source",
+    "url": "url",
+    "datetime": "timestamp",
+    "related": "related",
+}
+_COMPANY_NEWS_FIELDS = {k: v for k, v in _MARKET_NEWS_FIELDS.items() if k != "related"}
+
+
+def _market_news_result(category: str, articles: list[Article]) -> dict:
+    """get_market_news の結果を組み立てる。"""
     return {
         "category": category,
         "count": len(articles),
-        "articles": [
-            {
-                "headline": a.get("headline"),
-                "summary": a.get("summary", "")[:300],
-                "source": a.get("source"),
-                "url": a.get("url"),
-                "datetime": a.get("datetime"),
-                "related": a.get("related"),
-            }
-            for a in articles
-        ],
+        "articles": [a.to_dict(_MARKET_NEWS_FIELDS) for a in articles],
     }
 
 
+def _company_name(symbol: str) -> str | None:
+    """関連度の計算に使う企業名を返す (プロフィールのキャッシュを利用)。"""
+    try:
+        return get_company_profile(symbol).get("name")
+    except Exception:
+        return None
+
+
+def _rank_news(
+    articles: list[Article],
+    symbol: str,
+    company_name: str | None,
+    limit: int,
+    require_match: bool = False,
+) -> list[Article]:
+    """Finnhub の記事をティッカー・企業名との関連度 (BM25) 順に上位 limit 件に絞る。"""
+    return rank_articles(
+        articles,
+        lambda a: a.headline,
+        lambda a: f"{a.summary or ''} {a.related or ''}",
+        symbol,
+        company_name,
+        top_k=limit,
+        require_match=require_match,
+    )
+
+
 def get_company_news(symbol: str, days: int = 7, limit: int = 10) -> dict:
     """特定企業に関するニュースを取得する。
 
+    記事はティッカー・企業名との関連度順に並べ、上位 limit 件を返す。
+
     Args:
         symbol: ティッカーシンボル (例: "AAPL")
         days: 過去何日分のニュースを取得するか (デフォルト: 7)
@@ -132,67 +269,192 @@ def get_company_news(symbol: str, days: int = 7, limit: int = 10) -> dict:
     Returns:
         対象企業に関するニュース記事のリスト
     """
+    return _company_news_result(symbol, days, _company_news_articles(symbol, days, limit))
+
+
+def _company_news_articles(symbol: str, days: int, limit: int) -> list[Article]:
+    """get_company_news の記事 (関連度順) を返す。"""
+    articles = _fetch_company_news(symbol, days)
+    return _rank_news(articles, symbol, _company_name(symbol), limit)
+
+
+@cached("company_news")
+def _fetch_company_news(symbol: str, days: int) -> list[Article]:
+    """/company-news を取得し、近似重複をまとめた記事リストを返す (新しい順)。"""
+    from_date, to_date = _news_date_range(days)
+    return dedupe_articles(_finnhub_get_list(
+        "/company-news",
+        {"symbol": symbol.upper(), "from": from_date, "to": to_date},
+        _article,
+    ))
+
+
+def _news_date_range(days: int) -> tuple[str, str]:
+    """過去 days 日分の (from, to) 日付文字列を返す。"""
     today = datetime.now()
     from_date = (today - timedelta(days=days)).strftime("%Y-%m-%d")
     to_date = today.strftime("%Y-%m-%d")
+    return from_date, to_date
 
-    data = _finnhub_get(
-        "/company-news",
-        {"symbol": symbol.upper(), "from": from_date, "to": to_date},
-    )
-    articles = data[:limit] if isinstance(data, list) else []
+
+def _company_news_result(symbol: str, days: int, articles: list[Article]) -> dict:
+    """get_company_news の結果を組み立てる。"""
+    from_date, to_date = _news_date_range(days)
     return {
         "symbol": symbol.upper(),
         "period": f"{from_date} ~ {to_date}",
         "count": len(articles),
-        "articles": [
-            {
-                "headline": a.get("headline"),
-                "summary": a.get("summary", "")[:300],
-                "source": a.get("source"),
-                "url": a.get("url"),
-                "datetime": a.get("datetime"),
-            }
-            for a in articles
-        ],
+        "articles": [a.to_dict(_COMPANY_NEWS_FIELDS) for a in articles],
     }
 
 
-def get_social_sentiment(symbol: str) -> dict:
+@cached("social_sentiment")
+def get_social_sentiment(symbol: str, days: int = 7) -> dict:
     """ソーシャルメディア上のセンチメントデータを取得する。
 
+    時間バケットごとのメンション数を時系列のまま分析し、メンション速度・
+    z スコア・ポジティブ/ネガティブの乖離から異常 (急増・急減・センチメント変化) を検出する。
+
     Args:
         symbol: ティッカーシンボル (例: "AAPL")
+        days: 過去何日分のバケットを分析するか (デフォルト: 7)
 
     Returns:
-        Reddit/Twitter でのメンション数、ポジティブ/ネガティブスコア
+        Reddit/Twitter でのメンション数、ポジティブ/ネガティブスコア、
+        最新バケットの指標、直近バケットの表、検出した異常
     """
-    data = _finnhub_get("/stock/social-sentiment", {"symbol": symbol.upper()})
-    reddit_data = data.get("reddit", [])
-    twitter_data = data.get("twitter", [])
-
-    def summarize(entries: list) -> dict:
-        if not entries:
-            return {"mentions": 0, "positive_score": 0, "negative_score": 0}
-        total_mentions = sum(e.get("mention", 0) for e in entries)
-        avg_positive = (
-            sum(e.get("positiveScore", 0) for e in entries) / len(entries)
-            if entries
-            else 0
-        )
-        avg_negative = (
-            sum(e.get("negativeScore", 0) for e in entries) / len(entries)
-            if entries
-            else 0
-        )
-        return {
-            "mentions": total_mentions,
-            "positive_score": round(avg_positive, 4),
-            "negative_score": round(avg_negative, 4),
-        }
+    from_date, to_date = _news_date_range(days)
+    data = _finnhub_get(
+        "/stock/social-sentiment",
+        {"symbol": symbol.upper(), "from": from_date, "to": to_date},
+    )
+    return _parse_social_sentiment(symbol, data)
+
+
+# 結果の anomalies (プラットフォーム横断) に含める件数の上限
+_MAX_ANOMALIES = 10
+
 
+def _parse_social_sentiment(symbol: str, data: dict) -> dict:
+    """/stock/social-sentiment のレスポンスをツール出力の形式に変換する。"""
+    platforms = {
+        name: social_signals.summarize(data.get(name) or [])
+        for name in ("reddit", "twitter")
+    }
+    # 異常はプラットフォーム横断で新しい順にまとめる
+    anomalies = []
+    for name, summary in platforms.items():
+        anomalies.extend({"platform": name, **a} for a in summary.pop("anomalies"))
+    anomalies.sort(key=lambda a: a["time"], reverse=True)
     return {
         "symbol": symbol.upper(),
-        "reddit": summarize(reddit_data),
-        "twitter": summarize(twitter_data),
+        **platforms,
+        "anomalies": anomalies[:_MAX_ANOMALIES],
     }
+
+
+# バッチ版ツールの列 (ロゴ・URL 等の比較に不要な項目は省く)
+QUOTE_COLUMNS = [
+    "symbol", "current_price", "change", "percent_change",
+    "high", "low", "open", "previous_close",
+]
+PROFILE_COLUMNS = ["symbol", "name", "industry", "market_cap", "country", "exchange", "ipo_date"]
+FINANCIALS_COLUMNS = [
+    "symbol", "pe_ratio", "pb_ratio", "dividend_yield", "roe", "roa",
+    "eps_ttm", "revenue_growth_ttm", "week_52_high", "week_52_low", "beta",
+]
+
+
+def get_stock_quotes(symbols: str) -> dict:
+    """複数銘柄の株価を一括で取得する。
+
+    同業他社との比較など複数銘柄を見る場合は、get_stock_quote を
+    銘柄ごとに呼ぶ代わりにこのツールを 1 回呼ぶ。
+
+    Args:
+        symbols: カンマ区切りのティッカーシンボル (例: "AAPL,MSFT,GOOGL")
+
+    Returns:
+        columns と rows からなる株価の表 (取得できなかった銘柄は errors)
+    """
+    symbol_list = _split_symbols(symbols)
+    return _build_table(symbol_list, _fetch_symbols(_quote, symbol_list), QUOTE_COLUMNS)
+
+
+def get_company_profiles(symbols: str) -> dict:
+    """複数銘柄の企業プロフィールを一括で取得する。
+
+    Args:
+        symbols: カンマ区切りのティッカーシンボル (例: "AAPL,MSFT,GOOGL")
+
+    Returns:
+        columns と rows からなる企業名・業種・時価総額等の表
+    """
+    symbol_list = _split_symbols(symbols)
+    return _build_table(
+        symbol_list, _fetch_symbols(get_company_profile, symbol_list), PROFILE_COLUMNS
+    )
+
+
+def get_basic_financials_batch(symbols: str) -> dict:
+    """複数銘柄の主要財務指標を一括で取得する。
+
+    Args:
+        symbols: カンマ区切りのティッカーシンボル (例: "AAPL,MSFT,GOOGL")
+
+    Returns:
+        columns と rows からなる PER, PBR, ROE 等の表
+    """
+    symbol_list = _split_symbols(symbols)
+    return _build_table(
+        symbol_list, _fetch_symbols(get_basic_financials, symbol_list), FINANCIALS_COLUMNS
+    )
+
+
+def _split_symbols(symbols: str) -> list[str]:
+    """カンマ区切りのティッカーを重複のない大文字のリストにする。"""
+    return list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+
+
+def _fetch_symbols(
+    fetch: Callable[[str], dict | Record], symbols: list[str]
+) -> dict[str, dict | Record | Exception]:
+    """銘柄ごとの取得を FINNHUB_MAX_CONCURRENCY 件ずつ並行実行する。
+
+    レート制限は各リクエストの acquire("finnhub") で共有される。
+
+    Returns:
+        {symbol: ツールの結果、または発生した例外}
+    """
+    fetched: dict[str, dict | Record | Exception] = {}
+    if not symbols:
+        return fetched
+    with ThreadPoolExecutor(max_workers=min(FINNHUB_MAX_CONCURRENCY, len(symbols))) as pool:
+        futures = {symbol: pool.submit(fetch, symbol) for symbol in symbols}
+    for symbol, future in futures.items():
+        try:
+            fetched[symbol] = future.result()
+        except Exception as e:
+            fetched[symbol] = e
+    return fetched
+
+
+def _build_table(
+    symbols: list[str], fetched: dict[str, dict | Record | Exception], columns: list[str]
+) -> dict:
+    """銘柄ごとの結果を columns / rows の表にまとめる。"""
+    rows = []
+    errors = {}
+    for symbol in symbols:
+        result = fetched[symbol]
+        if isinstance(result, Exception):
+            errors[symbol] = str(result)
+            continue
+        if isinstance(result, Record):
+            rows.append(result.values(columns))
+        else:
+            rows.append([result.get(column) for column in columns])
+    table = {"columns": columns, "rows": rows, "count": len(rows)}
+    if errors:
+        table["errors"] = errors
+    return table
@@ -0,0 +1,140 @@
+"""FRED 観測値のローカルストア。
+
+シリーズごとの観測値を SQLite に保存し、差分だけを FRED API から取得する。
+系列の更新頻度から次の観測値が出ていないと判断できる間はローカルデータのみで
+応答するため、大量銘柄のバッチでもマクロ指標の取得はほぼ通信なしで済む。
+
+    - 初回 (または保存件数より多く要求された場合): 直近 N 件を遡って取得
+    - 以降: 最新観測日 + 更新周期を過ぎていれば、最新観測日以降のみ取得
+    - 再確認は FRED_TTL_BY_FREQUENCY の間隔で間引く (公表遅れへの対策)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+
+from ..config.settings import FRED_STORE_BACKFILL, FRED_STORE_DB, FRED_TTL_BY_FREQUENCY
+from .records import Observation
+
+# 観測値の間隔 (日)。月次・四半期は短い月を考慮して控えめに見積もる
+_PERIOD_DAYS = {
+    "daily": 1,
+    "weekly": 7,
+    "monthly": 28,
+    "quarterly": 89,
+}
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    """スレッドごとの SQLite 接続を返す。"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(FRED_STORE_DB) or ".", exist_ok=True)
+        conn = sqlite3.connect(FRED_STORE_DB, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS observations ("
+            "series_id TEXT NOT NULL, date TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (series_id, date))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS series ("
+            "series_id TEXT PRIMARY KEY, latest_date TEXT, "
+            "backfill INTEGER NOT NULL, last_checked REAL NOT NULL)"
+        )
+        _local.conn = conn
+    return conn
+
+
+def _is_due(latest_date: str | None, last_checked: float, frequency: str) -> bool:
+    """新しい観測値が公表されている可能性があるか判定する。"""
+    min_interval = FRED_TTL_BY_FREQUENCY.get(frequency, FRED_TTL_BY_FREQUENCY["daily"])
+    if time.time() - last_checked < min_interval:
+        return False
+    if latest_date is None:
+        return True
+    period = timedelta(days=_PERIOD_DAYS.get(frequency, 1))
+    return date.fromisoformat(latest_date) + period <= date.today()
+
+
+def refresh_params(series_id: str, limit: int, frequency: str) -> dict | None:
+    """API から取得すべき範囲のクエリパラメータを返す。
+
+    ローカルデータだけで応答できる場合は None を返す。
+
+    Args:
+        series_id: FRED シリーズ ID
+        limit: 呼び出し元が必要とする観測値の件数
+        frequency: シリーズの更新頻度 ("daily", "weekly", "monthly", "quarterly")
+
+    Returns:
+        /series/observations に上書きするパラメータ、または None
+    """
+    row = _connect().execute(
+        "SELECT latest_date, backfill, last_checked FROM series WHERE series_id = ?",
+        (series_id,),
+    ).fetchone()
+    if row is None or limit > row[1]:
+        return {"sort_order": "desc", "limit": max(limit, FRED_STORE_BACKFILL)}
+    latest_date, _, last_checked = row
+    if not _is_due(latest_date, last_checked, frequency):
+        return None
+    # 最新観測日も含めて取得し、改定値を反映する
+    params = {"sort_order": "asc", "limit": 100000}
+    if latest_date:
+        params["observation_start"] = latest_date
+    return params
+
+
+def save(series_id: str, observations: list[dict], params: dict) -> None:
+    """取得した観測値を保存し、シリーズのメタ情報を更新する。"""
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(
+            "INSERT OR REPLACE INTO observations (series_id, date, value) VALUES (?, ?, ?)",
+            [
+                (series_id, obs["date"], obs.get("value", "."))
+                for obs in observations
+                if obs.get("date")
+            ],
+        )
+        latest = conn.execute(
+            "SELECT MAX(date) FROM observations WHERE series_id = ?", (series_id,)
+        ).fetchone()[0]
+        row = conn.execute(
+            "SELECT backfill FROM series WHERE series_id = ?", (series_id,)
+        ).fetchone()
+        backfill = row[0] if row else 0
+        if params.get("sort_order") == "desc":
+            backfill = max(backfill, params["limit"])
+        conn.execute(
+            "INSERT OR REPLACE INTO series (series_id, latest_date, backfill, last_checked) "
+            "VALUES (?, ?, ?, ?)",
+            (series_id, latest, backfill, time.time()),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def load(series_id: str, limit: int) -> list[Observation]:
+    """保存済みの観測値を新しい順に返す (欠損値 "." は None)。"""
+    rows = _connect().execute(
+        "SELECT date, value FROM observations WHERE series_id = ? "
+        "ORDER BY date DESC LIMIT ?",
+        (series_id, limit),
+    ).fetchall()
+    return [Observation(d, float(v) if v != "." else None) for d, v in rows]
+
+
+def clear() -> None:
+    """保存済みの観測値とメタ情報をすべて削除する。"""
+    conn = _connect()
+    conn.execute("DELETE FROM observations")
+    conn.execute("DELETE FROM series")
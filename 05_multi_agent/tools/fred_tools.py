@@ -4,11 +4,19 @@
 無料枠: 完全無料 (120 req/min)
 """
 
-import requests
+from concurrent.futures import ThreadPoolExecutor
 
-from ..config.settings import FRED_API_KEY
-
-FRED_BASE_URL = "https://api.stlouisfed.org/fred"
+from ..config.settings import (
+    FRED_API_KEY,
+    FRED_BASE_URL,
+    FRED_MAX_CONCURRENCY,
+    FRED_TTL_BY_FREQUENCY,
+)
+from . import fred_store, macro_metrics
+from .cache import cached
+from .http_client import http_get
+from .rate_limiter import acquire
+from .records import Observation
 
 # 主要な経済指標のマスタ定義
 INDICATOR_SERIES = {
@@ -16,7 +24,7 @@ INDICATOR_SERIES = {
     "gdp_growth": {"series_id": "A191RL1Q225SBEA", "name": "GDP 成長率 (%)", "frequency": "quarterly"},
     "unemployment_rate": {"series_id": "UNRATE", "name": "失業率 (%)", "frequency": "monthly"},
     "cpi": {"series_id": "CPIAUCSL", "name": "消費者物価指数 (CPI)", "frequency": "monthly"},
-    "cpi_yoy": {"series_id": "CPIAUCSL", "name": "CPI 前年比", "frequency": "monthly"},
+    "cpi_yoy": {"series_id": "CPIAUCSL", "name": "CPI 前年比 (%)", "frequency": "monthly", "transform": "yoy"},
     "fed_funds_rate": {"series_id": "FEDFUNDS", "name": "FF 金利 (%)", "frequency": "monthly"},
     "treasury_10y": {"series_id": "DGS10", "name": "10年国債利回り (%)", "frequency": "daily"},
     "treasury_2y": {"series_id": "DGS2", "name": "2年国債利回り (%)", "frequency": "daily"},
@@ -26,79 +34,206 @@ INDICATOR_SERIES = {
     "consumer_sentiment": {"series_id": "UMCSENT", "name": "ミシガン大消費者信頼感指数", "frequency": "monthly"},
 }
 
+# get_economic_indicators で一括取得する指標
+KEY_INDICATORS = [
+    "gdp_growth",
+    "unemployment_rate",
+    "cpi",
+    "fed_funds_rate",
+    "treasury_10y",
+    "vix",
+    "consumer_sentiment",
+]
+
+# get_derived_economic_metrics で既定で計算する指標
+DERIVED_INDICATORS = [
+    "cpi",
+    "unemployment_rate",
+    "fed_funds_rate",
+    "treasury_10y",
+    "treasury_2y",
+    "vix",
+]
+
+
+def _series_frequency(series_id: str) -> str:
+    """INDICATOR_SERIES からシリーズの更新頻度を返す (未登録は daily 扱い)。"""
+    for info in INDICATOR_SERIES.values():
+        if info["series_id"] == series_id:
+            return info["frequency"]
+    return "daily"
+
 
-def _fred_get_latest(series_id: str, limit: int = 1) -> dict:
-    """FRED API から指定シリーズの最新データを取得する。"""
-    resp = requests.get(
-        f"{FRED_BASE_URL}/series/observations",
-        params={
-            "series_id": series_id,
-            "api_key": FRED_API_KEY,
-            "file_type": "json",
-            "sort_order": "desc",
-            "limit": limit,
-        },
-        timeout=10,
+def _series_ttl(series_id: str, limit: int = 1) -> float:
+    """シリーズの更新頻度に応じたキャッシュ TTL を返す。"""
+    return FRED_TTL_BY_FREQUENCY.get(
+        _series_frequency(series_id), FRED_TTL_BY_FREQUENCY["daily"]
     )
-    resp.raise_for_status()
-    return resp.json()
 
 
-def get_economic_indicators() -> dict:
+@cached("fred_observations", ttl=_series_ttl)
+def _fred_get_latest(series_id: str, limit: int = 1) -> list[Observation]:
+    """指定シリーズの最新データを取得する。
+
+    ローカルストアに保存済みの観測値を返し、新しい観測値が公表されている
+    可能性がある場合のみ FRED API から差分を取得する。
+    """
+    params = fred_store.refresh_params(series_id, limit, _series_frequency(series_id))
+    if params is not None:
+        acquire("fred")
+        resp = http_get(
+            f"{FRED_BASE_URL}/series/observations",
+            params={**_observation_params(series_id, limit), **params},
+        )
+        resp.raise_for_status()
+        fred_store.save(series_id, resp.json().get("observations", []), params)
+    return fred_store.load(series_id, limit)
+
+
+def _observation_params(series_id: str, limit: int) -> dict:
+    """/series/observations のクエリパラメータを組み立てる。"""
+    return {
+        "series_id": series_id,
+        "api_key": FRED_API_KEY,
+        "file_type": "json",
+        "sort_order": "desc",
+        "limit": limit,
+    }
+
+
+def get_economic_indicators(indicators: str = "") -> dict:
     """米国の主要経済指標の最新値を一括取得する。
 
     GDP成長率、失業率、CPI、FF金利、10年国債利回り、VIX 等を返す。
+    各シリーズは並行して取得し、一部が失敗してもその指標だけを error とする。
+
+    Args:
+        indicators: カンマ区切りの指標キー (例: "gdp,treasury_2y,sp500")。
+            省略時は主要 7 指標。指定可能なキー: gdp, gdp_growth,
+            unemployment_rate, cpi, cpi_yoy, fed_funds_rate, treasury_10y,
+            treasury_2y, sp500, vix, initial_claims, consumer_sentiment
 
     Returns:
         主要経済指標の最新値と日付を含む辞書
     """
     if not FRED_API_KEY:
-        return {
-            "error": "FRED API key not configured (FRED_API_KEY). Skipping economic indicators.",
-            "indicators": {},
-        }
+        return _indicators_not_configured()
 
-    key_indicators = [
-        "gdp_growth",
-        "unemployment_rate",
-        "cpi",
-        "fed_funds_rate",
-        "treasury_10y",
-        "vix",
-        "consumer_sentiment",
-    ]
+    keys = _resolve_indicators(indicators)
+    fetched = _fetch_series(_series_requests(keys))
+    return {"indicators": _build_indicators(keys, fetched)}
 
-    results = {}
-    for key in key_indicators:
-        info = INDICATOR_SERIES[key]
+
+def _fetch_series(requests: dict[str, int]) -> dict[str, list[Observation] | Exception]:
+    """複数シリーズを FRED_MAX_CONCURRENCY 件ずつ並行取得する。
+
+    Args:
+        requests: {series_id: 取得件数}
+
+    Returns:
+        {series_id: 観測値 (新しい順)、または発生した例外}
+    """
+    fetched: dict[str, list[Observation] | Exception] = {}
+    if not requests:
+        return fetched
+    with ThreadPoolExecutor(max_workers=min(FRED_MAX_CONCURRENCY, len(requests))) as pool:
+        futures = {
+            sid: pool.submit(_fred_get_latest, sid, limit)
+            for sid, limit in requests.items()
+        }
+    for sid, future in futures.items():
         try:
-            data = _fred_get_latest(info["series_id"])
-            observations = data.get("observations", [])
-            if observations:
-                latest = observations[0]
-                value = latest.get("value", ".")
-                results[key] = {
-                    "name": info["name"],
-                    "value": float(value) if value != "." else None,
-                    "date": latest.get("date"),
-                    "frequency": info["frequency"],
-                }
-            else:
-                results[key] = {
-                    "name": info["name"],
-                    "value": None,
-                    "date": None,
-                    "frequency": info["frequency"],
-                }
+            fetched[sid] = future.result()
         except Exception as e:
-            results[key] = {
-                "name": info["name"],
-                "value": None,
-                "date": None,
-                "error": str(e),
-            }
+            fetched[sid] = e
+    return fetched
+
+
+def _resolve_indicators(indicators: str) -> list[str]:
+    """カンマ区切りの指標キーをリストにする (空なら KEY_INDICATORS)。"""
+    keys = [k.strip() for k in indicators.split(",") if k.strip()]
+    return keys or list(KEY_INDICATORS)
+
+
+def _series_requests(keys: list[str], window: int = 0) -> dict[str, int]:
+    """指標キーから {series_id: 取得件数} を作る (cpi と cpi_yoy 等は 1 回に統合)。
 
-    return {"indicators": results}
+    前年比の計算が必要な指標は 1 年分 + window 件を取得する。
+    """
+    requests: dict[str, int] = {}
+    for key in keys:
+        info = INDICATOR_SERIES.get(key)
+        if info is None:
+            continue
+        limit = 1
+        if window or info.get("transform") == "yoy":
+            limit = macro_metrics.PERIODS_PER_YEAR.get(info["frequency"], 1) + window + 1
+        requests[info["series_id"]] = max(limit, requests.get(info["series_id"], 0))
+    return requests
+
+
+def _build_indicators(
+    keys: list[str], fetched: dict[str, list[Observation] | Exception]
+) -> dict:
+    """シリーズごとの取得結果から指標キーごとのエントリを組み立てる。"""
+    results = {}
+    for key in keys:
+        info = INDICATOR_SERIES.get(key)
+        if info is None:
+            results[key] = _indicator_error(
+                {"name": key}, ValueError(f"Unknown indicator key: {key}")
+            )
+            continue
+        data = fetched[info["series_id"]]
+        if isinstance(data, Exception):
+            results[key] = _indicator_error(info, data)
+        else:
+            results[key] = _parse_indicator(info, data)
+    return results
+
+
+def _indicators_not_configured() -> dict:
+    """API キー未設定時の get_economic_indicators の結果を返す。"""
+    return {
+        "error": "FRED API key not configured (FRED_API_KEY). Skipping economic indicators.",
+        "indicators": {},
+    }
+
+
+def _parse_indicator(info: dict, observations: list[Observation]) -> dict:
+    """最新 1 件の観測値を指標エントリに変換する。"""
+    if info.get("transform") == "yoy":
+        summary = macro_metrics.summarize(observations)
+        return {
+            "name": info["name"],
+            "value": summary.get("yoy_pct"),
+            "date": summary["date"],
+            "frequency": info["frequency"],
+        }
+    if observations:
+        latest = observations[0]
+        return {
+            "name": info["name"],
+            "value": latest.value,
+            "date": latest.date,
+            "frequency": info["frequency"],
+        }
+    return {
+        "name": info["name"],
+        "value": None,
+        "date": None,
+        "frequency": info["frequency"],
+    }
+
+
+def _indicator_error(info: dict, error: Exception) -> dict:
+    """取得に失敗した指標のエントリを返す。"""
+    return {
+        "name": info["name"],
+        "value": None,
+        "date": None,
+        "error": str(error),
+    }
 
 
 def get_economic_series(
@@ -116,24 +251,89 @@ def get_economic_series(
         指定シリーズの直近データポイントのリスト
     """
     if not FRED_API_KEY:
-        return {
-            "error": "FRED API key not configured (FRED_API_KEY). Skipping economic series.",
-            "series_id": series_id,
-            "count": 0,
-            "observations": [],
-        }
+        return _series_not_configured(series_id)
+
+    observations = _fred_get_latest(series_id, limit=observation_count)
+    return _parse_series(series_id, observations)
+
 
-    data = _fred_get_latest(series_id, limit=observation_count)
-    observations = data.get("observations", [])
+def _series_not_configured(series_id: str) -> dict:
+    """API キー未設定時の get_economic_series の結果を返す。"""
+    return {
+        "error": "FRED API key not configured (FRED_API_KEY). Skipping economic series.",
+        "series_id": series_id,
+        "count": 0,
+        "observations": [],
+    }
 
+
+def _parse_series(series_id: str, observations: list[Observation]) -> dict:
+    """観測値リストをツール出力の形式に変換する。"""
     return {
         "series_id": series_id,
         "count": len(observations),
-        "observations": [
-            {
-                "date": obs.get("date"),
-                "value": float(obs["value"]) if obs.get("value", ".") != "." else None,
-            }
-            for obs in observations
-        ],
+        "observations": [obs.to_dict() for obs in observations],
     }
+
+
+def get_derived_economic_metrics(indicators: str = "", window: int = 12) -> dict:
+    """経済指標の派生メトリクスをローカルで計算して返す。
+
+    前年比・前期比・移動平均・z スコアと、10年債-2年債スプレッド
+    (イールドカーブの逆転判定) を 1 回のツール呼び出しでまとめて返す。
+
+    Args:
+        indicators: カンマ区切りの指標キー (例: "cpi,unemployment_rate")。
+            省略時は CPI, 失業率, FF金利, 10年債, 2年債, VIX
+        window: 移動平均・z スコアの窓 (観測数、デフォルト: 12)
+
+    Returns:
+        指標ごとの latest, change_pct, yoy_pct, rolling_mean, zscore, trend と
+        yield_curve (spread_10y_2y) を含む辞書
+    """
+    if not FRED_API_KEY:
+        return _derived_not_configured()
+
+    keys = _resolve_indicators(indicators) if indicators else list(DERIVED_INDICATORS)
+    fetched = _fetch_series(_series_requests(keys, window))
+    return _build_derived(keys, fetched, window)
+
+
+def _derived_not_configured() -> dict:
+    """API キー未設定時の get_derived_economic_metrics の結果を返す。"""
+    return {
+        "error": "FRED API key not configured (FRED_API_KEY). Skipping derived metrics.",
+        "metrics": {},
+    }
+
+
+def _build_derived(
+    keys: list[str], fetched: dict[str, list[Observation] | Exception], window: int
+) -> dict:
+    """取得済みシリーズから派生メトリクスの結果を組み立てる。"""
+    observations: dict[str, list[Observation]] = {}
+    metrics = {}
+    for key in keys:
+        info = INDICATOR_SERIES.get(key)
+        if info is None:
+            metrics[key] = {"name": key, "error": f"Unknown indicator key: {key}"}
+            continue
+        data = fetched[info["series_id"]]
+        if isinstance(data, Exception):
+            metrics[key] = {"name": info["name"], "error": str(data)}
+            continue
+        observations[key] = data
+        metrics[key] = {
+            "name": info["name"],
+            **macro_metrics.summarize(observations[key], window),
+        }
+
+    result = {"window": window, "metrics": metrics}
+    if "treasury_10y" in observations and "treasury_2y" in observations:
+        result["yield_curve"] = {
+            "name": "10年債 - 2年債 スプレッド (%pt)",
+            **macro_metrics.summarize_spread(
+                observations["treasury_10y"], observations["treasury_2y"], window
+            ),
+        }
+    return result
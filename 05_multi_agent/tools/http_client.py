@@ -0,0 +1,260 @@
+"""共有 HTTP トランスポート。
+
+全ツールモジュールが利用する keep-alive 付きコネクションプールを管理する。
+ホストごとにプールを保持し、TCP/TLS ハンドシェイクを呼び出し間で再利用する。
+同期ツールは requests、非同期ツール (tools/aio) は httpx を使用する。
+"""
+
+import asyncio
+import contextlib
+import threading
+import weakref
+from typing import AsyncIterator, Iterator
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from ..config.settings import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_READ_TIMEOUT,
+)
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+# イベントループごとの httpx.AsyncClient (接続はループに紐づくため共有しない)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# ホストごとの接続統計 {host: {"requests": n, "connections_opened": n}}
+_stats: dict[str, dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(host: str, key: str) -> None:
+    """接続統計をスレッドセーフに加算する。"""
+    with _stats_lock:
+        entry = _stats.setdefault(host or "", {"requests": 0, "connections_opened": 0})
+        entry[key] += 1
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    """新規接続の生成回数を記録する HTTP プール。"""
+
+    def _new_conn(self):
+        _record(self.host, "connections_opened")
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    """新規接続の生成回数を記録する HTTPS プール。"""
+
+    def _new_conn(self):
+        _record(self.host, "connections_opened")
+        return super()._new_conn()
+
+
+class _PooledAdapter(HTTPAdapter):
+    """接続統計付きのコネクションプールを使う HTTPAdapter。"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        _record(urlsplit(request.url).hostname, "requests")
+        return super().send(request, **kwargs)
+
+
+def create_session() -> requests.Session:
+    """共有セッションと同じプール設定の requests.Session を新しく生成する。
+
+    セッションのヘッダを書き換えるライブラリ (PRAW 等) には、
+    共有セッションではなくこのセッションを渡す。
+    """
+    session = requests.Session()
+    adapter = _PooledAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    })
+    return session
+
+
+def get_session() -> requests.Session:
+    """プロセス共有の requests.Session を返す。"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def http_get(
+    url: str,
+    params: dict | None = None,
+    timeout: float | tuple[float, float] | None = None,
+) -> requests.Response:
+    """共有セッション経由で GET リクエストを実行する。
+
+    Args:
+        url: リクエスト先 URL
+        params: クエリパラメータ
+        timeout: タイムアウト秒数 (省略時は設定値の (接続, 読み込み))
+
+    Returns:
+        requests.Response
+    """
+    if timeout is None:
+        timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+    return get_session().get(url, params=params, timeout=timeout)
+
+
+@contextlib.contextmanager
+def http_stream(
+    url: str,
+    params: dict | None = None,
+    timeout: float | tuple[float, float] | None = None,
+) -> Iterator[requests.Response]:
+    """共有セッション経由で GET リクエストを実行し、本文を読まずにレスポンスを返す。
+
+    本文は resp.iter_content() で逐次読み込む。本文を最後まで読むと
+    接続はプールに戻り、ブロックを抜けるとレスポンスは閉じられる。
+    """
+    if timeout is None:
+        timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+    resp = get_session().get(url, params=params, timeout=timeout, stream=True)
+    try:
+        yield resp
+    finally:
+        resp.close()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """実行中のイベントループ用の共有 httpx.AsyncClient を返す。"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_CONNECTIONS * HTTP_POOL_MAXSIZE,
+                max_keepalive_connections=HTTP_POOL_MAXSIZE,
+            ),
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def async_http_get(
+    url: str,
+    params: dict | None = None,
+    timeout: float | None = None,
+    headers: dict | None = None,
+) -> httpx.Response:
+    """共有 AsyncClient 経由で GET リクエストを実行する。
+
+    Args:
+        url: リクエスト先 URL
+        params: クエリパラメータ
+        timeout: タイムアウト秒数 (省略時はクライアントの設定値)
+        headers: 追加のリクエストヘッダ
+
+    Returns:
+        httpx.Response
+    """
+    host = urlsplit(url).hostname
+    _record(host, "requests")
+
+    async def trace(event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            _record(host, "connections_opened")
+
+    kwargs = {"timeout": timeout} if timeout is not None else {}
+    return await get_async_client().get(
+        url, params=params, headers=headers, extensions={"trace": trace}, **kwargs
+    )
+
+
+@contextlib.asynccontextmanager
+async def async_http_stream(
+    url: str,
+    params: dict | None = None,
+    timeout: float | None = None,
+    headers: dict | None = None,
+) -> AsyncIterator[httpx.Response]:
+    """共有 AsyncClient 経由で GET リクエストを実行し、本文を読まずにレスポンスを返す。
+
+    本文は resp.aiter_bytes() で逐次読み込む (最後まで読むと接続はプールに戻る)。
+    """
+    host = urlsplit(url).hostname
+    _record(host, "requests")
+
+    async def trace(event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            _record(host, "connections_opened")
+
+    kwargs = {"timeout": timeout} if timeout is not None else {}
+    async with get_async_client().stream(
+        "GET", url, params=params, headers=headers, extensions={"trace": trace}, **kwargs
+    ) as resp:
+        yield resp
+
+
+async def aclose_async_client() -> None:
+    """実行中のイベントループの AsyncClient を閉じる。"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def get_connection_stats() -> dict:
+    """ホストごとの接続統計 (新規接続数と再利用数) を返す。"""
+    with _stats_lock:
+        hosts = {
+            host: {
+                "requests": s["requests"],
+                "connections_opened": s["connections_opened"],
+                "connections_reused": max(s["requests"] - s["connections_opened"], 0),
+            }
+            for host, s in _stats.items()
+        }
+    total_requests = sum(h["requests"] for h in hosts.values())
+    total_opened = sum(h["connections_opened"] for h in hosts.values())
+    return {
+        "requests": total_requests,
+        "connections_opened": total_opened,
+        "connections_reused": max(total_requests - total_opened, 0),
+        "hosts": hosts,
+    }
+
+
+def reset_connection_stats() -> None:
+    """接続統計をリセットする。"""
+    with _stats_lock:
+        _stats.clear()
+
+
+def close_session() -> None:
+    """共有セッションを閉じ、プール内の接続を解放する。"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
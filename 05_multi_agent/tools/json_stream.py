@@ -0,0 +1,193 @@
+"""大きな JSON 配列レスポンスの逐次パース。
+
+Finnhub のニュース API は 7 日分で数百件の記事を 1 つの JSON 配列で返すため、
+全体を resp.json() で読み込むと、使わない記事まで辞書に展開することになる。
+ここではレスポンスのチャンクを受け取りながら配列の要素の境界だけを走査し、
+要素ごとにデコード・射影して、必要な件数に達した時点でパースを打ち切る。
+
+    - 要素のデコードには orjson を使う (未インストールなら標準の json)
+    - 要素の境界は正規表現で候補を探し、デコードできるかで確定する
+      (1 文字ずつの走査をしないため、境界の検出もほぼ C 実装の速度で進む)
+    - 打ち切り後の残りのチャンクは読み捨て、接続はプールに戻す
+    - 先頭が配列でないレスポンス (エラーオブジェクト等) は全体をデコードして返す
+    - 件数の上限に達する前に配列が閉じずにレスポンスが終わった場合 (途中で切れた本文) は
+      resp.json() と同様に ValueError を送出する (読めた分だけを返さない)
+"""
+
+import json
+import re
+from typing import Any, AsyncIterable, Callable, Iterable
+
+try:
+    import orjson
+except ImportError:  # orjson は任意の依存
+    orjson = None
+
+# 要素の区切り (空白とカンマ)
+_SEPARATOR = re.compile(rb"[ \t\r\n,]*")
+# 要素の終わりの候補: 先頭の文字ごとに、閉じ括弧 (スカラーは空白) の直後に , か ] が続く位置
+_ELEMENT_END = {
+    ord("{"): re.compile(rb"\}[ \t\r\n]*(?=[,\]])"),
+    ord("["): re.compile(rb"\][ \t\r\n]*(?=[,\]])"),
+}
+_SCALAR_END = re.compile(rb"[ \t\r\n]*(?=[,\]])")
+_WHITESPACE = b" \t\r\n"
+
+
+def loads(data: bytes | str) -> Any:
+    """JSON をデコードする (orjson があれば orjson を使う)。"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class ArrayScanner:
+    """チャンク単位で受け取った JSON 配列から、要素を 1 つずつデコードして取り出す。
+
+    要素の終わりの候補 (閉じ括弧の直後に , か ] が続く位置) を正規表現で探し、
+    要素の先頭から候補までをデコードする。デコードに失敗した候補 (文字列の中や
+    入れ子の途中) は読み飛ばす。要素の先頭から最初にデコードできた範囲が要素全体になる。
+    """
+
+    def __init__(self):
+        self._buffer = b""
+        self._pos = 0
+        self._start: int | None = None
+        self._search = 0
+        self.is_array: bool | None = None
+        self.done = False
+
+    def feed(self, chunk: bytes) -> list:
+        """チャンクを追加し、完結した要素をデコードして返す。"""
+        self._buffer += chunk
+        if self.is_array is None:
+            head = self._buffer.lstrip(_WHITESPACE)
+            if not head:
+                return []
+            self.is_array = head[:1] == b"["
+            self._pos = len(self._buffer) - len(head) + 1
+        if not self.is_array or self.done:
+            return []
+
+        buffer = self._buffer
+        elements = []
+        while True:
+            if self._start is None:
+                start = _SEPARATOR.match(buffer, self._pos).end()
+                if start >= len(buffer):
+                    self._pos = start
+                    break
+                if buffer[start] == ord("]"):
+                    self.done = True
+                    break
+                self._start = self._search = start
+            pattern = _ELEMENT_END.get(buffer[self._start], _SCALAR_END)
+            for match in pattern.finditer(buffer, self._search):
+                try:
+                    elements.append(loads(buffer[self._start:match.end()]))
+                except ValueError:
+                    # 文字列の中・入れ子の途中の候補。次の候補を試す
+                    self._search = match.start() + 1
+                    continue
+                self._pos = match.end()
+                self._start = None
+                break
+            else:
+                # 要素が完結していない。続きを受け取ってから再開する
+                break
+
+        # 取り出し済みの部分を捨て、バッファを要素 1 つ分程度に保つ
+        cut = self._pos if self._start is None else self._start
+        self._buffer = buffer[cut:]
+        self._pos -= cut
+        if self._start is not None:
+            self._start -= cut
+            self._search -= cut
+        return elements
+
+    def remainder(self) -> bytes:
+        """配列でなかった場合に、受け取ったレスポンス全体を返す。"""
+        return self._buffer
+
+
+class _ListCollector:
+    """要素をデコード・射影し、件数の上限に達したかを判定する。"""
+
+    def __init__(
+        self,
+        max_items: int | None,
+        project: Callable[[Any], Any] | None,
+        accept: Callable[[Any], bool] | None,
+    ):
+        self.scanner = ArrayScanner()
+        self.items: list = []
+        self._max_items = max_items
+        self._project = project
+        self._accept = accept
+
+    @property
+    def full(self) -> bool:
+        return self._max_items is not None and len(self.items) >= self._max_items
+
+    def feed(self, chunk: bytes) -> None:
+        for item in self.scanner.feed(chunk):
+            if self._accept is not None and not self._accept(item):
+                continue
+            self.items.append(self._project(item) if self._project else item)
+            if self.full:
+                return
+
+    def result(self) -> Any:
+        """収集した要素を返す。
+
+        Raises:
+            ValueError: 件数の上限に達する前に、配列が閉じずにレスポンスが終わった場合
+        """
+        if self.scanner.is_array is False:
+            return loads(self.scanner.remainder())
+        if not self.full and not self.scanner.done:
+            raise ValueError("JSON array ended before it was closed")
+        return self.items
+
+
+def parse_list(
+    chunks: Iterable[bytes],
+    max_items: int | None = None,
+    project: Callable[[Any], Any] | None = None,
+    accept: Callable[[Any], bool] | None = None,
+) -> Any:
+    """JSON 配列のレスポンスを逐次パースし、先頭から max_items 件の要素を返す。
+
+    Args:
+        chunks: レスポンス本文のチャンク (resp.iter_content() 等)
+        max_items: 返す要素数の上限。達した時点でパースを打ち切る (None なら全件)
+        project: 要素ごとに適用する射影 (必要なフィールドだけを残す等)
+        accept: 件数に数える要素を判定する関数 (False の要素は捨てる)
+
+    Returns:
+        要素のリスト。レスポンスが配列でなければデコードした値をそのまま返す
+
+    Raises:
+        ValueError: JSON として読めない場合、または max_items 件に達する前に
+            配列が閉じずにレスポンスが終わった場合
+    """
+    collector = _ListCollector(max_items, project, accept)
+    for chunk in chunks:
+        if not collector.full and not collector.scanner.done:
+            collector.feed(chunk)
+        # 打ち切り後も読み捨てて、接続をプールに戻せるようにする
+    return collector.result()
+
+
+async def aparse_list(
+    chunks: AsyncIterable[bytes],
+    max_items: int | None = None,
+    project: Callable[[Any], Any] | None = None,
+    accept: Callable[[Any], bool] | None = None,
+) -> Any:
+    """parse_list の非同期版 (httpx の resp.aiter_bytes() 等を受け取る)。"""
+    collector = _ListCollector(max_items, project, accept)
+    async for chunk in chunks:
+        if not collector.full and not collector.scanner.done:
+            collector.feed(chunk)
+    return collector.result()
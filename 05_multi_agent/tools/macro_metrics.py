@@ -0,0 +1,150 @@
+"""経済指標の派生メトリクス計算 (NumPy)。
+
+FRED の観測値リストから前年比・前期比・スプレッド・
+移動平均・z スコアをローカルで計算する。I/O を持たない純粋関数のみ。
+"""
+
+import numpy as np
+
+from .records import Observation
+
+# 1 年あたりの観測数の目安 (取得件数の見積もりに使う)
+PERIODS_PER_YEAR = {
+    "daily": 260,
+    "weekly": 52,
+    "monthly": 12,
+    "quarterly": 4,
+}
+
+
+def to_arrays(observations: list[Observation]) -> tuple[np.ndarray, np.ndarray]:
+    """観測値リストを (日付, 値) の昇順配列に変換する。欠損値は除外する。
+
+    Args:
+        observations: 観測値のリスト (順序は問わない)
+
+    Returns:
+        (datetime64[D] の配列, float64 の配列)
+    """
+    pairs = [
+        (obs.date, obs.value)
+        for obs in observations
+        if obs.date and obs.value is not None
+    ]
+    if not pairs:
+        return np.array([], dtype="datetime64[D]"), np.array([], dtype=np.float64)
+    dates = np.array([d for d, _ in pairs], dtype="datetime64[D]")
+    values = np.array([v for _, v in pairs], dtype=np.float64)
+    order = np.argsort(dates, kind="stable")
+    return dates[order], values[order]
+
+
+def pct_change(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """periods 期前からの変化率 (%) を返す。先頭 periods 件は NaN。"""
+    result = np.full(values.shape, np.nan)
+    if values.size > periods:
+        prev = values[:-periods]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result[periods:] = np.where(prev != 0, (values[periods:] / prev - 1) * 100, np.nan)
+    return result
+
+
+def yoy_change(dates: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """各観測日の 1 年前 (以前で最も近い観測) からの変化率 (%) を返す。
+
+    日付で突き合わせるため、月次・四半期・営業日ベースの日次系列に共通で使える。
+    """
+    result = np.full(values.shape, np.nan)
+    if values.size == 0:
+        return result
+    targets = dates - np.timedelta64(365, "D")
+    idx = np.searchsorted(dates, targets, side="right") - 1
+    valid = idx >= 0
+    prev = values[np.where(valid, idx, 0)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.where(valid & (prev != 0), (values / prev - 1) * 100, np.nan)
+    return result
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """末尾 window 件の移動平均を返す。window 件に満たない位置は NaN。"""
+    result = np.full(values.shape, np.nan)
+    if window <= 0 or values.size < window:
+        return result
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    result[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return result
+
+
+def rolling_zscore(values: np.ndarray, window: int) -> np.ndarray:
+    """末尾 window 件の平均・標準偏差に対する z スコアを返す。"""
+    result = np.full(values.shape, np.nan)
+    if window <= 1 or values.size < window:
+        return result
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    csum_sq = np.cumsum(np.insert(values * values, 0, 0.0))
+    mean = (csum[window:] - csum[:-window]) / window
+    var = (csum_sq[window:] - csum_sq[:-window]) / window - mean * mean
+    std = np.sqrt(np.maximum(var, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[window - 1:] = np.where(std > 0, (values[window - 1:] - mean) / std, 0.0)
+    return result
+
+
+def spread(
+    dates_a: np.ndarray, values_a: np.ndarray, dates_b: np.ndarray, values_b: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """共通の観測日について a - b を返す (例: 10年債 - 2年債)。"""
+    common, idx_a, idx_b = np.intersect1d(dates_a, dates_b, assume_unique=True, return_indices=True)
+    return common, values_a[idx_a] - values_b[idx_b]
+
+
+def _round(value: float, digits: int = 4) -> float | None:
+    """NaN を None に変換して丸める。"""
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+def summarize(observations: list[Observation], window: int = 12) -> dict:
+    """1 シリーズの最新値と派生メトリクスをまとめた辞書を返す。
+
+    Args:
+        observations: 観測値のリスト
+        window: 移動平均・z スコアの窓 (観測数)
+
+    Returns:
+        latest, date, change_pct (前期比), yoy_pct (前年比),
+        rolling_mean, zscore, trend を含む辞書
+    """
+    dates, values = to_arrays(observations)
+    if values.size == 0:
+        return {"latest": None, "date": None}
+
+    mean = rolling_mean(values, window)[-1]
+    trend = None
+    if not np.isnan(mean):
+        trend = "UP" if values[-1] > mean else "DOWN" if values[-1] < mean else "FLAT"
+    return {
+        "latest": _round(values[-1]),
+        "date": str(dates[-1]),
+        "change_pct": _round(pct_change(values)[-1], 3),
+        "yoy_pct": _round(yoy_change(dates, values)[-1], 3),
+        "rolling_mean": _round(mean),
+        "zscore": _round(rolling_zscore(values, window)[-1], 2),
+        "trend": trend,
+    }
+
+
+def summarize_spread(
+    observations_a: list[Observation], observations_b: list[Observation], window: int = 12
+) -> dict:
+    """2 シリーズのスプレッド (a - b) の最新値・移動平均・z スコアを返す。"""
+    dates, values = spread(*to_arrays(observations_a), *to_arrays(observations_b))
+    if values.size == 0:
+        return {"latest": None, "date": None}
+    return {
+        "latest": _round(values[-1]),
+        "date": str(dates[-1]),
+        "rolling_mean": _round(rolling_mean(values, window)[-1]),
+        "zscore": _round(rolling_zscore(values, window)[-1], 2),
+        "inverted": bool(values[-1] < 0),
+    }
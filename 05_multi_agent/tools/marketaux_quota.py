@@ -0,0 +1,93 @@
+"""Marketaux 日次枠 (100 req/day) の配分計画。
+
+バッチ取得 (get_financial_news_batch) は 1 リクエストに複数銘柄を詰めるため、
+1 日に取得できる「銘柄枠」は (日次枠 - 予備) × 1 リクエストあたりの銘柄数になる。
+この銘柄枠をウォッチリストの優先度 (重み) に応じて配分し、銘柄ごとの
+再取得間隔 (= 銘柄別スライスのキャッシュ TTL) を決める。
+
+    - 全銘柄に 1 日 1 回を保証し、余りの枠を重みに比例して上乗せする
+      (枠が銘柄数に満たない場合は優先度の高い銘柄から 1 日 1 回)
+    - 1 回の実行で使うリクエスト数は、残りトークンから予備 (MARKETAUX_RESERVE)
+      を除いた範囲に収め、収まらない銘柄は優先度の低い順に次回へ回す
+"""
+
+from ..config.settings import (
+    CACHE_TTLS,
+    MARKETAUX_MAX_ARTICLES,
+    MARKETAUX_RESERVE,
+    MARKETAUX_WATCHLIST,
+    RATE_LIMITS,
+)
+
+_DAY_SECONDS = 86400.0
+
+
+def parse_watchlist(spec: str = MARKETAUX_WATCHLIST) -> dict[str, float]:
+    """"AAPL:3,MSFT,TSLA:0.5" 形式のウォッチリストを {銘柄: 重み} (記載順) にする。"""
+    weights: dict[str, float] = {}
+    for item in spec.split(","):
+        symbol, _, weight = item.strip().partition(":")
+        if symbol:
+            weights.setdefault(symbol.upper(), float(weight) if weight else 1.0)
+    return weights
+
+
+def symbols_per_request(limit: int) -> int:
+    """銘柄ごとに limit 件の記事を得るために 1 リクエストへ詰められる銘柄数。"""
+    return max(1, MARKETAUX_MAX_ARTICLES // max(limit, 1))
+
+
+def daily_budget() -> int:
+    """バッチ取得に使える 1 日あたりのリクエスト数。"""
+    return max(0, RATE_LIMITS["marketaux"]["capacity"] - MARKETAUX_RESERVE)
+
+
+def _prioritized(symbols: list[str], weights: dict[str, float]) -> list[str]:
+    """銘柄を重みの降順 (同じ重みは記載順) に並べる。"""
+    return sorted(symbols, key=lambda s: -weights.get(s, 1.0))
+
+
+def daily_allocation(symbols: list[str], per_request: int) -> dict[str, int]:
+    """銘柄ごとの 1 日あたりの取得回数を返す。
+
+    対象はウォッチリストと symbols の和集合。ウォッチリストにない銘柄の重みは 1。
+    """
+    weights = parse_watchlist()
+    universe = _prioritized(list(dict.fromkeys([*weights, *symbols])), weights)
+    slots = daily_budget() * per_request
+    if slots < len(universe):
+        return {s: 1 if i < slots else 0 for i, s in enumerate(universe)}
+
+    extra = slots - len(universe)
+    total = sum(weights.get(s, 1.0) for s in universe)
+    return {s: 1 + int(extra * weights.get(s, 1.0) / total) for s in universe}
+
+
+def refresh_interval(symbol: str, symbols: list[str], per_request: int) -> float:
+    """銘柄別スライスの再取得間隔 (秒)。キャッシュの TTL として使う。
+
+    CACHE_TTLS["marketaux_news"] より短くはしない。
+    """
+    count = daily_allocation(symbols, per_request).get(symbol, 0)
+    interval = _DAY_SECONDS / count if count else _DAY_SECONDS
+    return max(float(CACHE_TTLS["marketaux_news"]), interval)
+
+
+def plan(due: list[str], remaining: float, per_request: int) -> dict:
+    """取得が必要な銘柄をリクエスト単位にまとめ、今回使える枠に収める。
+
+    Args:
+        due: キャッシュが切れている (取得が必要な) 銘柄
+        remaining: Marketaux の残りトークン数
+        per_request: 1 リクエストに詰める銘柄数
+
+    Returns:
+        {"requests": [[銘柄, ...], ...], "deferred": [次回に回す銘柄, ...]}
+    """
+    ordered = _prioritized(due, parse_watchlist())
+    chunks = [ordered[i:i + per_request] for i in range(0, len(ordered), per_request)]
+    budget = max(0, int(remaining) - MARKETAUX_RESERVE)
+    return {
+        "requests": chunks[:budget],
+        "deferred": [s for chunk in chunks[budget:] for s in chunk],
+    }
@@ -2,11 +2,27 @@
 
 センチメント付き金融ニュースを取得する。
 無料枠: 100 req/day
+
+複数銘柄は get_financial_news_batch で 1 リクエストにまとめて取得し、
+記事のエンティティタグで銘柄ごとに切り分けてキャッシュする。
 """
 
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config.settings import (
+    CACHE_TTLS,
+    MARKETAUX_API_KEY,
+    MARKETAUX_BASE_URL,
+    MARKETAUX_MAX_ARTICLES,
+)
+from . import marketaux_quota
+from .cache import cached
+from .http_client import http_get
+from .news_dedup import dedupe_articles
+from .rate_limiter import RateLimitExceeded, acquire, tokens_remaining
+from .records import Article
 
-from ..config.settings import MARKETAUX_API_KEY, MARKETAUX_BASE_URL
+_NOT_CONFIGURED = "Marketaux API key not configured (MARKETAUX_API_KEY). Skipping sentiment news."
 
 
 def get_financial_news_with_sentiment(
@@ -25,27 +41,67 @@ def get_financial_news_with_sentiment(
         センチメントスコア付きのニュース記事リスト
     """
     if not MARKETAUX_API_KEY:
-        return {
-            "error": "Marketaux API key not configured (MARKETAUX_API_KEY). Skipping sentiment news.",
-            "symbols": symbols.upper(),
-            "count": 0,
-            "articles": [],
-        }
-
-    resp = requests.get(
+        return _not_configured(symbols)
+
+    try:
+        articles = _fetch_news(symbols, limit)
+    except RateLimitExceeded as e:
+        return _quota_exhausted(symbols, e)
+    return _news_result(symbols, articles)
+
+
+def _news_articles(symbols: str, limit: int = 10) -> list[Article]:
+    """get_financial_news_with_sentiment の記事を返す (未設定・枠切れは例外)。"""
+    if not MARKETAUX_API_KEY:
+        raise RuntimeError(_NOT_CONFIGURED)
+    return _fetch_news(symbols, limit)
+
+
+@cached("marketaux_news")
+def _fetch_news(symbols: str, limit: int = 10) -> list[Article]:
+    """/news/all を取得し、近似重複をまとめた記事リストを返す。"""
+    acquire("marketaux")
+    resp = http_get(
         f"{MARKETAUX_BASE_URL}/news/all",
-        params={
-            "symbols": symbols.upper(),
-            "filter_entities": "true",
-            "language": "en",
-            "limit": min(limit, 50),
-            "api_token": MARKETAUX_API_KEY,
-        },
-        timeout=10,
+        params=_news_params(symbols, limit),
     )
     resp.raise_for_status()
-    data = resp.json()
+    return _parse_articles(resp.json())
 
+
+def _not_configured(symbols: str) -> dict:
+    """API キー未設定時の結果を返す。"""
+    return {
+        "error": _NOT_CONFIGURED,
+        "symbols": symbols.upper(),
+        "count": 0,
+        "articles": [],
+    }
+
+
+def _quota_exhausted(symbols: str, error: RateLimitExceeded) -> dict:
+    """日次枠を使い切った場合の結果を返す。"""
+    return {
+        "error": f"Marketaux daily quota exhausted ({error}). Skipping sentiment news.",
+        "symbols": symbols.upper(),
+        "count": 0,
+        "articles": [],
+    }
+
+
+def _news_params(symbols: str, limit: int) -> dict:
+    """/news/all のクエリパラメータを組み立てる。"""
+    return {
+        "symbols": symbols.upper(),
+        "filter_entities": "true",
+        "language": "en",
+        "limit": min(limit, 50),
+        "api_token": MARKETAUX_API_KEY,
+    }
+
+
+def _parse_articles(data: dict) -> list[Article]:
+    """/news/all のレスポンスを Article のリストに変換する (近似重複はまとめる)。"""
     articles = []
     for article in data.get("data", []):
         # エンティティからセンチメントスコアを抽出
@@ -59,14 +115,14 @@ def get_financial_news_with_sentiment(
             else None
         )
 
-        articles.append({
-            "title": article.get("title"),
-            "description": article.get("description", "")[:300],
-            "source": article.get("source"),
-            "published_at": article.get("published_at"),
-            "url": article.get("url"),
-            "sentiment_score": avg_sentiment,
-            "entities": [
+        articles.append(Article(
+            article.get("title"),
+            article.get("description", "")[:300],
+            article.get("source"),
+            article.get("url"),
+            published_at=article.get("published_at"),
+            sentiment_score=avg_sentiment,
+            entities=[
                 {
                     "symbol": e.get("symbol"),
                     "name": e.get("name"),
@@ -74,10 +130,181 @@ def get_financial_news_with_sentiment(
                 }
                 for e in entities[:5]
             ],
-        })
+        ))
+    return dedupe_articles(articles)
 
+
+# ツール出力のキー → Article の属性
+_NEWS_FIELDS = {
+    "title": "headline",
+    "description": "summary",
+    "source": "source",
+    "published_at": "published_at",
+    "url": "url",
+    "sentiment_score": "sentiment_score",
+    "entities": "entities",
+}
+
+
+def _news_result(symbols: str, articles: list[Article]) -> dict:
+    """get_financial_news_with_sentiment の結果を組み立てる。"""
     return {
         "symbols": symbols.upper(),
         "count": len(articles),
-        "articles": articles,
+        "articles": [a.to_dict(_NEWS_FIELDS) for a in articles],
+    }
+
+
+def get_financial_news_batch(symbols: str, limit: int = 10) -> dict:
+    """複数銘柄のセンチメント付きニュースを一括で取得する。
+
+    複数銘柄を 1 回の API リクエストにまとめ、記事のエンティティタグで
+    銘柄ごとに切り分ける。銘柄ごとの結果は get_financial_news_with_sentiment と
+    同じ形式で、同じキャッシュを共有する。日次枠 (100 req/day) に収まるよう、
+    枠が足りない場合は優先度の低い銘柄を deferred として次回に回す。
+
+    Args:
+        symbols: カンマ区切りのティッカーシンボル (例: "AAPL,GOOGL,MSFT")
+        limit: 銘柄ごとの記事数の上限 (デフォルト: 10)
+
+    Returns:
+        銘柄ごとのニュース (results)、API で取得した銘柄、キャッシュから返した銘柄、
+        次回に回した銘柄、使用したリクエスト数
+    """
+    symbol_list = _split_symbols(symbols)
+    if not MARKETAUX_API_KEY:
+        return {**_not_configured(symbols), "results": {}}
+
+    results, due = _cached_slices(symbol_list, limit)
+    per_request = marketaux_quota.symbols_per_request(limit)
+    plan = marketaux_quota.plan(due, tokens_remaining("marketaux"), per_request)
+    fetched: dict[str, list[Article] | Exception] = {}
+    if plan["requests"]:
+        with ThreadPoolExecutor(max_workers=len(plan["requests"])) as pool:
+            futures = [
+                (chunk, pool.submit(_fetch_batch, chunk, symbol_list, limit))
+                for chunk in plan["requests"]
+            ]
+        for chunk, future in futures:
+            try:
+                fetched.update(future.result())
+            except Exception as e:
+                fetched.update({symbol: e for symbol in chunk})
+    return _batch_result(symbol_list, results, fetched, plan)
+
+
+def _split_symbols(symbols: str) -> list[str]:
+    """カンマ区切りのティッカーを重複のない大文字のリストにする。"""
+    return list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+
+
+def _cached_slices(
+    symbol_list: list[str], limit: int
+) -> tuple[dict[str, list[Article]], list[str]]:
+    """キャッシュ済みの銘柄の記事と、取得が必要な銘柄を返す。"""
+    results = {}
+    due = []
+    for symbol in symbol_list:
+        hit, value = _fetch_news.peek(symbol, limit)
+        if hit:
+            results[symbol] = value
+        else:
+            due.append(symbol)
+    return results, due
+
+
+def _fetch_batch(
+    chunk: list[str], symbol_list: list[str], limit: int
+) -> dict[str, list[Article]]:
+    """銘柄をまとめた 1 リクエストを実行し、銘柄ごとの記事を返す。"""
+    acquire("marketaux")
+    resp = http_get(
+        f"{MARKETAUX_BASE_URL}/news/all",
+        params=_news_params(",".join(chunk), MARKETAUX_MAX_ARTICLES),
+    )
+    resp.raise_for_status()
+    return _prime_slices(chunk, symbol_list, resp.json(), limit)
+
+
+def _slice_by_symbol(chunk: list[str], data: dict, limit: int) -> dict[str, list[dict]]:
+    """まとめて取得したレスポンスの記事を、エンティティタグで銘柄ごとに切り分ける。
+
+    各記事のエンティティはその銘柄のものだけを残すため、切り分けた記事は
+    その銘柄を単体で取得した場合と同じ形になる。
+    """
+    slices: dict[str, list[dict]] = {symbol: [] for symbol in chunk}
+    for article in data.get("data", []):
+        for symbol in dict.fromkeys(
+            (e.get("symbol") or "").upper() for e in article.get("entities", [])
+        ):
+            if symbol in slices and len(slices[symbol]) < limit:
+                slices[symbol].append({
+                    **article,
+                    "entities": [
+                        e for e in article["entities"]
+                        if (e.get("symbol") or "").upper() == symbol
+                    ],
+                })
+    return slices
+
+
+def _page_truncated(data: dict) -> bool:
+    """該当記事の一部しかページに収まっていないか判定する。"""
+    meta = data.get("meta") or {}
+    returned = meta.get("returned", len(data.get("data", [])))
+    if "found" in meta:
+        return meta["found"] > returned
+    return returned >= MARKETAUX_MAX_ARTICLES
+
+
+def _prime_slices(
+    chunk: list[str], symbol_list: list[str], data: dict, limit: int
+) -> dict[str, list[Article]]:
+    """銘柄ごとの記事を、単体取得のキャッシュに優先度に応じた TTL で登録する。
+
+    ページが埋まっている場合、limit 件に満たない銘柄は記事の多い銘柄に
+    押し出された可能性がある。記事が 0 件ならキャッシュせず (次の単体呼び出しで
+    取得し直す)、それ以外は最短の TTL で登録する。
+    """
+    slices = _slice_by_symbol(chunk, data, limit)
+    truncated = _page_truncated(data)
+    per_request = marketaux_quota.symbols_per_request(limit)
+    results = {}
+    for symbol, raw in slices.items():
+        articles = results[symbol] = _parse_articles({"data": raw})
+        if not truncated or len(raw) >= limit:
+            ttl = marketaux_quota.refresh_interval(symbol, symbol_list, per_request)
+        elif raw:
+            ttl = CACHE_TTLS["marketaux_news"]
+        else:
+            continue
+        _fetch_news.prime(articles, symbol, limit, ttl=ttl)
+    return results
+
+
+def _batch_result(
+    symbol_list: list[str],
+    cached_results: dict[str, list[Article]],
+    fetched: dict[str, list[Article] | Exception],
+    plan: dict,
+) -> dict:
+    """一括取得の結果を組み立てる。"""
+    results = {}
+    errors = {}
+    for symbol in symbol_list:
+        articles = cached_results.get(symbol, fetched.get(symbol))
+        if isinstance(articles, Exception):
+            errors[symbol] = str(articles)
+        elif articles is not None:
+            results[symbol] = _news_result(symbol, articles)
+    batch = {
+        "symbols": symbol_list,
+        "results": results,
+        "fetched": [s for s in symbol_list if s in fetched and s not in errors],
+        "cached": [s for s in symbol_list if s in cached_results],
+        "deferred": plan["deferred"],
+        "requests": len(plan["requests"]),
     }
+    if errors:
+        batch["errors"] = errors
+    return batch
@@ -0,0 +1,106 @@
+"""ニュース記事の近似重複クラスタリング (SimHash)。
+
+同じ配信記事が Finnhub / Marketaux の複数ソースから数件ずつ届くため、
+見出しと要約の SimHash (64 bit) のハミング距離で近似重複をまとめ、
+代表記事 1 件とソース数だけを LLM に渡す。I/O を持たない純粋関数のみ。
+"""
+
+import functools
+import hashlib
+import re
+
+import numpy as np
+
+from ..config.settings import NEWS_DEDUP_MAX_DISTANCE
+from .records import Article
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+@functools.lru_cache(maxsize=65536)
+def _feature_hash(feature: str) -> int:
+    """特徴量 (単語・単語 2-gram) の 64 bit ハッシュ。"""
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+
+
+def _features(text: str) -> list[str]:
+    """小文字化した単語と単語 2-gram を返す。"""
+    words = _TOKEN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def simhashes(texts: list[str]) -> np.ndarray:
+    """各テキストの 64 bit SimHash を uint64 配列で返す。"""
+    result = np.zeros(len(texts), dtype=np.uint64)
+    for i, text in enumerate(texts):
+        features = _features(text)
+        if not features:
+            continue
+        hashes = np.array([_feature_hash(f) for f in features], dtype=np.uint64)
+        bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+        votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(features)
+        result[i] = np.packbits(votes > 0, bitorder="little").view(np.uint64)[0]
+    return result
+
+
+def hamming_matrix(hashes: np.ndarray) -> np.ndarray:
+    """SimHash 同士のハミング距離の行列を返す。"""
+    xor = hashes[:, None] ^ hashes[None, :]
+    return np.unpackbits(xor.view(np.uint8), axis=-1).reshape(*xor.shape, 64).sum(axis=-1)
+
+
+def cluster(texts: list[str], max_distance: int = NEWS_DEDUP_MAX_DISTANCE) -> list[list[int]]:
+    """近似重複のテキストをまとめたインデックスのグループを返す。
+
+    ハミング距離が max_distance 以下のペアを同じクラスタとし (推移的に結合)、
+    各クラスタは入力順に並べる。
+    """
+    n = len(texts)
+    if n == 0:
+        return []
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    distances = hamming_matrix(simhashes(texts))
+    for i, j in np.argwhere(np.triu(distances <= max_distance, k=1)):
+        root_i, root_j = find(int(i)), find(int(j))
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def dedupe_articles(articles: list[Article]) -> list[Article]:
+    """近似重複の記事を 1 件にまとめる。
+
+    各クラスタの先頭 (入力順で最初) の記事を代表とし、複数のソースにまたがる
+    場合のみ sources (ソース名) を付与する。
+    既にまとめ済みの記事 (sources を持つ記事) を再度まとめてもソースは重複しない。
+
+    Args:
+        articles: 記事のリスト (優先する記事を先に並べる)
+
+    Returns:
+        代表記事のリスト (入力順)
+    """
+    deduped = []
+    for group in cluster([a.text() for a in articles]):
+        representative = articles[group[0]]
+        sources = list(dict.fromkeys(
+            source
+            for i in group
+            for source in articles[i].sources or [articles[i].source]
+            if source
+        ))
+        if len(sources) > 1:
+            representative = representative.replace(sources=sources)
+        deduped.append(representative)
+    return deduped
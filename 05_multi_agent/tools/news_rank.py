@@ -0,0 +1,116 @@
+"""ニュース記事の関連度ランキング (BM25)。
+
+取得した記事群そのものをコーパスとして BM25 を計算し、対象銘柄の
+ティッカーと企業名 (get_company_profile の name) に関連する記事を上位 k 件に
+絞り込む。見出しは要約より重く扱う。I/O を持たない純粋関数のみ。
+"""
+
+import re
+from typing import Callable
+
+import numpy as np
+
+from .records import Article
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# 企業名から除く法人格・一般語
+_NAME_STOPWORDS = frozenset({
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd",
+    "limited", "plc", "holdings", "holding", "group", "sa", "ag", "nv",
+    "class", "the", "and", "com", "llc", "lp",
+})
+
+# BM25 のパラメータ
+_K1 = 1.5
+_B = 0.75
+# 見出しの重み (見出しのトークンを何回分として数えるか)
+_HEADLINE_WEIGHT = 2
+
+
+def name_terms(company_name: str | None) -> list[str]:
+    """企業名から検索語を取り出す (例: "Apple Inc" → ["apple"])。"""
+    if not company_name:
+        return []
+    return [t for t in _TOKEN.findall(company_name.lower()) if t not in _NAME_STOPWORDS]
+
+
+def _ticker_pattern(symbol: str) -> re.Pattern:
+    """大文字のティッカー表記 (キャッシュタグ含む) に一致するパターン。
+
+    "ON" や "ALL" のような一般語と紛れないよう大文字小文字を区別する。
+    """
+    return re.compile(rf"(?<![A-Za-z0-9]){re.escape(symbol.upper())}(?![A-Za-z0-9])")
+
+
+def term_frequencies(
+    headlines: list[str], bodies: list[str], symbol: str, terms: list[str]
+) -> tuple[np.ndarray, np.ndarray]:
+    """記事ごとの検索語の出現数と文書長を返す。
+
+    Returns:
+        (記事数 × (1 + 検索語数) の出現数行列 (先頭列はティッカー), 文書長の配列)
+    """
+    ticker = _ticker_pattern(symbol)
+    tf = np.zeros((len(headlines), 1 + len(terms)), dtype=np.float64)
+    lengths = np.zeros(len(headlines), dtype=np.float64)
+    for i, (headline, body) in enumerate(zip(headlines, bodies)):
+        head_tokens = _TOKEN.findall(headline.lower())
+        body_tokens = _TOKEN.findall(body.lower())
+        lengths[i] = _HEADLINE_WEIGHT * len(head_tokens) + len(body_tokens)
+        tf[i, 0] = _HEADLINE_WEIGHT * len(ticker.findall(headline)) + len(ticker.findall(body))
+        for j, term in enumerate(terms, start=1):
+            tf[i, j] = _HEADLINE_WEIGHT * head_tokens.count(term) + body_tokens.count(term)
+    return tf, lengths
+
+
+def bm25(tf: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """出現数行列から記事ごとの BM25 スコアを返す。"""
+    n = tf.shape[0]
+    if n == 0 or tf.shape[1] == 0:
+        return np.zeros(n)
+    df = (tf > 0).sum(axis=0)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    avg_length = lengths.mean() or 1.0
+    norm = _K1 * (1 - _B + _B * lengths / avg_length)
+    return ((tf * (_K1 + 1)) / (tf + norm[:, None]) * idf).sum(axis=1)
+
+
+def rank_articles(
+    articles: list[Article],
+    headline_of: Callable[[Article], str],
+    body_of: Callable[[Article], str],
+    symbol: str,
+    company_name: str | None = None,
+    top_k: int = 10,
+    require_match: bool = False,
+) -> list[Article]:
+    """記事を対象銘柄との関連度順に並べ、上位 top_k 件を返す。
+
+    スコアが同じ記事は入力順 (新しい順) を保つ。各記事に relevance を付与する。
+
+    Args:
+        articles: 記事のリスト
+        headline_of: 記事から見出しを返す関数
+        body_of: 記事から本文 (要約・関連銘柄等) を返す関数
+        symbol: ティッカーシンボル
+        company_name: 企業名 (get_company_profile の name)
+        top_k: 返す記事数の上限
+        require_match: True ならティッカー・企業名に一致しない記事を除く
+    """
+    if not articles:
+        return []
+    tf, lengths = term_frequencies(
+        [headline_of(a) or "" for a in articles],
+        [body_of(a) or "" for a in articles],
+        symbol,
+        name_terms(company_name),
+    )
+    scores = bm25(tf, lengths)
+    order = np.argsort(-scores, kind="stable")
+    ranked = []
+    for i in order:
+        if len(ranked) >= top_k or (require_match and scores[i] <= 0):
+            break
+        ranked.append(articles[i].replace(relevance=round(float(scores[i]), 3)))
+    return ranked
@@ -0,0 +1,110 @@
+"""ニュース統合ツール。
+
+Finnhub (企業ニュース・マーケットニュース) と Marketaux (センチメント付きニュース)
+を並行取得し、ソースをまたいだ近似重複をまとめた 1 つの記事リストを返す。
+同じ配信記事が複数ソースから届いても、LLM に渡すのは代表記事 1 件とソース数のみ。
+記事は対象銘柄のティッカー・企業名との関連度 (BM25) 順に上位だけを残す。
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .finnhub_tools import _company_name, _company_news_articles, _market_news_articles
+from .marketaux_tools import _news_articles
+from .news_dedup import dedupe_articles
+from .news_rank import rank_articles
+from .records import Article
+
+# 各ソースから取得する件数 (重複排除・絞り込み前)
+_SOURCE_LIMIT = 30
+
+# ソース名 → 記事 (Article) のリストを返す関数
+_SOURCES = {
+    "marketaux": _news_articles,
+    "company_news": _company_news_articles,
+    "market_news": _market_news_articles,
+}
+
+
+def get_news_digest(symbol: str, days: int = 7, limit: int = 15) -> dict:
+    """対象銘柄のニュースを複数ソースから集約し、重複を除いて取得する。
+
+    企業ニュース・センチメント付きニュース・マーケット全体ニュースを 1 回で取得し、
+    同じ記事の転載は 1 件にまとめて sources / source_count を付与する。
+    記事は対象銘柄との関連度 (relevance) の高い順に並ぶ。
+
+    Args:
+        symbol: ティッカーシンボル (例: "AAPL")
+        days: 企業ニュースを過去何日分取得するか (デフォルト: 7)
+        limit: 返す記事数の上限 (デフォルト: 15)
+
+    Returns:
+        重複排除済みの記事リスト (見出し, 要約, ソース, センチメント等)
+    """
+    calls = _digest_args(symbol, days)
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        futures = {
+            name: pool.submit(_SOURCES[name], *args) for name, args in calls.items()
+        }
+    fetched = {}
+    for name, future in futures.items():
+        try:
+            fetched[name] = future.result()
+        except Exception as e:
+            fetched[name] = e
+    return _build_digest(symbol, fetched, limit, _company_name(symbol))
+
+
+def _digest_args(symbol: str, days: int) -> dict[str, tuple]:
+    """ソース名 → 取得関数の引数。センチメントを持つ Marketaux の記事を代表に優先する。"""
+    return {
+        "marketaux": (symbol.upper(),),
+        "company_news": (symbol, days, _SOURCE_LIMIT),
+        "market_news": ("general", _SOURCE_LIMIT, symbol.upper()),
+    }
+
+
+# ツール出力のキー → Article の属性
+_DIGEST_FIELDS = {
+    "headline": "headline",
+    "summary": "summary",
+    "source": "source",
+    "url": "url",
+    "published_at": "published",
+}
+
+
+def _build_digest(
+    symbol: str,
+    fetched: dict[str, list[Article] | BaseException],
+    limit: int,
+    company_name: str | None,
+) -> dict:
+    """ソースごとの記事を統合し、近似重複をまとめて関連度順に絞った結果を組み立てる。
+
+    ソース内でまとめ済みの記事は sources を引き継ぐ。
+    """
+    articles = []
+    errors = {}
+    for name, result in fetched.items():
+        if isinstance(result, BaseException):
+            errors[name] = str(result)
+            continue
+        articles.extend(result)
+
+    ranked = rank_articles(
+        dedupe_articles(articles),
+        lambda a: a.headline,
+        lambda a: a.summary,
+        symbol,
+        company_name,
+        top_k=limit,
+    )
+    digest = {
+        "symbol": symbol.upper(),
+        "fetched_articles": len(articles),
+        "count": len(ranked),
+        "articles": [a.to_dict(_DIGEST_FIELDS) for a in ranked],
+    }
+    if errors:
+        digest["errors"] = errors
+    return digest
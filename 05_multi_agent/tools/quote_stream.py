@@ -0,0 +1,306 @@
+"""Finnhub トレード WebSocket によるリアルタイム株価ブック。
+
+ウォッチリストの銘柄を WebSocket で購読し、約定ごとに最終価格・高値・安値を
+メモリ上のブックに反映する。get_stock_quote は購読中の銘柄をブックから
+通信なしで返し、未購読の銘柄や切断中は REST (/quote) にフォールバックする。
+
+    - 前日終値・始値は REST の /quote で初期化する (銘柄ごとに初回のみ)
+    - 米国東部時間で日付が変わった最初の約定で始値・高値・安値をリセットし、
+      前日終値は前の取引日の通常取引時間の最終約定 (時間外取引は含まない) にする
+    - 始値・高値・安値は通常取引時間の約定だけから作る (寄り付き前は None)
+    - 切断時は指数バックオフで再接続し、再接続後に購読をやり直す
+
+有効化:
+    FINNHUB_STREAM_SYMBOLS="AAPL,MSFT" を設定して main を実行する
+    (接続先は FINNHUB_WS_URL で差し替え可能。テスト時はローカルのサーバーを指定)
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import threading
+from datetime import datetime
+
+from ..config.settings import FINNHUB_API_KEY, FINNHUB_STREAM_SYMBOLS, FINNHUB_WS_URL
+from .cache import _MARKET_CLOSE, _NEW_YORK, is_us_market_open
+from .records import Quote
+
+logger = logging.getLogger(__name__)
+
+# 再接続の待ち時間の初期値と上限 (秒)
+_INITIAL_BACKOFF = 1.0
+_MAX_BACKOFF = 60.0
+
+
+class QuoteBook:
+    """銘柄ごとの最終約定と当日の OHLC を保持する。
+
+    エントリは Quote (change / percent_change は get で計算する) で持ち、
+    REST の株価で前日終値・始値を補った銘柄を _seeded に、
+    通常取引時間の最終約定 (UNIX 時刻, 価格) を _closes に記録する。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, Quote] = {}
+        self._seeded: set[str] = set()
+        self._closes: dict[str, tuple[int, float]] = {}
+
+    def seed(self, quote: Quote) -> None:
+        """REST の株価でエントリを初期化する。
+
+        既に約定を受信している場合は、前日終値と始値だけを補う。
+        """
+        symbol = quote.symbol
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None:
+                self._entries[symbol] = copy.copy(quote)
+                self._seeded.add(symbol)
+            elif symbol not in self._seeded:
+                entry.open = quote.open or entry.open
+                entry.previous_close = quote.previous_close
+                if quote.high:
+                    entry.high = max(entry.high or quote.high, quote.high)
+                if quote.low:
+                    entry.low = min(entry.low or quote.low, quote.low)
+                self._seeded.add(symbol)
+            if quote.timestamp and quote.current_price is not None:
+                self._record_close(symbol, quote.current_price, quote.timestamp)
+
+    def update_trade(self, symbol: str, price: float, timestamp_ms: int) -> None:
+        """約定 1 件をブックに反映する。
+
+        始値・高値・安値は REST の /quote と同じく通常取引時間の約定だけから作る
+        (時間外取引の約定は最終価格にのみ反映する)。
+        """
+        timestamp = timestamp_ms // 1000
+        regular = _in_regular_session(timestamp)
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None:
+                session_price = price if regular else None
+                self._entries[symbol] = Quote(
+                    symbol,
+                    current_price=price,
+                    high=session_price,
+                    low=session_price,
+                    open=session_price,
+                    timestamp=timestamp,
+                )
+                self._record_close(symbol, price, timestamp)
+                return
+            if entry.timestamp and _trading_date(timestamp) > _trading_date(entry.timestamp):
+                # 新しい取引日の最初の約定。前日終値は前の取引日の通常取引時間の最終約定
+                # (前の取引日に通常取引時間の約定を受信していなければ不明)
+                close = self._closes.get(symbol)
+                last_date = _trading_date(entry.timestamp)
+                entry.previous_close = close[1] if close and _trading_date(close[0]) == last_date else None
+                entry.open = entry.high = entry.low = None
+            elif timestamp < (entry.timestamp or 0):
+                # 遅れて届いた約定は同じ取引日の高値・安値 (と通常取引時間の最終約定) のみに反映する
+                if regular and _trading_date(timestamp) == _trading_date(entry.timestamp):
+                    _widen_range(entry, price)
+                self._record_close(symbol, price, timestamp)
+                return
+            entry.current_price = price
+            entry.timestamp = timestamp
+            if regular:
+                _widen_range(entry, price)
+            self._record_close(symbol, price, timestamp)
+
+    def _record_close(self, symbol: str, price: float, timestamp: int) -> None:
+        """通常取引時間の約定なら、その銘柄の最終約定を更新する (ロック内で呼ぶ)。"""
+        if not _in_regular_session(timestamp):
+            return
+        close = self._closes.get(symbol)
+        if close is None or timestamp >= close[0]:
+            self._closes[symbol] = (timestamp, price)
+
+    def get(self, symbol: str) -> Quote | None:
+        """変動額・変動率を計算した株価を返す (前日終値が未取得なら None)。"""
+        with self._lock:
+            if symbol not in self._seeded:
+                return None
+            quote = copy.copy(self._entries[symbol])
+        current, previous = quote.current_price, quote.previous_close
+        change = round(current - previous, 4) if current is not None and previous else None
+        quote.change = change
+        quote.percent_change = round(change / previous * 100, 4) if change is not None else None
+        return quote
+
+    def clear(self) -> None:
+        """すべてのエントリを削除する。"""
+        with self._lock:
+            self._entries.clear()
+            self._seeded.clear()
+            self._closes.clear()
+
+
+def _widen_range(entry: Quote, price: float) -> None:
+    """通常取引時間の約定で始値 (未設定なら) と高値・安値を更新する (ロック内で呼ぶ)。"""
+    if entry.open is None:
+        entry.open = price
+    entry.high = max(entry.high or price, price)
+    entry.low = min(entry.low or price, price)
+
+
+def _trading_date(timestamp: int):
+    """UNIX 時刻を米国東部時間の日付に変換する。"""
+    return datetime.fromtimestamp(timestamp, _NEW_YORK).date()
+
+
+def _in_regular_session(timestamp: int) -> bool:
+    """通常取引時間 (大引けの 16:00:00 の約定を含む) の約定か判定する。"""
+    at = datetime.fromtimestamp(timestamp, _NEW_YORK)
+    if is_us_market_open(at):
+        return True
+    return at.weekday() < 5 and (at.hour, at.minute, at.second) == (*_MARKET_CLOSE, 0)
+
+
+class QuoteStream:
+    """トレード WebSocket を専用スレッドのイベントループで購読する。"""
+
+    def __init__(
+        self,
+        book: QuoteBook,
+        url: str,
+        symbols: list[str],
+        initial_backoff: float = _INITIAL_BACKOFF,
+        max_backoff: float = _MAX_BACKOFF,
+    ):
+        self.book = book
+        self.url = url
+        self.symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.connected = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, name="finnhub-quote-stream", daemon=True
+        )
+        self._task: asyncio.Task | None = None
+        self._ws = None
+
+    def start(self) -> None:
+        """購読スレッドを開始する。"""
+        self._task = self._loop.create_task(self._consume())
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """購読を停止し、スレッドの終了を待つ。"""
+        if self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """スレッド本体。購読タスクが終わるまでイベントループを回す。"""
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    def is_subscribed(self, symbol: str) -> bool:
+        """銘柄が購読対象か判定する。"""
+        return symbol in self.symbols
+
+    def subscribe(self, symbols: list[str]) -> None:
+        """購読銘柄を追加する (接続中ならすぐに購読リクエストを送る)。"""
+        added = [s.upper() for s in symbols if s.upper() not in self.symbols]
+        self.symbols.extend(added)
+        if added and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._send_subscribe(self._ws, added), self._loop)
+
+    async def _send_subscribe(self, ws, symbols: list[str]) -> None:
+        """銘柄ごとに subscribe メッセージを送る。"""
+        for symbol in symbols:
+            await ws.send(json.dumps({"type": "subscribe", "symbol": symbol}))
+
+    async def _consume(self) -> None:
+        """接続・購読・受信を繰り返す。切断時は指数バックオフで再接続する。"""
+        import websockets
+
+        backoff = self.initial_backoff
+        while True:
+            try:
+                async with websockets.connect(self.url) as ws:
+                    self._ws = ws
+                    await self._send_subscribe(ws, self.symbols)
+                    self.connected = True
+                    backoff = self.initial_backoff
+                    async for message in ws:
+                        self._handle(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("finnhub quote stream disconnected: %s", e)
+            finally:
+                self.connected = False
+                self._ws = None
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def _handle(self, message: str | bytes) -> None:
+        """trade メッセージをブックに反映する (ping 等は無視)。"""
+        payload = json.loads(message)
+        if payload.get("type") != "trade":
+            return
+        for trade in payload.get("data") or []:
+            symbol, price, timestamp = trade.get("s"), trade.get("p"), trade.get("t")
+            if symbol and price is not None and timestamp is not None:
+                self.book.update_trade(symbol, float(price), int(timestamp))
+
+
+_book = QuoteBook()
+_stream: QuoteStream | None = None
+
+
+def start_quote_stream(
+    symbols: str = FINNHUB_STREAM_SYMBOLS, url: str | None = None
+) -> QuoteStream | None:
+    """ウォッチリストの購読を開始する。
+
+    Args:
+        symbols: カンマ区切りのティッカー。空なら起動しない
+        url: WebSocket の接続先。省略時は FINNHUB_WS_URL にトークンを付与したもの
+
+    Returns:
+        起動した QuoteStream。無効な場合は None
+    """
+    global _stream
+    symbol_list = [s.strip() for s in symbols.split(",") if s.strip()]
+    if not symbol_list or _stream is not None:
+        return _stream
+    if url is None:
+        if not FINNHUB_API_KEY:
+            return None
+        url = f"{FINNHUB_WS_URL}?token={FINNHUB_API_KEY}"
+    _stream = QuoteStream(_book, url, symbol_list)
+    _stream.start()
+    return _stream
+
+
+def stop_quote_stream() -> None:
+    """購読を停止し、ブックを空にする。"""
+    global _stream
+    if _stream is not None:
+        _stream.stop()
+        _stream = None
+    _book.clear()
+
+
+def get_streamed_quote(symbol: str) -> Quote | None:
+    """購読中かつ接続中の銘柄の株価をブックから返す。それ以外は None。"""
+    symbol = symbol.upper()
+    if _stream is None or not _stream.connected or not _stream.is_subscribed(symbol):
+        return None
+    return _book.get(symbol)
+
+
+def seed_quote(quote: Quote) -> None:
+    """REST で取得した購読銘柄の株価でブックを初期化する。"""
+    if _stream is not None and _stream.is_subscribed(quote.symbol):
+        _book.seed(quote)
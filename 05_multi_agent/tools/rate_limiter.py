@@ -0,0 +1,193 @@
+"""API プロバイダごとのレート制限。
+
+各プロバイダの無料枠 (config/settings.py の RATE_LIMITS) をトークンバケットで
+強制する。バケットの状態は SQLite に保存するため、スレッド・asyncio タスク・
+ワーカープロセス間で共有され、Marketaux の日次枠は再起動後も引き継がれる。
+
+枠を超えたリクエストは失敗させず、次の空きスロットまで待機して平滑化する。
+待ち時間が RATE_LIMIT_MAX_WAIT を超える場合のみ RateLimitExceeded を送出する。
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+from ..config.settings import RATE_LIMIT_DB, RATE_LIMIT_MAX_WAIT, RATE_LIMITS
+
+_DAY_SECONDS = 86400.0
+
+_local = threading.local()
+
+# プロセス内の待機統計 {provider: {...}}
+_stats: dict[str, dict[str, float]] = {}
+_stats_lock = threading.Lock()
+
+
+class RateLimitExceeded(Exception):
+    """待機上限を超えてもレート枠が空かない場合に送出される。"""
+
+    def __init__(self, provider: str, wait: float):
+        super().__init__(
+            f"{provider} rate limit exhausted (next slot in {wait:.0f}s)"
+        )
+        self.provider = provider
+        self.wait = wait
+
+
+def _connect() -> sqlite3.Connection:
+    """スレッドごとの SQLite 接続を返す。"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(RATE_LIMIT_DB) or ".", exist_ok=True)
+        conn = sqlite3.connect(RATE_LIMIT_DB, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "provider TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        _local.conn = conn
+    return conn
+
+
+def _refill(limit: dict, tokens: float, updated: float, now: float) -> tuple[float, float]:
+    """経過時間に応じてトークンを補充した (tokens, updated) を返す。"""
+    capacity = limit["capacity"]
+    if limit.get("daily"):
+        window = now - now % _DAY_SECONDS
+        if updated < window:
+            return float(capacity), window
+        return tokens, updated
+    rate = capacity / limit["period"]
+    return min(float(capacity), tokens + (now - updated) * rate), now
+
+
+def _reserve(provider: str, max_wait: float) -> float:
+    """トークンを 1 つ予約し、そのスロットまでの待ち時間 (秒) を返す。
+
+    分単位の枠はトークンを負値まで予約させ、後続の呼び出しを
+    1/rate 秒間隔のスロットに並べる。日次枠は UTC 0 時まで空かない。
+    """
+    limit = RATE_LIMITS[provider]
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        now = time.time()
+        row = conn.execute(
+            "SELECT tokens, updated FROM buckets WHERE provider = ?", (provider,)
+        ).fetchone()
+        # 未登録のプロバイダは満タンのバケットとして扱う
+        tokens, updated = row if row is not None else (float(limit["capacity"]), 0.0)
+        tokens, updated = _refill(limit, tokens, updated, now)
+
+        if limit.get("daily"):
+            wait = 0.0 if tokens >= 1 else updated + _DAY_SECONDS - now
+        else:
+            rate = limit["capacity"] / limit["period"]
+            wait = max(0.0, (1 - tokens) / rate)
+
+        if wait > max_wait:
+            conn.execute("ROLLBACK")
+            raise RateLimitExceeded(provider, wait)
+
+        conn.execute(
+            "INSERT INTO buckets (provider, tokens, updated) VALUES (?, ?, ?) "
+            "ON CONFLICT(provider) DO UPDATE SET tokens = excluded.tokens, "
+            "updated = excluded.updated",
+            (provider, tokens - 1, updated),
+        )
+        conn.execute("COMMIT")
+    except RateLimitExceeded:
+        raise
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    _record_wait(provider, wait)
+    return wait
+
+
+def _record_wait(provider: str, wait: float) -> None:
+    """待機統計を加算する。"""
+    with _stats_lock:
+        s = _stats.setdefault(
+            provider,
+            {"requests": 0, "waited": 0, "total_wait": 0.0, "max_wait": 0.0},
+        )
+        s["requests"] += 1
+        if wait > 0:
+            s["waited"] += 1
+            s["total_wait"] += wait
+            s["max_wait"] = max(s["max_wait"], wait)
+
+
+def acquire(provider: str, max_wait: float | None = None) -> float:
+    """レート枠を 1 つ確保する (必要なら空くまでスレッドを待機させる)。
+
+    Args:
+        provider: プロバイダ名 ("finnhub", "fred", "reddit", "marketaux")
+        max_wait: 許容する最大待ち時間 (秒)。省略時は RATE_LIMIT_MAX_WAIT
+
+    Returns:
+        実際に待機した秒数
+    """
+    wait = _reserve(provider, RATE_LIMIT_MAX_WAIT if max_wait is None else max_wait)
+    if wait > 0:
+        time.sleep(wait)
+    return wait
+
+
+async def acquire_async(provider: str, max_wait: float | None = None) -> float:
+    """acquire の非同期版。待機中もイベントループをブロックしない。"""
+    wait = await asyncio.to_thread(
+        _reserve, provider, RATE_LIMIT_MAX_WAIT if max_wait is None else max_wait
+    )
+    if wait > 0:
+        await asyncio.sleep(wait)
+    return wait
+
+
+def tokens_remaining(provider: str) -> float:
+    """プロバイダの現在の残りトークン数を返す (予約済みの分は差し引く)。"""
+    limit = RATE_LIMITS[provider]
+    row = _connect().execute(
+        "SELECT tokens, updated FROM buckets WHERE provider = ?", (provider,)
+    ).fetchone()
+    if row is None:
+        return float(limit["capacity"])
+    tokens, _ = _refill(limit, row[0], row[1], time.time())
+    return tokens
+
+
+def get_rate_limit_stats() -> dict:
+    """プロバイダごとの待機統計と現在の残りトークン数を返す。"""
+    conn = _connect()
+    now = time.time()
+    remaining = {}
+    for provider, tokens, updated in conn.execute(
+        "SELECT provider, tokens, updated FROM buckets"
+    ):
+        if provider in RATE_LIMITS:
+            tokens, _ = _refill(RATE_LIMITS[provider], tokens, updated, now)
+            remaining[provider] = round(tokens, 2)
+
+    with _stats_lock:
+        stats = {}
+        for provider in RATE_LIMITS:
+            s = _stats.get(provider, {"requests": 0, "waited": 0, "total_wait": 0.0, "max_wait": 0.0})
+            stats[provider] = {
+                "requests": s["requests"],
+                "waited": s["waited"],
+                "total_wait": round(s["total_wait"], 3),
+                "avg_wait": round(s["total_wait"] / s["requests"], 3) if s["requests"] else 0.0,
+                "max_wait": round(s["max_wait"], 3),
+                "tokens_remaining": remaining.get(provider, float(RATE_LIMITS[provider]["capacity"])),
+            }
+    return stats
+
+
+def reset_rate_limit_stats() -> None:
+    """プロセス内の待機統計をリセットする (バケット状態は保持)。"""
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,158 @@
+"""データ層のレコード型 (記事・投稿・株価・観測値)。
+
+API レスポンスを 1 件ごとの辞書のまま受け渡すと、大量銘柄のバッチでは
+同じキーを持つ小さな辞書が大量に残る。データ層 (取得・キャッシュ・重複排除・
+ランキング) では __slots__ のレコードで保持し、LLM に渡す辞書への変換は
+ツールの戻り値を組み立てるときにだけ行う。
+
+    - Article: Finnhub / Marketaux のニュース記事 (ソースをまたいだ共通の型)
+    - RedditPost: Reddit 投稿 (ローカルインデックスの列と同じ項目)
+    - Quote: 株価 (REST の /quote とトレード WebSocket のブックで共有)
+    - Observation: FRED の観測値 (欠損値 "." は None)
+
+キャッシュのディスク層では encode / decode で型名付きの JSON として保存する。
+"""
+
+import copy
+from datetime import datetime, timezone
+from typing import Any, Mapping
+
+
+class Record:
+    """__slots__ のフィールドを持つレコードの基底クラス。"""
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        for name, value in zip(self.__slots__, args):
+            setattr(self, name, value)
+        for name in self.__slots__[len(args):]:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError(f"unexpected fields for {type(self).__name__}: {', '.join(kwargs)}")
+
+    def to_dict(self, fields: Mapping[str, str] | None = None) -> dict:
+        """辞書に変換する。
+
+        Args:
+            fields: {出力のキー: 属性名}。省略時はすべてのフィールドをそのままのキーで出力する
+        """
+        if fields is None:
+            return {name: getattr(self, name) for name in self.__slots__}
+        return {key: getattr(self, name) for key, name in fields.items()}
+
+    def values(self, names: list[str]) -> list:
+        """指定したフィールドの値のリストを返す (表形式の行に使う)。"""
+        return [getattr(self, name, None) for name in names]
+
+    def replace(self, **changes) -> "Record":
+        """一部のフィールドを差し替えたコピーを返す。"""
+        clone = copy.copy(self)
+        for name, value in changes.items():
+            setattr(clone, name, value)
+        return clone
+
+    def __copy__(self):
+        clone = object.__new__(type(self))
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
+    def __deepcopy__(self, memo):
+        clone = object.__new__(type(self))
+        for name in self.__slots__:
+            setattr(clone, name, copy.deepcopy(getattr(self, name), memo))
+        return clone
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Article(Record):
+    """ニュース記事。
+
+    timestamp は Finnhub の UNIX 時刻、published_at は Marketaux の ISO 8601 文字列。
+    sources / relevance は重複排除・ランキングで付与する。
+    """
+
+    __slots__ = (
+        "headline", "summary", "source", "url", "timestamp", "published_at",
+        "related", "sentiment_score", "entities", "sources", "relevance",
+    )
+
+    @property
+    def published(self) -> str | None:
+        """公開日時の ISO 8601 文字列 (Finnhub の記事は UNIX 時刻から変換する)。"""
+        if self.published_at is None and self.timestamp:
+            return datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat()
+        return self.published_at
+
+    def text(self) -> str:
+        """近似重複の判定に使う見出し + 要約。"""
+        return f"{self.headline or ''} {self.summary or ''}"
+
+    def to_dict(self, fields: Mapping[str, str] | None = None) -> dict:
+        """辞書に変換する。
+
+        fields にないセンチメント、まとめたソース (sources, source_count)、関連度は
+        値を持つ場合のみ付与する。
+        """
+        result = super().to_dict(fields)
+        if fields is None:
+            return result
+        if self.sentiment_score is not None and "sentiment_score" not in result:
+            result["sentiment_score"] = self.sentiment_score
+        if self.sources:
+            result["sources"] = self.sources
+            result["source_count"] = len(self.sources)
+        if self.relevance is not None:
+            result["relevance"] = self.relevance
+        return result
+
+
+class RedditPost(Record):
+    """Reddit 投稿。"""
+
+    __slots__ = (
+        "id", "subreddit", "title", "selftext", "score", "upvote_ratio",
+        "num_comments", "created_utc", "permalink", "stickied",
+    )
+
+
+class Quote(Record):
+    """株価 (get_stock_quote の出力と同じ項目)。"""
+
+    __slots__ = (
+        "symbol", "current_price", "change", "percent_change",
+        "high", "low", "open", "previous_close", "timestamp",
+    )
+
+
+class Observation(Record):
+    """FRED の観測値。"""
+
+    __slots__ = ("date", "value")
+
+
+_TYPES = {cls.__name__: cls for cls in (Article, RedditPost, Quote, Observation)}
+
+
+def encode(value: Any) -> Any:
+    """json.dumps の default。レコードを型名付きの辞書にする。"""
+    if isinstance(value, Record):
+        return {"__record__": type(value).__name__, **value.to_dict()}
+    return str(value)
+
+
+def decode(obj: dict) -> Any:
+    """json.loads の object_hook。encode した辞書をレコードに戻す。"""
+    name = obj.get("__record__")
+    if name is None:
+        return obj
+    return _TYPES[name](**{k: v for k, v in obj.items() if k != "__record__"})
@@ -0,0 +1,284 @@
+"""Reddit 投稿のローカルインデックス。
+
+常駐取り込み (tools/reddit_ingest.py) が収集した投稿を SQLite に保存し、
+get_reddit_hot_posts / search_reddit_posts がライブ API の代わりに
+ミリ秒単位で応答できるようにする。
+
+    - 投稿は ID で重複排除し、再取り込み時にスコア・コメント数を更新する
+    - キャッシュタグ ($AAPL) と大文字のティッカー表記をティッカー索引に登録する
+    - タイトルと本文は FTS5 の全文索引に登録する
+    - サブレディットごとの最終取り込み時刻で鮮度を判定する
+"""
+
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterable
+
+from ..config.settings import REDDIT_INDEX_DB, REDDIT_INDEX_HOT_WINDOW
+from .records import RedditPost
+
+# 投稿・検索クエリの語 (キャッシュタグの $ を含む)
+_TOKEN = re.compile(r"\$?[A-Za-z0-9]+")
+
+# 大文字で書かれてもティッカーとみなさない語 (WSB の略語・一般的な略称)
+_NOT_TICKERS = frozenset({
+    "AI", "AM", "AND", "ATH", "ATM", "BUY", "CEO", "CFO", "CPI", "DD", "DM",
+    "EDIT", "EOD", "EPS", "ETF", "EU", "FD", "FDS", "FED", "FOMC", "FOMO",
+    "FOR", "FYI", "GDP", "HODL", "IMO", "IPO", "IRA", "IT", "ITM", "IV",
+    "LOL", "MOASS", "NOT", "NYSE", "OP", "OTM", "PE", "PM", "PT", "SEC",
+    "SELL", "SPAC", "THE", "TLDR", "TO", "UK", "US", "USA", "USD", "WSB",
+    "YOLO", "YOY",
+})
+
+# posts テーブルの列 (RedditPost のフィールドと同じ順)
+_COLUMNS = RedditPost.__slots__
+
+# search_reddit_posts の sort ごとの並び順 (relevance は全文検索時のみ bm25)
+_SEARCH_ORDER = {
+    "top": "p.score DESC",
+    "new": "p.created_utc DESC",
+    "comments": "p.num_comments DESC",
+}
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    """スレッドごとの SQLite 接続を返す。"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(REDDIT_INDEX_DB) or ".", exist_ok=True)
+        conn = sqlite3.connect(REDDIT_INDEX_DB, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS posts ("
+            "id TEXT NOT NULL UNIQUE, subreddit TEXT NOT NULL COLLATE NOCASE, title TEXT NOT NULL, "
+            "selftext TEXT NOT NULL, score INTEGER NOT NULL, upvote_ratio REAL, "
+            "num_comments INTEGER, created_utc REAL NOT NULL, permalink TEXT NOT NULL, "
+            "stickied INTEGER NOT NULL, updated REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS posts_subreddit_created "
+            "ON posts (subreddit, created_utc)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tickers ("
+            "ticker TEXT NOT NULL, post_rowid INTEGER NOT NULL, "
+            "PRIMARY KEY (ticker, post_rowid)) WITHOUT ROWID"
+        )
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(title, selftext)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "subreddit TEXT PRIMARY KEY, last_ingested REAL NOT NULL)"
+        )
+        _local.conn = conn
+    return conn
+
+
+def as_ticker(token: str) -> str | None:
+    """語がティッカー表記ならティッカーを返す (それ以外は None)。
+
+    投稿のティッカー索引と検索クエリで共通の規則。キャッシュタグ ($F) は
+    1〜5 文字、$ なしの表記は 2〜5 文字の大文字のうち略語リストに含まれないもの。
+    """
+    if token.startswith("$"):
+        body = token[1:]
+        return body.upper() if body.isalpha() and len(body) <= 5 else None
+    if token.isalpha() and token.isupper() and 2 <= len(token) <= 5 and token not in _NOT_TICKERS:
+        return token
+    return None
+
+
+def extract_tickers(text: str) -> set[str]:
+    """テキスト中のキャッシュタグと大文字のティッカー表記を抽出する。"""
+    return {ticker for ticker in map(as_ticker, _TOKEN.findall(text)) if ticker}
+
+
+def upsert(records: Iterable[RedditPost]) -> int:
+    """投稿を保存する。既存の投稿はスコア等を更新する。
+
+    Args:
+        records: 投稿のレコード
+
+    Returns:
+        保存した件数
+    """
+    conn = _connect()
+    now = time.time()
+    count = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for record in records:
+            if not record.id:
+                continue
+            row = tuple(record.values(_COLUMNS))
+            row = (*row[:3], row[3] or "", *row[4:9], int(bool(row[9])))
+            rowid = conn.execute(
+                "INSERT INTO posts (id, subreddit, title, selftext, score, upvote_ratio, "
+                "num_comments, created_utc, permalink, stickied, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET title = excluded.title, "
+                "selftext = excluded.selftext, score = excluded.score, "
+                "upvote_ratio = excluded.upvote_ratio, num_comments = excluded.num_comments, "
+                "stickied = excluded.stickied, updated = excluded.updated "
+                "RETURNING rowid",
+                (*row, now),
+            ).fetchone()[0]
+            title, selftext = row[2], row[3]
+            conn.execute("DELETE FROM posts_fts WHERE rowid = ?", (rowid,))
+            conn.execute(
+                "INSERT INTO posts_fts (rowid, title, selftext) VALUES (?, ?, ?)",
+                (rowid, title, selftext),
+            )
+            conn.execute("DELETE FROM tickers WHERE post_rowid = ?", (rowid,))
+            conn.executemany(
+                "INSERT INTO tickers (ticker, post_rowid) VALUES (?, ?)",
+                [(t, rowid) for t in extract_tickers(f"{title}\n{selftext}")],
+            )
+            count += 1
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return count
+
+
+def mark_ingested(subreddits: list[str]) -> None:
+    """サブレディットの最終取り込み時刻を現在時刻に更新する。"""
+    now = time.time()
+    _connect().executemany(
+        "INSERT OR REPLACE INTO sources (subreddit, last_ingested) VALUES (?, ?)",
+        [(s.lower(), now) for s in subreddits],
+    )
+
+
+def is_fresh(subreddits: list[str], max_age: float) -> bool:
+    """全サブレディットが max_age 秒以内に取り込まれているか判定する。"""
+    names = [s.lower() for s in subreddits]
+    placeholders = ",".join("?" * len(names))
+    fresh = _connect().execute(
+        f"SELECT COUNT(*) FROM sources WHERE subreddit IN ({placeholders}) "
+        "AND last_ingested >= ?",
+        (*names, time.time() - max_age),
+    ).fetchone()[0]
+    return fresh == len(set(names))
+
+
+def prune(older_than: float) -> int:
+    """created_utc が older_than (UNIX 時刻) より古い投稿を削除する。"""
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rowids = [
+            (r,) for (r,) in conn.execute(
+                "SELECT rowid FROM posts WHERE created_utc < ?", (older_than,)
+            )
+        ]
+        conn.executemany("DELETE FROM posts_fts WHERE rowid = ?", rowids)
+        conn.executemany("DELETE FROM tickers WHERE post_rowid = ?", rowids)
+        conn.executemany("DELETE FROM posts WHERE rowid = ?", rowids)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return len(rowids)
+
+
+def _hot_rank(score: int, created_utc: float) -> float:
+    """Reddit の HOT ランキングと同じ式 (スコアの対数 + 投稿時刻)。"""
+    order = math.log10(max(abs(score), 1))
+    sign = 1 if score > 0 else -1 if score < 0 else 0
+    return sign * order + created_utc / 45000
+
+
+def _rows_to_records(rows: list[tuple]) -> list[RedditPost]:
+    """SELECT 結果の行を RedditPost に変換する。"""
+    return [RedditPost(*row) for row in rows]
+
+
+def hot(subreddits: list[str], limit: int) -> list[RedditPost]:
+    """HOT ランキング上位の投稿レコードを返す (固定投稿は除く)。"""
+    names = [s.lower() for s in subreddits]
+    placeholders = ",".join("?" * len(names))
+    rows = _connect().execute(
+        f"SELECT {', '.join(_COLUMNS)} FROM posts "
+        f"WHERE subreddit IN ({placeholders}) AND stickied = 0 "
+        "AND created_utc >= ?",
+        (*names, time.time() - REDDIT_INDEX_HOT_WINDOW),
+    ).fetchall()
+    records = _rows_to_records(rows)
+    records.sort(key=lambda r: _hot_rank(r.score, r.created_utc), reverse=True)
+    return records[:limit]
+
+
+def _split_query(query: str) -> tuple[list[str], list[str]]:
+    """検索クエリをティッカー語と全文検索語に分ける。
+
+    ティッカー索引と同じ規則 (as_ticker) でティッカー語を判定する。
+    索引に登録されない語 ("F" 等の 1 文字の大文字) は全文検索語として扱う。
+    """
+    tickers, terms = [], []
+    for token in _TOKEN.findall(query):
+        ticker = as_ticker(token)
+        if ticker:
+            tickers.append(ticker)
+        else:
+            terms.append(token.lstrip("$"))
+    return tickers, terms
+
+
+def search(query: str, subreddits: list[str], sort: str, limit: int) -> list[RedditPost]:
+    """インデックスから投稿を検索する。
+
+    ティッカー語はティッカー索引、それ以外の語は全文索引で照合し、
+    すべての語に一致する投稿を返す。
+
+    Args:
+        query: 検索キーワード (例: "$TSLA earnings", "AAPL")
+        subreddits: 対象サブレディット名のリスト
+        sort: "relevance", "hot", "top", "new", "comments"
+        limit: 最大件数
+    """
+    tickers, terms = _split_query(query)
+    if not tickers and not terms:
+        return []
+    names = [s.lower() for s in subreddits]
+    columns = ", ".join(f"p.{c}" for c in _COLUMNS)
+    sql = f"SELECT {columns} FROM posts p"
+    params: list = []
+    if terms:
+        sql += " JOIN posts_fts ON posts_fts.rowid = p.rowid"
+    sql += f" WHERE p.subreddit IN ({','.join('?' * len(names))})"
+    params.extend(names)
+    if terms:
+        sql += " AND posts_fts MATCH ?"
+        params.append(" ".join('"' + t.replace('"', "") + '"' for t in terms))
+    for ticker in tickers:
+        sql += " AND p.rowid IN (SELECT post_rowid FROM tickers WHERE ticker = ?)"
+        params.append(ticker)
+
+    if sort == "hot":
+        records = _rows_to_records(_connect().execute(sql, params).fetchall())
+        records.sort(key=lambda r: _hot_rank(r.score, r.created_utc), reverse=True)
+        return records[:limit]
+
+    if sort in _SEARCH_ORDER:
+        order = _SEARCH_ORDER[sort]
+    else:
+        order = "bm25(posts_fts)" if terms else "p.score DESC"
+    sql += f" ORDER BY {order} LIMIT ?"
+    params.append(limit)
+    return _rows_to_records(_connect().execute(sql, params).fetchall())
+
+
+def clear() -> None:
+    """保存済みの投稿と取り込み状態をすべて削除する。"""
+    conn = _connect()
+    for table in ("posts", "tickers", "posts_fts", "sources"):
+        conn.execute(f"DELETE FROM {table}")
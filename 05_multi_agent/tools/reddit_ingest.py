@@ -0,0 +1,132 @@
+"""Reddit 投稿の常駐取り込み。
+
+対象サブレディットの new / hot リスティングを定期的にポーリングし、
+ローカルインデックス (tools/reddit_index.py) に投稿を取り込む。
+new で新着投稿を、hot で既存投稿のスコア更新を拾う。
+
+取り込みが REDDIT_INDEX_MAX_AGE 以内に成功している間、Reddit ツールは
+ライブ API を呼ばずにインデックスから応答する。
+
+実行方法:
+    # 単独プロセスとして常駐
+    python -m 05_multi_agent.tools.reddit_ingest
+
+    # 1 回だけ取り込む
+    python -m 05_multi_agent.tools.reddit_ingest --once
+
+    # アプリケーション内でバックグラウンドスレッドとして起動
+    from .tools.reddit_ingest import start_ingestor
+    start_ingestor()
+"""
+
+import argparse
+import logging
+import threading
+import time
+
+from ..config.settings import (
+    REDDIT_INDEX_RETENTION,
+    REDDIT_INGEST_INTERVAL,
+    REDDIT_INGEST_SUBREDDITS,
+)
+from . import reddit_index
+from .rate_limiter import acquire
+from .reddit_tools import (
+    _get_reddit_client,
+    _is_reddit_configured,
+    _multireddit,
+    _split_subreddits,
+    _submission_record,
+)
+
+logger = logging.getLogger(__name__)
+
+# 1 リスティングあたりの取得件数 (Reddit API の 1 ページ上限)
+_LISTING_LIMIT = 100
+
+
+def ingest_once(subreddits: str = REDDIT_INGEST_SUBREDDITS) -> int:
+    """new / hot リスティングを 1 回取り込み、取り込んだ投稿数を返す。
+
+    Args:
+        subreddits: カンマ区切りのサブレディット名
+    """
+    subreddit_list = _split_subreddits(subreddits)
+    subreddit = _get_reddit_client().subreddit(_multireddit(subreddit_list))
+
+    records = {}
+    for listing in (subreddit.new, subreddit.hot):
+        acquire("reddit")
+        for post in listing(limit=_LISTING_LIMIT):
+            records[post.id] = _submission_record(post)
+
+    count = reddit_index.upsert(records.values())
+    reddit_index.mark_ingested(subreddit_list)
+    reddit_index.prune(time.time() - REDDIT_INDEX_RETENTION)
+    return count
+
+
+def run(
+    subreddits: str = REDDIT_INGEST_SUBREDDITS,
+    interval: float = REDDIT_INGEST_INTERVAL,
+    stop: threading.Event | None = None,
+) -> None:
+    """stop がセットされるまで interval 秒ごとに取り込みを繰り返す。
+
+    取り込みに失敗してもループは継続し、インデックスは鮮度切れになった時点で
+    ツール側がライブ API に切り替わる。
+    """
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        started = time.monotonic()
+        try:
+            count = ingest_once(subreddits)
+            logger.info("ingested %d reddit posts from %s", count, subreddits)
+        except Exception:
+            logger.exception("reddit ingestion failed")
+        stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+
+def start_ingestor(
+    subreddits: str = REDDIT_INGEST_SUBREDDITS,
+    interval: float = REDDIT_INGEST_INTERVAL,
+) -> threading.Event | None:
+    """取り込みループをデーモンスレッドで開始する。
+
+    Returns:
+        ループを止めるための Event。認証情報未設定時は起動せず None
+    """
+    if not _is_reddit_configured():
+        return None
+    stop = threading.Event()
+    threading.Thread(
+        target=run,
+        args=(subreddits, interval, stop),
+        name="reddit-ingestor",
+        daemon=True,
+    ).start()
+    return stop
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reddit 投稿のローカルインデックスへの常駐取り込み")
+    parser.add_argument("--subreddits", default=REDDIT_INGEST_SUBREDDITS)
+    parser.add_argument("--interval", type=float, default=REDDIT_INGEST_INTERVAL)
+    parser.add_argument("--once", action="store_true", help="1 回だけ取り込んで終了する")
+    args = parser.parse_args()
+
+    if not _is_reddit_configured():
+        parser.error("REDDIT_CLIENT_ID / REDDIT_CLIENT_SECRET が未設定です")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    if args.once:
+        print(f"{ingest_once(args.subreddits)} 件取り込みました")
+        return
+    try:
+        run(args.subreddits, args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""Reddit 投稿のローカルセンチメント採点 (辞書ベース, NumPy)。
+
+金融・WSB 向けの辞書で投稿ごとの強気/弱気スコアを計算し、件数・エンゲージメント
+加重スコア・注目投稿などの集計だけを LLM に渡す。I/O を持たない純粋関数のみ。
+
+    - "to the moon" / "rug pull" / 🌈🐻 などの WSB 表現を語句単位で採点する
+    - 罵倒語・スラング ("fucking", "retard", "ape" 等) は極性を持たず、直後の語を強める
+    - 否定語 (直前 3 語以内) で極性を反転し、"sold puts" のようなオプションの
+      売り買いは売買の向きで符号を決める
+    - 採点は投稿バッチ全体のトークン列に対する配列演算で行う
+"""
+
+import re
+
+import numpy as np
+
+# 語 (アポストロフィ含む)・数字・絵文字に分割する
+_TOKEN = re.compile(r"[A-Za-z][A-Za-z0-9']*|\d+|[\U0001F300-\U0001FAFF☀-➿]")
+
+# 極性辞書 (正: 強気 / 負: 弱気)。複数語の表現は空白区切りで登録する
+_LEXICON = {
+    # 強気
+    "bull": 1.5, "bulls": 1.5, "bullish": 2.5, "moon": 2.5, "mooning": 3.0,
+    "rocket": 2.0, "tendies": 2.0, "undervalued": 2.0,
+    "breakout": 2.0, "rally": 2.0, "rallying": 2.0, "squeeze": 1.5, "rip": 1.5,
+    "ripping": 2.0, "printing": 2.0, "gain": 1.5, "gains": 1.5, "green": 1.5,
+    "beat": 1.5, "beats": 1.5, "upgrade": 2.0, "upgraded": 2.0, "ath": 2.0,
+    "hodl": 1.5, "holding": 0.5, "lambo": 2.0, "cheap": 1.0, "bounce": 1.0,
+    "strong": 1.0, "growth": 1.0, "profit": 1.5, "profits": 1.5, "winning": 2.0,
+    "soaring": 2.5, "surge": 2.0, "surging": 2.5, "bagger": 2.5, "yolo": 1.0,
+    "\U0001F680": 2.5,  # 🚀
+    "\U0001F4C8": 2.0,  # 📈
+    "\U0001F402": 1.5,  # 🐂
+    "\U0001F48E": 1.0,  # 💎
+    "to the moon": 3.0, "short squeeze": 2.5, "buy the dip": 2.0, "btfd": 2.0,
+    "all in": 1.5, "diamond hands": 2.0, "\U0001F48E \U0001F64C": 2.0,
+    "strong buy": 3.0, "load up": 2.0, "loading up": 2.0, "free money": 2.0,
+    "going up": 2.0, "price target raised": 2.5, "killing it": 2.0,
+    # 弱気
+    "bear": -1.5, "bears": -1.5, "bearish": -2.5, "overvalued": -2.0,
+    "bubble": -2.0, "crash": -2.5, "crashing": -3.0, "dump": -2.0,
+    "dumping": -2.5, "tank": -2.0, "tanking": -2.5, "tanked": -2.5,
+    "drill": -1.5, "drilling": -2.0, "rug": -2.0, "bagholder": -2.0,
+    "bagholders": -2.0, "bagholding": -2.0, "bleeding": -2.0, "red": -1.5,
+    "loss": -1.5, "losses": -1.5, "miss": -1.5, "missed": -1.5,
+    "downgrade": -2.0, "downgraded": -2.0, "dead": -2.0, "rekt": -2.5,
+    "guh": -2.5, "fraud": -3.0, "bankrupt": -3.0, "bankruptcy": -3.0,
+    "dilution": -2.0, "recession": -1.5, "weak": -1.0, "plunge": -2.5,
+    "plunging": -2.5, "selloff": -2.0, "collapse": -3.0, "worthless": -3.0,
+    "\U0001F4C9": -2.0,  # 📉
+    "\U0001F43B": -1.5,  # 🐻
+    "\U0001F308 \U0001F43B": -2.5,  # 🌈🐻
+    "rug pull": -3.0, "rugpull": -3.0, "bag holder": -2.0, "bag holders": -2.0,
+    "margin call": -2.5, "dead cat bounce": -2.5, "priced in": -0.5,
+    "going down": -2.0, "sell off": -2.0, "price target cut": -2.5,
+    "paper hands": 0.0,
+}
+
+# オプション (コール/プット) と売買の動詞。向きは動詞の組み合わせで決まる
+_OPTIONS = {"calls": 2.0, "puts": -2.0, "leaps": 1.5}
+_BUY_VERBS = frozenset({"buy", "buying", "bought", "long", "grab", "grabbed", "got"})
+_SELL_VERBS = frozenset({"sell", "selling", "sold", "short", "shorting", "shorted", "write", "wrote", "writing"})
+# 単独の売買動詞の極性 (オプションが続く場合は 0 になる)
+_VERB_WEIGHTS = {
+    "buy": 1.0, "buying": 1.0, "bought": 1.0, "long": 1.0,
+    "sell": -1.0, "selling": -1.0, "sold": -1.0,
+    "short": -1.5, "shorting": -2.0, "shorted": -1.5,
+}
+
+# 直後の語を強める語。攻撃的なスラングは極性を持たずここに含める
+_INTENSIFIERS = {
+    "very": 1.3, "extremely": 1.5, "super": 1.3, "so": 1.2, "really": 1.2,
+    "absolutely": 1.4, "literally": 1.2, "hella": 1.3, "mega": 1.3,
+    "massive": 1.4, "massively": 1.4, "huge": 1.3, "insane": 1.4, "insanely": 1.4,
+    "crazy": 1.3, "holy": 1.3, "fucking": 1.5, "fuckin": 1.5, "fking": 1.5,
+    "damn": 1.3, "freaking": 1.3, "goddamn": 1.4,
+}
+
+# 否定語 (直前 _NEGATION_WINDOW 語以内にあれば極性を反転・減衰する)
+_NEGATORS = frozenset({
+    "not", "no", "never", "dont", "don't", "isnt", "isn't", "wont", "won't",
+    "cant", "can't", "aint", "ain't", "doesnt", "doesn't", "didnt", "didn't",
+    "wasnt", "wasn't", "arent", "aren't", "shouldnt", "shouldn't", "wouldnt",
+    "wouldn't", "without", "nobody", "nothing", "neither", "nor", "hardly",
+})
+_NEGATION_WINDOW = 3
+_NEGATION_FACTOR = -0.74
+
+# 全大文字の極性語 ("MOON", "CRASH") の強調倍率
+_CAPS_FACTOR = 1.25
+# タイトルの語の重み (本文より重視する)
+_TITLE_WEIGHT = 1.5
+# スコアの正規化定数 (score / sqrt(score^2 + alpha) で -1〜1 に収める)
+_ALPHA = 15.0
+# 強気/弱気と判定するスコアの閾値
+_THRESHOLD = 0.05
+
+# 複数語の表現: 先頭の語 → 語数の降順の表現のタプル
+_PHRASES: dict[str, list[tuple[str, ...]]] = {}
+for _phrase in sorted((p for p in _LEXICON if " " in p), key=lambda p: -len(p.split())):
+    _parts = tuple(_phrase.split())
+    _PHRASES.setdefault(_parts[0], []).append(_parts)
+
+
+def _tokenize(text: str) -> tuple[list[str], list[bool]]:
+    """テキストを語句に分割する (登録済みの複数語の表現は 1 語にまとめる)。
+
+    Returns:
+        (小文字化した語句のリスト, 元の表記が全大文字かどうかのリスト)
+    """
+    raw = _TOKEN.findall(text)
+    lower = [t.lower() for t in raw]
+    terms, caps = [], []
+    i = 0
+    while i < len(lower):
+        for parts in _PHRASES.get(lower[i], ()):
+            if tuple(lower[i:i + len(parts)]) == parts:
+                terms.append(" ".join(parts))
+                caps.append(all(t.isupper() for t in raw[i:i + len(parts)]))
+                i += len(parts)
+                break
+        else:
+            terms.append(lower[i])
+            caps.append(len(raw[i]) > 1 and raw[i].isupper())
+            i += 1
+    return terms, caps
+
+
+def _shift(values: np.ndarray, doc: np.ndarray, k: int, fill) -> np.ndarray:
+    """各位置の k 語前 (同じ投稿内) の値を返す。投稿の先頭をまたぐ位置は fill。"""
+    result = np.full_like(values, fill)
+    if 0 < k < values.size:
+        same = doc[k:] == doc[:-k]
+        result[k:] = np.where(same, values[:-k], fill)
+    return result
+
+
+def _lead(values: np.ndarray, doc: np.ndarray, k: int, fill) -> np.ndarray:
+    """各位置の k 語後 (同じ投稿内) の値を返す。投稿の末尾をまたぐ位置は fill。"""
+    result = np.full_like(values, fill)
+    if 0 < k < values.size:
+        same = doc[:-k] == doc[k:]
+        result[:-k] = np.where(same, values[k:], fill)
+    return result
+
+
+def score_texts(titles: list[str], bodies: list[str]) -> tuple[np.ndarray, list[list[str]]]:
+    """投稿ごとのセンチメントスコア (-1〜1) と、採点に寄与した語句を返す。
+
+    Args:
+        titles: 投稿タイトルのリスト
+        bodies: 投稿本文のリスト (titles と同じ長さ)
+
+    Returns:
+        (スコアの配列, 投稿ごとの極性語句のリスト)
+    """
+    n = len(titles)
+    terms: list[str] = []
+    caps: list[bool] = []
+    doc_ids: list[int] = []
+    in_title: list[bool] = []
+    for i, (title, body) in enumerate(zip(titles, bodies)):
+        for text, is_title in ((title or "", True), (body or "", False)):
+            t, c = _tokenize(text)
+            terms.extend(t)
+            caps.extend(c)
+            doc_ids.extend([i] * len(t))
+            in_title.extend([is_title] * len(t))
+    if not terms:
+        return np.zeros(n), [[] for _ in range(n)]
+
+    doc = np.array(doc_ids, dtype=np.int64)
+    lexicon = np.array([_LEXICON.get(t, 0.0) for t in terms])
+    option = np.array([_OPTIONS.get(t, 0.0) for t in terms])
+    verb = np.array([_VERB_WEIGHTS.get(t, 0.0) for t in terms])
+    is_buy = np.array([t in _BUY_VERBS for t in terms])
+    is_sell = np.array([t in _SELL_VERBS for t in terms])
+    boost = np.array([_INTENSIFIERS.get(t, 1.0) for t in terms])
+    is_negator = np.array([t in _NEGATORS for t in terms])
+
+    # オプションの符号は直前 2 語の売買動詞で決まる ("sold puts" は強気)
+    sold = _shift(is_sell, doc, 1, False) | _shift(is_sell, doc, 2, False)
+    bought = _shift(is_buy, doc, 1, False) | _shift(is_buy, doc, 2, False)
+    option = np.where(sold & ~bought, -option, option)
+    # 直後 2 語以内にオプションが続く売買動詞は極性を持たない
+    followed = (_lead(option, doc, 1, 0.0) != 0) | (_lead(option, doc, 2, 0.0) != 0)
+    verb = np.where(followed, 0.0, verb)
+
+    weight = lexicon + option + verb
+    weight *= _shift(boost, doc, 1, 1.0)
+    weight *= np.where(np.array(caps) & (weight != 0), _CAPS_FACTOR, 1.0)
+    negated = np.zeros(len(terms), dtype=bool)
+    for k in range(1, _NEGATION_WINDOW + 1):
+        negated |= _shift(is_negator, doc, k, False)
+    weight *= np.where(negated, _NEGATION_FACTOR, 1.0)
+    weight *= np.where(np.array(in_title), _TITLE_WEIGHT, 1.0)
+
+    raw = np.bincount(doc, weights=weight, minlength=n)
+    scores = raw / np.sqrt(raw * raw + _ALPHA)
+
+    # 否定された語句は頻出語句に含めない
+    hits: list[list[str]] = [[] for _ in range(n)]
+    for p in np.flatnonzero((weight != 0) & ~negated):
+        hits[doc[p]].append(terms[p] if weight[p] > 0 else f"-{terms[p]}")
+    return scores, hits
+
+
+def _label(score: float) -> str:
+    """スコアを bullish / bearish / neutral に分類する。"""
+    if score > _THRESHOLD:
+        return "bullish"
+    if score < -_THRESHOLD:
+        return "bearish"
+    return "neutral"
+
+
+def _top_terms(hits: list[list[str]], sign: str, top_n: int) -> list[dict]:
+    """強気 (sign="+") / 弱気 (sign="-") に寄与した語句を出現投稿数の多い順に返す。"""
+    counts: dict[str, int] = {}
+    for post_hits in hits:
+        for hit in set(post_hits):
+            if hit.startswith("-") == (sign == "-"):
+                term = hit.lstrip("-")
+                counts[term] = counts.get(term, 0) + 1
+    ranked = sorted(counts.items(), key=lambda kv: -kv[1])[:top_n]
+    return [{"term": term, "posts": count} for term, count in ranked]
+
+
+def summarize_posts(posts: list[dict], top_n: int = 5) -> dict:
+    """投稿リスト (Reddit ツールの posts) のセンチメント集計を返す。
+
+    Args:
+        posts: [{"title", "selftext", "subreddit", "score", "num_comments", "url"}, ...]
+        top_n: 注目投稿・頻出語句として返す件数
+
+    Returns:
+        件数 (強気/弱気/中立)、平均スコア、エンゲージメント加重スコア、
+        サブレディット別の集計、頻出語句、エンゲージメント上位の投稿
+    """
+    if not posts:
+        return {
+            "total_posts": 0,
+            "bullish_posts": 0,
+            "bearish_posts": 0,
+            "neutral_posts": 0,
+            "bullish_ratio": None,
+            "mean_score": 0.0,
+            "weighted_score": 0.0,
+            "average_engagement": 0.0,
+            "subreddits": [],
+            "top_terms": {"bullish": [], "bearish": []},
+            "top_posts": [],
+        }
+    scores, hits = score_texts(
+        [p.get("title") or "" for p in posts], [p.get("selftext") or "" for p in posts]
+    )
+    upvotes = np.array([max(p.get("score") or 0, 0) for p in posts], dtype=np.float64)
+    comments = np.array([p.get("num_comments") or 0 for p in posts], dtype=np.float64)
+    engagement = upvotes + comments
+    weights = 1.0 + np.log1p(engagement)
+    labels = np.where(scores > _THRESHOLD, 1, np.where(scores < -_THRESHOLD, -1, 0))
+
+    subreddit_names = [p.get("subreddit") or "" for p in posts]
+    by_subreddit = []
+    for name in dict.fromkeys(subreddit_names):
+        mask = np.array([s == name for s in subreddit_names])
+        by_subreddit.append({
+            "subreddit": name,
+            "posts": int(mask.sum()),
+            "bullish": int((labels[mask] == 1).sum()),
+            "bearish": int((labels[mask] == -1).sum()),
+            "weighted_score": round(float(np.average(scores[mask], weights=weights[mask])), 3),
+        })
+    by_subreddit.sort(key=lambda s: -s["posts"])
+
+    top = np.argsort(-engagement, kind="stable")[:top_n]
+    bullish, bearish = int((labels == 1).sum()), int((labels == -1).sum())
+    return {
+        "total_posts": len(posts),
+        "bullish_posts": bullish,
+        "bearish_posts": bearish,
+        "neutral_posts": len(posts) - bullish - bearish,
+        "bullish_ratio": round(bullish / (bullish + bearish), 3) if bullish + bearish else None,
+        "mean_score": round(float(scores.mean()), 3),
+        "weighted_score": round(float(np.average(scores, weights=weights)), 3),
+        "average_engagement": round(float(engagement.mean()), 1),
+        "subreddits": by_subreddit,
+        "top_terms": {
+            "bullish": _top_terms(hits, "+", top_n),
+            "bearish": _top_terms(hits, "-", top_n),
+        },
+        "top_posts": [
+            {
+                "title": posts[i].get("title"),
+                "subreddit": posts[i].get("subreddit"),
+                "score": posts[i].get("score"),
+                "num_comments": posts[i].get("num_comments"),
+                "sentiment": _label(float(scores[i])),
+                "sentiment_score": round(float(scores[i]), 3),
+                "url": posts[i].get("url"),
+            }
+            for i in top
+        ],
+    }
@@ -5,9 +5,26 @@ Reddit (r/wallstreetbets, r/stocks 等) から投稿を取得し、
 無料枠: 100 req/min (OAuth 認証時)
 """
 
+import threading
+
 import praw
 
-from ..config.settings import REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USER_AGENT
+from ..config.settings import (
+    REDDIT_CLIENT_ID,
+    REDDIT_CLIENT_SECRET,
+    REDDIT_INDEX_MAX_AGE,
+    REDDIT_OAUTH_URL,
+    REDDIT_URL,
+    REDDIT_USER_AGENT,
+)
+from . import reddit_index, reddit_sentiment
+from .http_client import create_session
+from .rate_limiter import acquire
+from .records import RedditPost
+from .singleflight import coalesced
+
+_client: praw.Reddit | None = None
+_client_lock = threading.Lock()
 
 
 def _is_reddit_configured() -> bool:
@@ -16,14 +33,111 @@ def _is_reddit_configured() -> bool:
 
 
 def _get_reddit_client() -> praw.Reddit:
-    """Reddit API クライアントを生成する。"""
-    return praw.Reddit(
-        client_id=REDDIT_CLIENT_ID,
-        client_secret=REDDIT_CLIENT_SECRET,
-        user_agent=REDDIT_USER_AGENT,
+    """プロセス共有の Reddit API クライアントを返す。
+
+    初回呼び出し時にのみ生成し、OAuth トークンは PRAW が期限まで再利用する。
+    PRAW (prawcore) はセッションの User-Agent を書き換えるため、共有セッションではなく
+    同じプール設定の専用セッションを渡す。
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = praw.Reddit(
+                    client_id=REDDIT_CLIENT_ID,
+                    client_secret=REDDIT_CLIENT_SECRET,
+                    user_agent=REDDIT_USER_AGENT,
+                    reddit_url=REDDIT_URL,
+                    oauth_url=REDDIT_OAUTH_URL,
+                    requestor_kwargs={"session": create_session()},
+                )
+    return _client
+
+
+def _multireddit(subreddit_list: list[str]) -> str:
+    """複数サブレディットを 1 リクエストで扱う "a+b+c" 形式の名前を返す。"""
+    return "+".join(subreddit_list)
+
+
+def _combined_limit(limit: int, subreddit_list: list[str]) -> int:
+    """サブレディットごとの件数を統合リスティングの件数に換算する。"""
+    return limit * len(subreddit_list)
+
+
+def _not_configured() -> dict:
+    """認証情報未設定時の結果を返す。"""
+    return {
+        "error": "Reddit API credentials not configured (REDDIT_CLIENT_ID / REDDIT_CLIENT_SECRET). Skipping Reddit data.",
+        "subreddits": [],
+        "total_posts": 0,
+        "posts": [],
+    }
+
+
+def _split_subreddits(subreddits: str) -> list[str]:
+    """カンマ区切りのサブレディット名をリストに分割する。"""
+    return [s.strip() for s in subreddits.split(",")]
+
+
+def _post_to_dict(post: RedditPost) -> dict:
+    """投稿をツール出力の形式に変換する。"""
+    return {
+        "subreddit": post.subreddit,
+        "title": post.title,
+        "score": post.score,
+        "upvote_ratio": post.upvote_ratio,
+        "num_comments": post.num_comments,
+        "created_utc": post.created_utc,
+        "selftext": post.selftext[:500] if post.selftext else "",
+        "url": f"https://reddit.com{post.permalink}",
+    }
+
+
+def _submission_record(post) -> RedditPost:
+    """PRAW の Submission を RedditPost に変換する。"""
+    return RedditPost(
+        post.id,
+        post.subreddit.display_name,
+        post.title,
+        post.selftext,
+        post.score,
+        post.upvote_ratio,
+        post.num_comments,
+        post.created_utc,
+        post.permalink,
+        post.stickied,
     )
 
 
+def _index_is_fresh(subreddit_list: list[str]) -> bool:
+    """ローカルインデックスから応答できるか判定する。"""
+    return reddit_index.is_fresh(subreddit_list, REDDIT_INDEX_MAX_AGE)
+
+
+def _hot_result(subreddit_list: list[str], records: list[RedditPost]) -> dict:
+    """HOT 投稿からツールの結果を組み立てる (固定投稿は除く)。"""
+    records = sorted((r for r in records if not r.stickied), key=lambda r: r.score, reverse=True)
+    all_posts = [_post_to_dict(r) for r in records]
+    return {
+        "subreddits": subreddit_list,
+        "total_posts": len(all_posts),
+        "posts": all_posts,
+    }
+
+
+def _search_result(query: str, subreddit_list: list[str], records: list[RedditPost]) -> dict:
+    """検索結果の投稿からツールの結果を組み立てる。"""
+    records = sorted(records, key=lambda r: r.score, reverse=True)
+    all_posts = [_post_to_dict(r) for r in records]
+    return {
+        "query": query,
+        "subreddits": subreddit_list,
+        "total_posts": len(all_posts),
+        "posts": all_posts,
+    }
+
+
+@coalesced("reddit_hot")
 def get_reddit_hot_posts(
     subreddits: str = "wallstreetbets,stocks,investing",
     limit: int = 20,
@@ -32,6 +146,8 @@ def get_reddit_hot_posts(
 
     指定したサブレディットの HOT 投稿を取得し、
     個人投資家の注目トピックを把握する。
+    複数のサブレディットは "a+b+c" の統合リスティング 1 回で取得する。
+    常駐取り込みでインデックスが新しい間はローカルインデックスから応答する。
 
     Args:
         subreddits: カンマ区切りのサブレディット名
@@ -42,42 +158,22 @@ def get_reddit_hot_posts(
         各サブレディットの人気投稿リスト (タイトル, スコア, コメント数等)
     """
     if not _is_reddit_configured():
-        return {
-            "error": "Reddit API credentials not configured (REDDIT_CLIENT_ID / REDDIT_CLIENT_SECRET). Skipping Reddit data.",
-            "subreddits": [],
-            "total_posts": 0,
-            "posts": [],
-        }
+        return _not_configured()
 
-    reddit = _get_reddit_client()
-    subreddit_list = [s.strip() for s in subreddits.split(",")]
-
-    all_posts = []
-    for sub_name in subreddit_list:
-        subreddit = reddit.subreddit(sub_name)
-        for post in subreddit.hot(limit=limit):
-            if post.stickied:
-                continue
-            all_posts.append({
-                "subreddit": sub_name,
-                "title": post.title,
-                "score": post.score,
-                "upvote_ratio": post.upvote_ratio,
-                "num_comments": post.num_comments,
-                "created_utc": post.created_utc,
-                "selftext": post.selftext[:500] if post.selftext else "",
-                "url": f"https://reddit.com{post.permalink}",
-            })
-
-    all_posts.sort(key=lambda x: x["score"], reverse=True)
+    subreddit_list = _split_subreddits(subreddits)
+    combined_limit = _combined_limit(limit, subreddit_list)
+    if _index_is_fresh(subreddit_list):
+        return _hot_result(subreddit_list, reddit_index.hot(subreddit_list, combined_limit))
 
-    return {
-        "subreddits": subreddit_list,
-        "total_posts": len(all_posts),
-        "posts": all_posts,
-    }
+    reddit = _get_reddit_client()
+    acquire("reddit")
+    subreddit = reddit.subreddit(_multireddit(subreddit_list))
+    records = [_submission_record(post) for post in subreddit.hot(limit=combined_limit)]
+    reddit_index.upsert(records)
+    return _hot_result(subreddit_list, records)
 
 
+@coalesced("reddit_search")
 def search_reddit_posts(
     query: str,
     subreddits: str = "wallstreetbets,stocks,investing",
@@ -88,6 +184,9 @@ def search_reddit_posts(
 
     特定の銘柄やトピックに関する投稿を検索し、
     個人投資家の議論内容と感情を把握する。
+    複数のサブレディットは "a+b+c" の統合検索 1 回で取得する。
+    常駐取り込みでインデックスが新しい間はローカルインデックス
+    (ティッカー索引・全文索引) から応答する。
 
     Args:
         query: 検索キーワード (例: "AAPL earnings", "Tesla")
@@ -100,37 +199,61 @@ def search_reddit_posts(
         検索結果の投稿リスト
     """
     if not _is_reddit_configured():
-        return {
-            "error": "Reddit API credentials not configured (REDDIT_CLIENT_ID / REDDIT_CLIENT_SECRET). Skipping Reddit data.",
-            "query": query,
-            "subreddits": [],
-            "total_posts": 0,
-            "posts": [],
-        }
+        return {"query": query, **_not_configured()}
+
+    subreddit_list = _split_subreddits(subreddits)
+    combined_limit = _combined_limit(limit, subreddit_list)
+    if _index_is_fresh(subreddit_list):
+        records = reddit_index.search(query, subreddit_list, sort, combined_limit)
+        return _search_result(query, subreddit_list, records)
 
     reddit = _get_reddit_client()
-    subreddit_list = [s.strip() for s in subreddits.split(",")]
-
-    all_posts = []
-    for sub_name in subreddit_list:
-        subreddit = reddit.subreddit(sub_name)
-        for post in subreddit.search(query, sort=sort, limit=limit):
-            all_posts.append({
-                "subreddit": sub_name,
-                "title": post.title,
-                "score": post.score,
-                "upvote_ratio": post.upvote_ratio,
-                "num_comments": post.num_comments,
-                "created_utc": post.created_utc,
-                "selftext": post.selftext[:500] if post.selftext else "",
-                "url": f"https://reddit.com{post.permalink}",
-            })
-
-    all_posts.sort(key=lambda x: x["score"], reverse=True)
+    acquire("reddit")
+    subreddit = reddit.subreddit(_multireddit(subreddit_list))
+    records = [
+        _submission_record(post)
+        for post in subreddit.search(query, sort=sort, limit=combined_limit)
+    ]
+    reddit_index.upsert(records)
+    return _search_result(query, subreddit_list, records)
 
-    return {
+
+def get_reddit_sentiment_summary(
+    query: str = "",
+    subreddits: str = "wallstreetbets,stocks,investing",
+    limit: int = 20,
+    top_n: int = 5,
+) -> dict:
+    """Reddit 投稿のセンチメントを集計して取得する。
+
+    投稿をローカルの金融・WSB 向け辞書で採点し、投稿本文の代わりに
+    強気/弱気/中立の件数、エンゲージメント加重スコア、サブレディット別の集計、
+    頻出語句、エンゲージメント上位の投稿だけを返す。
+    WSB の攻撃的な表現 (罵倒語・スラング) は極性として数えない。
+
+    Args:
+        query: 検索キーワード (例: "AAPL")。空文字なら HOT 投稿を集計する
+        subreddits: カンマ区切りのサブレディット名
+            (例: "wallstreetbets,stocks,investing")
+        limit: サブレディットごとの取得件数 (デフォルト: 20)
+        top_n: 注目投稿・頻出語句の件数 (デフォルト: 5)
+
+    Returns:
+        センチメント集計 (件数, 平均・加重スコア, サブレディット別, 頻出語句, 注目投稿)
+    """
+    if query:
+        result = search_reddit_posts(query, subreddits, limit=limit)
+    else:
+        result = get_reddit_hot_posts(subreddits, limit)
+    return _sentiment_result(query, result, top_n)
+
+
+def _sentiment_result(query: str, result: dict, top_n: int) -> dict:
+    """投稿取得の結果からセンチメント集計の結果を組み立てる。"""
+    summary = {
         "query": query,
-        "subreddits": subreddit_list,
-        "total_posts": len(all_posts),
-        "posts": all_posts,
+        **reddit_sentiment.summarize_posts(result["posts"], top_n),
     }
+    if "error" in result:
+        summary["error"] = result["error"]
+    return summary
@@ -0,0 +1,172 @@
+"""同一ツール呼び出しの合流 (single-flight)。
+
+Phase 1 の 3 エージェントや複数銘柄のバッチが同じ引数のツールを同時に呼ぶと、
+キャッシュが埋まる前に同じ API リクエストが重複して飛ぶ。実行中の呼び出しと
+同じキーの呼び出しは新たに API を叩かず、先行する呼び出しの結果を共有する。
+
+    - 同期関数: スレッド間で合流 (threading.Event で完了を待つ)
+    - async 関数: 同一イベントループ内のタスク間で合流 (asyncio.Event)
+    - 先行呼び出しが例外で終わった場合は後続にも同じ例外を送出する
+"""
+
+import asyncio
+import copy
+import functools
+import inspect
+import json
+import threading
+import weakref
+from typing import Any, Awaitable, Callable
+
+
+def make_call_key(endpoint: str, signature: inspect.Signature, args, kwargs) -> str:
+    """エンドポイント名と引数 (デフォルト値を補完したもの) から呼び出しキーを生成する。"""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return f"{endpoint}:{json.dumps(bound.arguments, sort_keys=True, default=str)}"
+
+
+class _Call:
+    """実行中の呼び出し 1 件の結果を後続に渡す入れ物。"""
+
+    def __init__(self, done):
+        self.done = done
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """キーごとに実行中の呼び出しを 1 つに制限し、結果を共有する。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._async_calls: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, _Call]
+        ] = weakref.WeakKeyDictionary()
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def _count(self, endpoint: str, key: str) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(endpoint, {"upstream": 0, "coalesced": 0})
+            entry[key] += 1
+
+    def do(self, endpoint: str, key: str, fn: Callable[[], Any]) -> Any:
+        """fn を実行する。同じキーが実行中ならその結果を待って返す。"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call(threading.Event())
+
+        if not leader:
+            self._count(endpoint, "coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        self._count(endpoint, "upstream")
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(
+        self, endpoint: str, key: str, fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """do の非同期版。同じイベントループ内の呼び出しだけを合流させる。"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._async_calls.setdefault(loop, {})
+            call = calls.get(key)
+            leader = call is None
+            if leader:
+                call = calls[key] = _Call(asyncio.Event())
+
+        if not leader:
+            self._count(endpoint, "coalesced")
+            await call.done.wait()
+            if isinstance(call.error, asyncio.CancelledError):
+                # 先行タスクがキャンセルされた場合は自分で実行し直す
+                return await self.do_async(endpoint, key, fn)
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        self._count(endpoint, "upstream")
+        try:
+            call.result = await fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        """エンドポイントごとの実行数 (upstream) と合流数 (coalesced) を返す。"""
+        with self._lock:
+            endpoints = {endpoint: dict(s) for endpoint, s in self._stats.items()}
+        return {
+            "upstream": sum(s["upstream"] for s in endpoints.values()),
+            "coalesced": sum(s["coalesced"] for s in endpoints.values()),
+            "endpoints": endpoints,
+        }
+
+    def reset_stats(self) -> None:
+        """統計をリセットする。"""
+        with self._lock:
+            self._stats.clear()
+
+
+_flight = SingleFlight()
+
+
+def coalesced(endpoint: str):
+    """同一引数の同時呼び出しを合流させるデコレータ (同期・async 両対応)。
+
+    Args:
+        endpoint: 統計とキーに使うエンドポイント名
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = make_call_key(endpoint, signature, args, kwargs)
+                return await _flight.do_async(
+                    endpoint, key, lambda: func(*args, **kwargs)
+                )
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_call_key(endpoint, signature, args, kwargs)
+            return _flight.do(endpoint, key, lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def get_coalescing_stats() -> dict:
+    """合流統計を返す (coalesced が API 呼び出しを節約できた回数)。"""
+    return _flight.stats()
+
+
+def reset_coalescing_stats() -> None:
+    """合流統計をリセットする (パイプライン 1 回分の計測の開始時に呼ぶ)。"""
+    _flight.reset_stats()
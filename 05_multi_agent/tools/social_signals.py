@@ -0,0 +1,260 @@
+"""ソーシャルセンチメント時系列の異常検知 (NumPy)。
+
+Finnhub /stock/social-sentiment の時間バケットごとのメンション数・ポジティブ/
+ネガティブメンションを時系列のまま扱い、メンション速度・ローリング z スコア・
+ポジティブ/ネガティブの乖離を計算して、閾値による決定的なルールで異常を検出する。
+I/O を持たない純粋関数のみ。
+
+    - バケットの間隔 (時刻の差の中央値) に時刻を丸めて等間隔の系列に並べ、
+      Finnhub が返さなかったバケット (夜間等) はメンション 0 件として
+      合計に含めるが、速度・z スコアの計算からは除く (昼夜の差を異常としない)
+    - z スコアは当該バケットを含まない直前 window バケットの中央値・MAD を基準にする
+    - メンション数の標準偏差はポアソン近似 (sqrt(中央値)) を下限とし、
+      ほぼ 0 件の系列で 1 件増えただけのバケットを異常としない
+"""
+
+import numpy as np
+
+from ..config.settings import SOCIAL_ANOMALY_ZSCORE, SOCIAL_ZSCORE_WINDOW
+
+# z スコアを計算する基準バケット数の下限
+_MIN_BASELINE = 3
+# ネット センチメントの異常判定に必要なバケットのメンション数の下限
+_MIN_SENTIMENT_MENTIONS = 5
+# ネット センチメント (-1〜1) の標準偏差の下限
+_SENTIMENT_STD_FLOOR = 0.05
+# recent として返すバケット数
+_RECENT_BUCKETS = 12
+# バケットが 1 つしかない場合の間隔 (秒)
+_DEFAULT_STEP = 3600
+
+RECENT_COLUMNS = [
+    "time", "mentions", "velocity", "mention_zscore",
+    "net_sentiment", "sentiment_zscore", "divergence",
+]
+
+
+def to_series(entries: list[dict]) -> dict[str, np.ndarray]:
+    """Finnhub のバケットのリストを等間隔の時系列に変換する。
+
+    Args:
+        entries: [{"atTime": "YYYY-MM-DD HH:MM:SS", "mention", "positiveMention",
+            "negativeMention", "positiveScore", "negativeScore", "score"}, ...]
+
+    Returns:
+        time (datetime64[s]), mentions, positive, negative (メンション数),
+        score (Finnhub のスコア, 欠損は NaN), observed (バケットの有無) の配列を持つ辞書
+        (時刻の昇順)
+    """
+    rows = [e for e in entries if e.get("atTime")]
+    if not rows:
+        empty = np.array([], dtype=np.float64)
+        return {
+            "time": np.array([], dtype="datetime64[s]"),
+            "mentions": empty, "positive": empty, "negative": empty, "score": empty,
+            "observed": np.array([], dtype=bool),
+        }
+    seconds = np.array(
+        [e["atTime"].replace(" ", "T") for e in rows], dtype="datetime64[s]"
+    ).astype(np.int64)
+    mentions = np.array([e.get("mention") or 0 for e in rows], dtype=np.float64)
+    positive = np.array([e.get("positiveMention") or 0 for e in rows], dtype=np.float64)
+    negative = np.array([e.get("negativeMention") or 0 for e in rows], dtype=np.float64)
+    score = np.array(
+        [np.nan if e.get("score") is None else e["score"] for e in rows], dtype=np.float64
+    )
+
+    # 時刻の差の中央値 (分単位) をバケットの間隔とし、各時刻を最も近いバケットに丸める。
+    # 間隔からずれた時刻が 1 つあってもグリッドは細かくならず、同じバケットは合算する
+    gaps = np.diff(np.unique(seconds))
+    step = max(int(round(float(np.median(gaps)) / 60)) * 60, 60) if gaps.size else _DEFAULT_STEP
+    unique, inverse = np.unique((seconds + step // 2) // step * step, return_inverse=True)
+    grid = np.arange(unique[0], unique[-1] + step, step)
+    slot = ((unique - unique[0]) // step)[inverse]
+
+    def regrid(values: np.ndarray, fill: float = 0.0) -> np.ndarray:
+        result = np.full(grid.shape, fill)
+        if np.isnan(fill):
+            result[slot] = values
+        else:
+            np.add.at(result, slot, values)
+        return result
+
+    return {
+        "time": grid.astype("datetime64[s]"),
+        "mentions": regrid(mentions),
+        "positive": regrid(positive),
+        "negative": regrid(negative),
+        "score": regrid(score, np.nan),
+        "observed": np.isin(grid, unique),
+    }
+
+
+def velocity(values: np.ndarray) -> np.ndarray:
+    """バケットあたりの増減 (1 つ前のバケットとの差) を返す。先頭は NaN。"""
+    result = np.full(values.shape, np.nan)
+    result[1:] = np.diff(values)
+    return result
+
+
+def baseline_zscore(
+    values: np.ndarray,
+    window: int,
+    std_floor: float = 0.0,
+    poisson: bool = False,
+) -> np.ndarray:
+    """直前 window バケット (当該バケットを含まない) に対するロバスト z スコアを返す。
+
+    基準の中央値と MAD (中央絶対偏差 × 1.4826) を使うため、基準の期間に
+    含まれる過去のスパイクで後続の異常が埋もれない。
+    基準のバケットが _MIN_BASELINE に満たない位置と、値が NaN の位置は NaN。
+
+    Args:
+        values: 系列 (NaN は基準から除く)
+        window: 基準のバケット数
+        std_floor: 標準偏差の下限
+        poisson: True なら標準偏差の下限に sqrt(基準の中央値) も使う (件数の系列向け)
+    """
+    n = values.size
+    result = np.full(n, np.nan)
+    if n == 0 or window <= 0:
+        return result
+    padded = np.concatenate((np.full(window, np.nan), values[:-1]))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+    k = np.count_nonzero(~np.isnan(windows), axis=1)
+    ok = ~np.isnan(values) & (k >= _MIN_BASELINE)
+    if not ok.any():
+        return result
+    windows, k = windows[ok], k[ok]
+    median = _row_median(windows, k)
+    std = _row_median(np.abs(windows - median[:, None]), k) * 1.4826
+    std = np.maximum(std, std_floor)
+    if poisson:
+        std = np.maximum(std, np.sqrt(np.maximum(median, 1.0)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[ok] = np.where(std > 0, (values[ok] - median) / std, np.nan)
+    return result
+
+
+def _row_median(rows: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """各行の NaN を除いた中央値を返す (counts は行ごとの NaN でない要素数)。
+
+    np.nanmedian より高速に計算するため、ソートで NaN を末尾に寄せて中央の要素を取る。
+    """
+    ordered = np.sort(rows, axis=1)
+    index = np.arange(rows.shape[0])
+    return (ordered[index, (counts - 1) // 2] + ordered[index, counts // 2]) / 2
+
+
+def net_sentiment(positive: np.ndarray, negative: np.ndarray, score: np.ndarray) -> np.ndarray:
+    """バケットごとのネット センチメント (-1〜1) を返す。
+
+    ポジティブ/ネガティブのメンション数から (pos - neg) / (pos + neg) を計算し、
+    メンション数の内訳がないバケットは Finnhub の score を使う。
+    """
+    total = positive + negative
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, (positive - negative) / total, score)
+
+
+def analyze(entries: list[dict], window: int = SOCIAL_ZSCORE_WINDOW) -> dict[str, np.ndarray]:
+    """バケットのリストから派生系列 (速度・z スコア・乖離) を計算する。"""
+    series = to_series(entries)
+    observed = series["observed"]
+    mentions = np.where(observed, series["mentions"], np.nan)
+    net = net_sentiment(series["positive"], series["negative"], series["score"])
+    # 母数の少ないバケットのネット センチメントは基準・判定に使わない
+    with np.errstate(invalid="ignore"):
+        reliable_net = np.where(mentions >= _MIN_SENTIMENT_MENTIONS, net, np.nan)
+    positive_z = baseline_zscore(np.where(observed, series["positive"], np.nan), window, poisson=True)
+    negative_z = baseline_zscore(np.where(observed, series["negative"], np.nan), window, poisson=True)
+    # ポジティブとネガティブのメンションが逆向きに動いたときの z スコアの差
+    # (正: ポジティブが増えネガティブが減った)。同じ向きに動いたバケットは 0
+    divergence = positive_z - negative_z
+    with np.errstate(invalid="ignore"):
+        divergence[positive_z * negative_z >= 0] = 0.0
+    return {
+        **series,
+        "velocity": velocity(mentions),
+        "mention_zscore": baseline_zscore(mentions, window, poisson=True),
+        "net_sentiment": net,
+        "sentiment_zscore": baseline_zscore(reliable_net, window, _SENTIMENT_STD_FLOOR),
+        "divergence": divergence,
+    }
+
+
+def detect_anomalies(
+    derived: dict[str, np.ndarray], threshold: float = SOCIAL_ANOMALY_ZSCORE
+) -> list[dict]:
+    """派生系列から異常なバケットを検出する (新しい順)。
+
+    - mention_spike / mention_drop: メンション数の z スコアが ±threshold を超えた
+    - sentiment_shift: ネット センチメントの z スコアが ±threshold を超えた
+    - polarity_divergence: ポジティブとネガティブのメンションが逆向きに動き、
+      z スコアの差が threshold を超えた
+    """
+    rules = [
+        ("mention_zscore", "mention_spike", "mention_drop", "mentions"),
+        ("sentiment_zscore", "sentiment_shift", "sentiment_shift", "net_sentiment"),
+        ("divergence", "polarity_divergence", "polarity_divergence", "divergence"),
+    ]
+    anomalies = []
+    for key, up, down, value_key in rules:
+        z = derived[key]
+        with np.errstate(invalid="ignore"):
+            hits = np.flatnonzero(np.abs(z) >= threshold)
+        for i in hits:
+            anomalies.append({
+                "time": str(derived["time"][i]),
+                "type": up if z[i] > 0 else down,
+                "direction": "up" if z[i] > 0 else "down",
+                "value": _round(derived[value_key][i]),
+                "zscore": _round(z[i], 2),
+            })
+    anomalies.sort(key=lambda a: a["time"], reverse=True)
+    return anomalies
+
+
+def _round(value: float, digits: int = 4) -> float | None:
+    """NaN を None に変換して丸める。"""
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+def summarize(
+    entries: list[dict],
+    window: int = SOCIAL_ZSCORE_WINDOW,
+    threshold: float = SOCIAL_ANOMALY_ZSCORE,
+    recent: int = _RECENT_BUCKETS,
+) -> dict:
+    """1 プラットフォーム (reddit / twitter) のバケットを集計する。
+
+    Args:
+        entries: Finnhub のバケットのリスト
+        window: z スコアの基準バケット数
+        threshold: 異常とみなす z スコアの絶対値
+        recent: 直近のバケットとして返す件数
+
+    Returns:
+        期間合計のメンション数・平均スコア、最新バケットの指標、
+        検出した異常、直近バケットの表 (columns / rows)
+    """
+    if not entries:
+        return {"mentions": 0, "positive_score": 0, "negative_score": 0, "buckets": 0, "anomalies": []}
+    derived = analyze(entries, window)
+    times = derived["time"]
+    rows = [
+        [str(times[i])] + [_round(derived[c][i], 3) for c in RECENT_COLUMNS[1:]]
+        for i in range(max(times.size - recent, 0), times.size)
+    ]
+    latest = dict(zip(RECENT_COLUMNS, rows[-1])) if rows else None
+    return {
+        "mentions": int(derived["mentions"].sum()),
+        "positive_score": round(float(np.mean([e.get("positiveScore", 0) for e in entries])), 4),
+        "negative_score": round(float(np.mean([e.get("negativeScore", 0) for e in entries])), 4),
+        "buckets": int(times.size),
+        "bucket_hours": round(float((times[1] - times[0]) / np.timedelta64(1, "h")), 2)
+        if times.size > 1 else None,
+        "latest": latest,
+        "anomalies": detect_anomalies(derived, threshold),
+        "recent": {"columns": RECENT_COLUMNS, "rows": rows},
+    }